@@ -0,0 +1 @@
+"""두 페이지의 주요 처리 경로 벤치마크 (python -m benchmarks.run)"""
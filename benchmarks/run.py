@@ -0,0 +1,279 @@
+"""벤치마크 실행 / 기준값 비교
+
+사용법:
+    python -m benchmarks.run                      # 기준값과 비교, 회귀 시 종료 코드 1
+    python -m benchmarks.run --scales 1 10        # 배율 지정
+    python -m benchmarks.run --save-baseline      # 현재 결과를 기준값으로 저장
+
+기준값(baselines.json)은 측정한 머신 기준이므로 다른 환경에서는 --save-baseline으로 새로 만든 뒤 비교
+측정값은 워밍업 후 표본들 중 최솟값 — 짧은 케이스도 최소 MIN_CASE_SECONDS 동안 표본을 모아
+일시적인 스케줄링 / 공유 CPU 잡음에 걸리지 않은 값을 사용 (중앙값은 같은 코드로도 ±25% 흔들림)
+"""
+import argparse
+import importlib.util
+import json
+import platform
+import sys
+import time
+from datetime import datetime, timedelta
+from io import BytesIO
+from pathlib import Path
+
+from benchmarks.synthetic import SCALES, scaled_monitor_store, scaled_train_csv, synthetic_shap_table
+from utills.data import ROOT_DIR, TimeIndex, frame_memory, load_monitor_store, load_train
+from utills.power_factor import daily_power_factor
+from utills.report import ReportJobQueue, create_comprehensive_docx_report_with_charts, report_tables
+from utills.report_charts import REPORT_CHARTS, draw_chart
+from utills.report_pdf import write_report_pdf
+from utills.rollup import RollupCube
+from utills.tariff import frame_cost
+from utills.weather import asof_weather, load_weather
+
+BASELINE_PATH = Path(__file__).with_name("baselines.json")
+REPORT_PAGE = ROOT_DIR / "pages" / "과거 전기요금 분석 보고서.py"
+
+# 기준값 대비 이 비율 이상 느려지면 회귀로 판정
+DEFAULT_THRESHOLD = 0.25
+
+# 차이가 이보다 작으면 비율과 무관하게 회귀로 보지 않음 (초) — 1ms 미만 케이스의 잡음
+MIN_REGRESSION_SECONDS = 1e-3
+
+# 케이스당 최소 표본 수 / 최소·최대 측정 시간 (초)
+# 표본 수와 최소 시간을 모두 채우면 멈추고, 최대 시간을 넘기면 그 전이라도 멈춤 (최소 1회)
+DEFAULT_REPEAT = 5
+MIN_CASE_SECONDS = 1.0
+MAX_CASE_SECONDS = 10.0
+
+# 회귀로 보이는 케이스를 다시 재는 횟수 (더 작은 값 채택) — 1초 넘게 이어지는 일시적 CPU 경합 배제
+RECHECK_RUNS = 2
+
+# 측정 전 버리는 실행 횟수 (캐시 / 지연 import / 메모리 할당 준비)
+WARMUP_RUNS = 1
+
+# 표본 하나의 최소 길이 (초) — 이보다 짧은 케이스는 표본 하나에 여러 번 실행해 평균
+MIN_SAMPLE_SECONDS = 0.01
+
+# 모니터링 틱 측정 시 마지막 몇 틱을 잴지
+MONITOR_TICKS = 200
+
+
+def load_report_page():
+    """보고서 페이지 모듈을 main() 실행 없이 불러옴 (Streamlit bare 모드)"""
+    from streamlit.logger import set_log_level
+
+    set_log_level("error")
+    spec = importlib.util.spec_from_file_location("report_page", REPORT_PAGE)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def _time_once(func, number):
+    t0 = time.perf_counter()
+    for _ in range(number):
+        func()
+    return (time.perf_counter() - t0) / number
+
+
+def measure(func, repeat=DEFAULT_REPEAT, min_seconds=MIN_CASE_SECONDS, max_seconds=MAX_CASE_SECONDS):
+    """워밍업 후 func() 1회 시간(초)의 표본 최솟값 반환
+
+    한 번이 MIN_SAMPLE_SECONDS보다 짧으면 표본마다 그 길이가 되도록 여러 번 실행
+    """
+    warmup = min(_time_once(func, 1) for _ in range(max(WARMUP_RUNS, 1)))
+    number = max(1, int(MIN_SAMPLE_SECONDS / max(warmup, 1e-9)))
+    times = []
+    started = time.perf_counter()
+    while True:
+        times.append(_time_once(func, number))
+        elapsed = time.perf_counter() - started
+        if elapsed > max_seconds or (len(times) >= repeat and elapsed >= min_seconds):
+            break
+    return float(min(times))
+
+
+# ========== 1. 케이스 정의 ==========
+def report_cases(page, scale):
+    """보고서 페이지 케이스: (이름, 함수) 목록"""
+    path = scaled_train_csv(scale)
+    load_train(path)  # Parquet 캐시 준비
+    df = load_train(path)
+    total, per_row = frame_memory(df)
+    print(f"  [{scale}x] 분석 프레임 {len(df):,}행, {total / 2**20:,.1f} MiB ({per_row:.1f} bytes/row)", flush=True)
+    cube = RollupCube.from_frame(df)
+    index = TimeIndex(df)
+
+    last_month = df["년월"].max()
+    current = index.month(last_month)
+    last_date = index.last_day
+    columns = ["전력사용량(kWh)", "전기요금(원)"]
+    weather = load_weather()
+    times = df["측정일시"].to_numpy()
+
+    def slices():
+        index.day(last_date)
+        index.range(last_date - timedelta(days=6), last_date)
+        index.month(last_month)
+
+    # 보고서 작업 큐: 한 번 생성해 결과 캐시를 채운 뒤 같은 요청(캐시 적중) 비용만 측정
+    queue = ReportJobQueue(path)
+    primed = queue.submit("월별", last_month.month)
+    while not primed.done:
+        time.sleep(0.05)
+    queue.shutdown()
+
+    def docx():
+        daily_data = index.day(last_date)
+        doc = create_comprehensive_docx_report_with_charts(
+            df, current, daily_data, last_date, "월별", last_month.month, f"{last_month.month}월")
+        doc.save(BytesIO())
+
+    def detail_tables():
+        daily_data = index.day(last_date)
+        doc = create_comprehensive_docx_report_with_charts(
+            df, current, daily_data, last_date, "월별", last_month.month, f"{last_month.month}월",
+            tables=report_tables(cube, last_month.month))
+        doc.save(BytesIO())
+
+    return [
+        ("load_data_csv", lambda: load_train(path, use_cache=False)),
+        ("load_data_cached", lambda: load_train(path)),
+        ("rollup_build", lambda: RollupCube.from_frame(df)),
+        ("time_slices", slices),
+        ("pf_table", lambda: daily_power_factor(cube.hourly)),
+        ("tariff_engine", lambda: frame_cost(df)),
+        ("weather_asof", lambda: asof_weather(times, weather)),
+        ("groupby_monthly", lambda: cube.aggregate("month", columns)),
+        ("groupby_daily", lambda: cube.aggregate("day", columns)),
+        ("groupby_hourly", lambda: cube.aggregate("hour", columns, last_date, last_date)),
+        ("comparison_table", lambda: page.create_comparison_table(
+            cube.totals(month=last_month), cube.totals(month=last_month - 1), "월")),
+        ("hourly_stack_chart", lambda: page.create_hourly_stack_chart(cube.hour_by_worktype("전기요금(원)"))),
+        ("donut_chart", lambda: page.create_concentric_donut_chart(cube.by_worktype()["전력사용량(kWh)"])),
+        ("docx_report", docx),
+        ("docx_detail_tables", detail_tables),
+        ("pdf_report", lambda: write_report_pdf(BytesIO(), "월별", last_month.month, path)),
+        ("report_charts", lambda: [draw_chart(chart, last_month.month, path) for chart in REPORT_CHARTS]),
+        ("report_cache_hit", lambda: queue.submit("월별", last_month.month)),
+    ]
+
+
+def monitor_cases(base_store, scale):
+    """실시간 모니터링 케이스: 재생 끝 무렵 한 틱(진행 + Snapshot 게시) 비용"""
+    from utills.stream import MonitorEngine
+
+    store = scaled_monitor_store(base_store, scale)
+    engine = MonitorEngine(store, synthetic_shap_table(store))
+
+    def tick():
+        engine.reset()
+        engine.step(max(engine.remaining - MONITOR_TICKS, 0))
+        engine.snapshot()
+        t0 = time.perf_counter()
+        while engine.step():
+            engine.snapshot(running=True)
+        return (time.perf_counter() - t0) / MONITOR_TICKS
+
+    # 준비 단계(건너뛰기)는 제외하고 틱 구간만 기록 (첫 번은 워밍업)
+    def run():
+        tick()
+        return float(min(tick() for _ in range(3)))
+
+    return [("monitor_tick", run)]
+
+
+# ========== 2. 실행 / 비교 ==========
+def run_benchmarks(scales, repeat, only=None, keys=None):
+    """{케이스@배율: 초} — keys가 있으면 그 항목만 측정"""
+    page = load_report_page()
+    base_store = load_monitor_store()
+    results = {}
+    for scale in scales:
+        if keys and not any(key.endswith(f"@{scale}x") for key in keys):
+            continue
+        report = [(name, lambda func=func: measure(func, repeat)) for name, func in report_cases(page, scale)]
+        for name, run in report + monitor_cases(base_store, scale):
+            key = f"{name}@{scale}x"
+            if (only and name not in only) or (keys and key not in keys):
+                continue
+            results[key] = run()
+            print(f"  {key:<28} {results[key] * 1000:>12.3f} ms", flush=True)
+    return results
+
+
+def is_regression(current, base, threshold):
+    """비율이 임계값을 넘고 차이도 MIN_REGRESSION_SECONDS 이상일 때만 회귀"""
+    return current > base * (1 + threshold) and current - base >= MIN_REGRESSION_SECONDS
+
+
+def recheck(results, baseline, threshold, repeat, runs=RECHECK_RUNS):
+    """회귀로 보이는 항목만 다시 재서 더 작은 값으로 갱신"""
+    for _ in range(runs):
+        suspects = [key for key, current in results.items()
+                    if key in baseline and is_regression(current, baseline[key], threshold)]
+        if not suspects:
+            return
+        print(f"\n재측정: {', '.join(suspects)}")
+        scales = sorted({int(key.rsplit("@", 1)[1][:-1]) for key in suspects})
+        for key, value in run_benchmarks(scales, repeat, keys=suspects).items():
+            results[key] = min(results[key], value)
+
+
+def compare(results, baseline, threshold):
+    """기준값 대비 비교표 출력 후 회귀 항목 목록 반환"""
+    regressions = []
+    print(f"\n{'case':<28} {'baseline(ms)':>14} {'current(ms)':>14} {'ratio':>8}  status")
+    for key, current in results.items():
+        base = baseline.get(key)
+        if base is None:
+            print(f"{key:<28} {'-':>14} {current * 1000:>14.3f} {'-':>8}  new")
+            continue
+        ratio = current / base if base > 0 else float("inf")
+        status = "ok"
+        if is_regression(current, base, threshold):
+            status = "REGRESSION"
+            regressions.append(key)
+        elif ratio < 1 - threshold:
+            status = "faster"
+        print(f"{key:<28} {base * 1000:>14.3f} {current * 1000:>14.3f} {ratio:>8.2f}  {status}")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="전력 분석 / 실시간 모니터링 벤치마크")
+    parser.add_argument("--scales", type=int, nargs="+", default=list(SCALES), help="train.csv 배율")
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT, help="케이스당 최소 표본 수")
+    parser.add_argument("--only", nargs="+", default=None, help="실행할 케이스 이름")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD, help="회귀 판정 비율 (0.25 = 25%% 느려짐)")
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH, help="기준값 파일")
+    parser.add_argument("--save-baseline", action="store_true", help="현재 결과를 기준값으로 저장")
+    args = parser.parse_args(argv)
+
+    print(f"벤치마크 실행 (배율 {args.scales}, 반복 {args.repeat})")
+    results = run_benchmarks(args.scales, args.repeat, args.only)
+
+    if args.save_baseline:
+        stored = json.loads(args.baseline.read_text(encoding="utf-8")) if args.baseline.exists() else {}
+        stored.setdefault("results", {}).update(results)
+        stored["machine"] = f"{platform.system()} {platform.machine()} / Python {platform.python_version()}"
+        stored["updated"] = datetime.now().strftime("%Y-%m-%d")
+        args.baseline.write_text(json.dumps(stored, ensure_ascii=False, indent=2, sort_keys=True) + "\n",
+                                 encoding="utf-8")
+        print(f"\n기준값 저장: {args.baseline}")
+        return 0
+
+    if not args.baseline.exists():
+        print("\n기준값 파일이 없습니다. --save-baseline으로 먼저 생성하세요.")
+        return 0
+    baseline = json.loads(args.baseline.read_text(encoding="utf-8"))["results"]
+    recheck(results, baseline, args.threshold, args.repeat)
+    regressions = compare(results, baseline, args.threshold)
+    if regressions:
+        print(f"\n회귀 {len(regressions)}건 (임계값 +{args.threshold:.0%}): {', '.join(regressions)}")
+        return 1
+    print("\n회귀 없음")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,64 @@
+"""train.csv / 모니터링 데이터를 N배로 늘린 합성 데이터셋
+
+원본 구간을 시간축으로 이어 붙여 N배 길이로 만듦 (측정일시/id는 겹치지 않게 이동)
+생성 결과는 cache/bench/ 에 저장해 재사용
+"""
+import numpy as np
+import pandas as pd
+
+from utills.aggregates import PrefixSums
+from utills.data import CACHE_DIR, KPI_COLUMNS, TRAIN_CSV, MonitorStore
+from utills.explain import ShapTable
+
+BENCH_DIR = CACHE_DIR / "bench"
+
+# 기본 배율
+SCALES = (1, 10, 100)
+
+
+def _tile_timeline(frame, scale, time_col="측정일시"):
+    """frame을 scale번 이어 붙이고 회차마다 측정일시/id를 전체 구간 길이만큼 이동"""
+    if scale == 1:
+        return frame.copy()
+    ts = pd.to_datetime(frame[time_col])
+    span = ts.max() - ts.min() + pd.Timedelta(minutes=15)
+    reps = np.repeat(np.arange(scale), len(frame))
+    out = pd.concat([frame] * scale, ignore_index=True)
+    out[time_col] = pd.to_datetime(np.tile(ts.to_numpy(), scale)) + span * reps
+    if "id" in out:
+        out["id"] = np.tile(frame["id"].to_numpy(), scale) + len(frame) * reps
+    return out
+
+
+def scaled_train_csv(scale, source=TRAIN_CSV):
+    """train.csv를 scale배로 늘린 CSV 경로 (없으면 생성)"""
+    if scale == 1:
+        return source
+    path = BENCH_DIR / f"train_x{scale}.csv"
+    if not path.exists():
+        BENCH_DIR.mkdir(parents=True, exist_ok=True)
+        frame = _tile_timeline(pd.read_csv(source), scale)
+        frame["측정일시"] = frame["측정일시"].dt.strftime("%Y-%m-%d %H:%M:%S")
+        tmp = path.with_suffix(".tmp")
+        frame.to_csv(tmp, index=False)
+        tmp.replace(path)
+    return path
+
+
+def scaled_monitor_store(store, scale):
+    """MonitorStore를 scale배 길이로 늘린 복사본 (재생 시작 위치는 그대로)"""
+    if scale == 1:
+        return store
+    data = _tile_timeline(store.data, scale)
+    feat_data = _tile_timeline(store.feat_data, scale)
+    kpi_frame = feat_data[KPI_COLUMNS[1:]].assign(target=data["target"].to_numpy())
+    return MonitorStore(data, feat_data, store.start_idx, store.feature_names,
+                        PrefixSums(kpi_frame, KPI_COLUMNS))
+
+
+def synthetic_shap_table(store, seed=0):
+    """store 행 순서의 임의 SHAP 표 — 모델 없이 틱당 SHAP 누적 비용을 재기 위한 것 (값 자체는 의미 없음)"""
+    rng = np.random.default_rng(seed)
+    n, names = len(store), tuple(store.feature_names)
+    return ShapTable(store.data["id"].to_numpy(), rng.standard_normal((n, len(names))).astype(np.float32),
+                     np.zeros(n, dtype=np.float32), names)
@@ -2,17 +2,14 @@ import streamlit as st
 import pandas as pd
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
-import plotly.express as px
-from datetime import datetime, timedelta
-import numpy as np
+from datetime import timedelta
 from io import BytesIO
-from docx import Document
-from docx.shared import Inches, Cm
-from docx.enum.text import WD_ALIGN_PARAGRAPH
-from docx.enum.style import WD_STYLE_TYPE
 import matplotlib.pyplot as plt
-import matplotlib.font_manager as fm
-from matplotlib import rcParams
+
+from utills.data import TimeIndex, load_train
+from utills.power_factor import SAME_RATE_TOLERANCE, daily_power_factor
+from utills.report import DONE, FAILED, REPORT_FORMATS, ReportJobQueue, create_comparison_table, report_period
+from utills.rollup import load_rollup
 
 # ─── 페이지 설정 ────────────────────────────────────────
 st.set_page_config(
@@ -436,22 +433,36 @@ st.markdown("""
 """, unsafe_allow_html=True)
 
 # ========== 1. 데이터 로드 함수 ==========
-@st.cache_data
+@st.cache_resource
 def load_data():
-    """데이터 로드 및 전처리"""
+    """데이터 로드 및 전처리 (프로세스 내 모든 세션이 같은 프레임을 공유, 읽기 전용)"""
     try:
-        df = pd.read_csv("./data/train.csv")
-        df["측정일시"] = pd.to_datetime(df["측정일시"])
-        df["날짜"] = df["측정일시"].dt.date
-        df["시간"] = df["측정일시"].dt.hour
-        df["월"] = df["측정일시"].dt.month
-        df["일"] = df["측정일시"].dt.day
-        df["년월"] = df["측정일시"].dt.to_period("M")
-        return df
+        # 원본 CSV가 바뀌지 않았으면 cache/ 의 Parquet 캐시에서 바로 읽음
+        return load_train()
     except Exception as e:
         st.error(f"데이터 로드 중 오류 발생: {e}")
         return None
 
+@st.cache_resource
+def load_index():
+    """날짜 이진 탐색 인덱스 (일/기간/월 조회를 전체 마스크 대신 슬라이스로)"""
+    return TimeIndex(load_data())
+
+@st.cache_resource
+def load_cube():
+    """시간/일/월 × 작업유형 집계 큐브 (원본 데이터가 바뀔 때만 다시 생성)"""
+    return load_rollup()
+
+@st.cache_resource
+def load_pf_table():
+    """전체 날짜의 주간/야간 역률·요금 영향·전일대비 표 (역률 카드/추이는 조회만)"""
+    return daily_power_factor(load_cube().hourly)
+
+@st.cache_resource
+def get_report_queue():
+    """보고서 작업 큐 (서버 프로세스당 하나, 모든 세션이 결과 캐시를 공유)"""
+    return ReportJobQueue()
+
 # ========== 2. 차트 생성 함수들 ==========
 def create_matplotlib_chart(data, chart_type="line", title="Chart", xlabel="X", ylabel="Y", figsize=(10, 6)):
     """matplotlib로 간단한 차트 생성"""
@@ -550,9 +561,8 @@ def create_dual_axis_chart(df, x_col, y1_col, y2_col, title, x_title, y1_title,
     )
     return fig
 
-def create_hourly_stack_chart(df):
-    """시간별 스택 차트 생성"""
-    hourly_worktype = df.groupby(["시간", "작업유형"])["전기요금(원)"].sum().unstack(fill_value=0)
+def create_hourly_stack_chart(hourly_worktype):
+    """시간별 스택 차트 생성 (hourly_worktype: 시간 × 작업유형 전기요금 합계)"""
     colors = {
         "Light_Load": "#34a853", 
         "Medium_Load": "#fbbc04", 
@@ -588,9 +598,9 @@ def create_hourly_stack_chart(df):
     )
     return fig
 
-def create_concentric_donut_chart(df):
-    """도넛 차트 생성"""
-    worktype_mwh = df.groupby("작업유형")["전력사용량(kWh)"].sum() / 1000
+def create_concentric_donut_chart(worktype_kwh):
+    """도넛 차트 생성 (worktype_kwh: 작업유형별 전력사용량 합계)"""
+    worktype_mwh = worktype_kwh / 1000
     total_mwh = worktype_mwh.sum()
 
     chart_data_map = {
@@ -632,14 +642,14 @@ def create_concentric_donut_chart(df):
     return fig
 
 # ========== 3. 카드 및 테이블 생성 함수들 ==========
-def create_main_metrics_card(summary_data, period_label):
-    """주요 지표 카드 생성"""
-    if summary_data.empty:
+def create_main_metrics_card(summary, period_label):
+    """주요 지표 카드 생성 (summary: 큐브 구간 합계)"""
+    if summary is None:
         return ""
     
-    total_kwh = summary_data["전력사용량(kWh)"].sum()
-    total_cost = summary_data["전기요금(원)"].sum()
-    total_carbon = summary_data["탄소배출량(tCO2)"].sum()
+    total_kwh = summary["전력사용량(kWh)"]
+    total_cost = summary["전기요금(원)"]
+    total_carbon = summary["탄소배출량(tCO2)"]
     avg_price = total_cost / total_kwh if total_kwh > 0 else 0
     
     card_html = f"""
@@ -671,32 +681,9 @@ def create_main_metrics_card(summary_data, period_label):
     """
     return card_html
 
-def calculate_kepco_rate_impact(pf_value, time_period):
-    """한전 요금 영향 계산"""
-    if time_period == "daytime":
-        adjusted_pf = max(60, min(95, pf_value))
-        if adjusted_pf >= 90:
-            rate_impact = -(adjusted_pf - 90) * 0.5
-        else:
-            rate_impact = (90 - adjusted_pf) * 0.5
-    else:
-        if pf_value <= 0:
-            adjusted_pf = 100
-        else:
-            adjusted_pf = max(60, pf_value)
-        if adjusted_pf >= 95:
-            rate_impact = 0
-        else:
-            rate_impact = (95 - adjusted_pf) * 0.5
-    return rate_impact
-
-def get_traffic_light_and_message(current_pf, previous_pf, time_period):
-    """신호등 및 메시지 생성"""
-    current_impact = calculate_kepco_rate_impact(current_pf, time_period)
-    previous_impact = calculate_kepco_rate_impact(previous_pf, time_period)
-    rate_difference = current_impact - previous_impact
-    
-    if abs(rate_difference) < 0.1:
+def get_traffic_light_and_message(rate_difference):
+    """신호등 및 메시지 생성 (rate_difference: 전일대비 요금 영향 차이 %p)"""
+    if abs(rate_difference) < SAME_RATE_TOLERANCE:
         traffic_light = "🟡"
         message = "전일과 동일"
     elif rate_difference > 0:
@@ -707,9 +694,9 @@ def get_traffic_light_and_message(current_pf, previous_pf, time_period):
         message = f"전일대비 {rate_difference:.1f}% 덜 냄"
     return traffic_light, message
 
-def create_simple_power_factor_card(period_name, icon, current_pf, previous_pf, time_period, card_class):
+def create_simple_power_factor_card(period_name, icon, current_pf, rate_difference, time_period, card_class):
     """역률 카드 생성"""
-    traffic_light, message = get_traffic_light_and_message(current_pf, previous_pf, time_period)
+    traffic_light, message = get_traffic_light_and_message(rate_difference)
     pf_type = "지상" if time_period == "daytime" else "진상"
     time_range = "(09-23시)" if time_period == "daytime" else "(23-09시)"
     
@@ -723,139 +710,98 @@ def create_simple_power_factor_card(period_name, icon, current_pf, previous_pf,
     """
     return card_html
 
-def create_summary_table(current_data, period_type="일"):
-    """요약 테이블 생성"""
+def create_pf_trend_chart(pf_table, selected_date=None):
+    """연간 역률 추이 차트 (역률은 왼쪽 축, 요금 영향은 오른쪽 축)"""
+    fig = make_subplots(specs=[[{"secondary_y": True}]])
+    days = pf_table.index
+
+    fig.add_trace(go.Scatter(x=days, y=pf_table["주간_지상역률"], name="주간 지상역률 (09-23시)",
+                             line=dict(color="#fbbc04", width=2), mode="lines"), secondary_y=False)
+    fig.add_trace(go.Scatter(x=days, y=pf_table["야간_진상역률"], name="야간 진상역률 (23-09시)",
+                             line=dict(color="#1a73e8", width=2), mode="lines"), secondary_y=False)
+    fig.add_trace(go.Bar(x=days, y=pf_table["주간_요금영향"] + pf_table["야간_요금영향"], name="요금 영향 합계 (%)",
+                         marker_color="rgba(234, 67, 53, 0.35)"), secondary_y=True)
+
+    fig.add_hline(y=90, line_dash="dot", line_color="#fbbc04", annotation_text="주간 기준 90%", secondary_y=False)
+    fig.add_hline(y=95, line_dash="dot", line_color="#1a73e8", annotation_text="야간 기준 95%", secondary_y=False)
+    if selected_date is not None:
+        fig.add_vline(x=pd.Timestamp(selected_date).timestamp() * 1000, line_dash="dash", line_color="#5f6368")
+
+    fig.update_xaxes(title_text="날짜", title_font=dict(size=14, color="#202124"))
+    fig.update_yaxes(title_text="역률 (%)", secondary_y=False, range=[55, 102])
+    fig.update_yaxes(title_text="요금 영향 (%)", secondary_y=True, title_font=dict(color="#ea4335"))
+    fig.update_layout(
+        title=dict(text="연간 역률 추이", font=dict(size=18, color="#202124"), x=0.5),
+        hovermode="x unified",
+        template="plotly_white",
+        height=450,
+        font=dict(family="Noto Sans KR", size=12),
+        plot_bgcolor="rgba(0,0,0,0)",
+        paper_bgcolor="white",
+        margin=dict(l=20, r=20, t=60, b=40)
+    )
+    return fig
+
+def create_summary_table(current, period_type="일"):
+    """요약 테이블 생성 (current: 큐브 구간 합계, 역률은 평균)"""
     numeric_columns = [("전력사용량(kWh)", "kWh"), ("지상무효전력량(kVarh)", "kVarh"), ("진상무효전력량(kVarh)", "kVarh"),
                       ("탄소배출량(tCO2)", "tCO2"), ("지상역률(%)", "%"), ("진상역률(%)", "%"), ("전기요금(원)", "원")]
-    ratio_cols = {"지상역률(%)", "진상역률(%)"}
 
     rows = []
     for col, unit in numeric_columns:
-        if col in ratio_cols:
-            val = current_data[col].mean()
-        else:
-            val = current_data[col].sum()
+        val = current[col]
         name = col.split("(")[0]
         rows.append({"항목": name, f"현재{period_type} 값": f"{val:.2f}", "단위": unit})
     return pd.DataFrame(rows)
 
-def create_comparison_table(current_data, previous_data, period_type="일"):
-    """비교 테이블 생성"""
-    comparison_dict = {"항목": [], f"현재{period_type}": [], f"이전{period_type}": [], "변화량": [], "변화율(%)": []}
-    numeric_columns = ["전력사용량(kWh)", "지상무효전력량(kVarh)", "진상무효전력량(kVarh)", "탄소배출량(tCO2)", "지상역률(%)", "진상역률(%)", "전기요금(원)"]
+def create_worktype_stats(worktype_totals):
+    """작업유형별 상세 표 (worktype_totals: 큐브 작업유형별 합계)"""
+    return worktype_totals.rename(columns={
+        "전력사용량(kWh)": "전력사용량_합계",
+        "전기요금(원)": "전기요금_합계",
+        "지상역률(%)": "평균_지상역률",
+        "탄소배출량(tCO2)": "탄소배출량_합계",
+    })[["전력사용량_합계", "전기요금_합계", "평균_지상역률", "탄소배출량_합계"]].round(2)
 
-    for col in numeric_columns:
-        if col in ["지상역률(%)", "진상역률(%)"]:
-            current_val = current_data[col].mean()
-            previous_val = previous_data[col].mean()
-        else:
-            current_val = current_data[col].sum()
-            previous_val = previous_data[col].sum()
-
-        change = current_val - previous_val
-        change_pct = (change / previous_val * 100) if previous_val != 0 else 0
-
-        comparison_dict["항목"].append(col)
-        comparison_dict[f"현재{period_type}"].append(f"{current_val:.2f}")
-        comparison_dict[f"이전{period_type}"].append(f"{previous_val:.2f}")
-        comparison_dict["변화량"].append(f"{change:+.2f}")
-        comparison_dict["변화율(%)"].append(f"{change_pct:+.1f}%")
-    return pd.DataFrame(comparison_dict)
-
-# ========== 4. 개선된 보고서 생성 함수 ==========
-def create_comprehensive_docx_report_with_charts(df, current_data, daily_data, selected_date, view_type="월별", selected_month=1, period_label="전체"):
-    """현재 화면 설정에 따른 동적 보고서 생성"""
-    doc = Document()
-    
-    # 전체 문서에 테두리 추가
-    sections = doc.sections
-    for section in sections:
-        sectPr = section._sectPr
-        pgBorders = sectPr.xpath('.//w:pgBorders')
-        if not pgBorders:
-            from docx.oxml import parse_xml
-            pgBorders_xml = '''
-            <w:pgBorders xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main" 
-                         w:offsetFrom="page">
-                <w:top w:val="single" w:sz="12" w:space="24" w:color="auto"/>
-                <w:left w:val="single" w:sz="12" w:space="24" w:color="auto"/>
-                <w:bottom w:val="single" w:sz="12" w:space="24" w:color="auto"/>
-                <w:right w:val="single" w:sz="12" w:space="24" w:color="auto"/>
-            </w:pgBorders>
-            '''
-            pgBorders = parse_xml(pgBorders_xml)
-            sectPr.append(pgBorders)
-    
-    # 보고서 헤더 테이블
-    header_table = doc.add_table(rows=6, cols=4)
-    header_table.style = 'Table Grid'
-    
-    # 제목 행
-    title_cell = header_table.rows[0].cells[0]
-    title_cell.merge(header_table.rows[0].cells[3])
-    title_cell.text = "보 고 서"
-    title_cell.paragraphs[0].alignment = WD_ALIGN_PARAGRAPH.CENTER
-    title_para = title_cell.paragraphs[0]
-    title_para.runs[0].font.size = Cm(0.8)
-    title_para.runs[0].bold = True
-    
-    # 헤더 정보 입력
-    header_data = [
-        ("보고처", "에너지관리팀", "보고서명", f"전력 분석 보고서 ({period_label})"),
-        ("장소", "본사", "취급분류", "○기밀 ●보통"),
-        ("작성일자", datetime.now().strftime("%Y년 %m월 %d일"), "작성자", "전력분석팀"),
-        ("참가자", "에너지관리팀, 시설관리팀, 경영진", "", ""),
-        ("자료출처", "전력량계 실시간 데이터, 한국전력공사 요금체계", "", "")
-    ]
-    
-    for i, (col1, val1, col2, val2) in enumerate(header_data, 1):
-        header_table.rows[i].cells[0].text = col1
-        header_table.rows[i].cells[1].text = val1
-        if col2:
-            header_table.rows[i].cells[2].text = col2
-            header_table.rows[i].cells[3].text = val2
+# ========== 4. 보고서 작업 상태 ==========
+# 보고서 작업 진행 중 상태 패널 새로고침 주기 (초)
+REPORT_POLL_SEC = 1.0
+
+def report_status_panel(report_queue):
+    """이 세션이 마지막으로 요청한 보고서 작업의 진행률 / 다운로드 버튼"""
+    job_id = st.session_state.get("report_job_id")
+    job = report_queue.get(job_id) if job_id is not None else None
+    if job is None:
+        return
+    st.session_state.report_polling = not job.done
+
+    @st.fragment(run_every=REPORT_POLL_SEC if not job.done else None)
+    def panel():
+        current = report_queue.get(job_id)
+        if current is None:
+            return
+        if current.done and st.session_state.get("report_polling"):
+            # 진행 중에 끝난 경우: 타이머 해제를 위해 전체 재실행
+            st.session_state.report_polling = False
+            st.rerun()
+        if current.status == DONE:
+            file_name = current.file_name()
+            st.download_button(
+                label="보고서 다운로드",
+                data=current.result,
+                file_name=file_name,
+                mime=current.mime,
+                key="download_complete_report"
+            )
+            st.success("보고서 생성 완료!" + (" (캐시)" if current.cached else f" ({current.elapsed:.1f}초)"))
+            st.info(f"파일명: {file_name}")
+        elif current.status == FAILED:
+            st.error(f"보고서 생성 중 오류 발생: {current.error}")
+            st.info("오류가 지속되면 다른 날짜나 기간을 선택해보세요.")
         else:
-            header_table.rows[i].cells[1].merge(header_table.rows[i].cells[3])
-    
-    doc.add_paragraph()
-    
-    # 보고내용 제목
-    content_title = doc.add_heading('보고내용', level=1)
-    content_title.alignment = WD_ALIGN_PARAGRAPH.CENTER
-    
-    # === 1. 기간별 분석 ===
-    if view_type == "월별":
-        doc.add_heading(f'1. {selected_month}월 전력 사용 분석', level=2)
-        
-        if not current_data.empty:
-            total_kwh = current_data["전력사용량(kWh)"].sum()
-            total_cost = current_data["전기요금(원)"].sum()
-            avg_pf = current_data["지상역률(%)"].mean()
-            total_carbon = current_data["탄소배출량(tCO2)"].sum()
-            avg_price = total_cost / total_kwh if total_kwh > 0 else 0
-            
-            doc.add_paragraph(f"□ {selected_month}월 총 전력사용량: {total_kwh:,.1f} kWh")
-            doc.add_paragraph(f"□ {selected_month}월 총 전기요금: {total_cost:,.0f} 원")
-            doc.add_paragraph(f"□ {selected_month}월 평균 단가: {avg_price:.1f} 원/kWh")
-            doc.add_paragraph(f"□ {selected_month}월 평균 역률: {avg_pf:.1f}%")
-            doc.add_paragraph(f"□ {selected_month}월 탄소배출량: {total_carbon:.2f} tCO2")
-    else:
-        doc.add_heading(f'1. {period_label} 전력 사용 분석', level=2)
-        
-        if not current_data.empty:
-            total_kwh = current_data["전력사용량(kWh)"].sum()
-            total_cost = current_data["전기요금(원)"].sum()
-            avg_pf = current_data["지상역률(%)"].mean()
-            total_carbon = current_data["탄소배출량(tCO2)"].sum()
-            avg_price = total_cost / total_kwh if total_kwh > 0 else 0
-            
-            doc.add_paragraph(f"□ 기간 총 전력사용량: {total_kwh:,.1f} kWh")
-            doc.add_paragraph(f"□ 기간 총 전기요금: {total_cost:,.0f} 원")
-            doc.add_paragraph(f"□ 기간 평균 단가: {avg_price:.1f} 원/kWh")
-            doc.add_paragraph(f"□ 기간 평균 역률: {avg_pf:.1f}%")
-            doc.add_paragraph(f"□ 기간 탄소배출량: {total_carbon:.2f} tCO2")
-    
-    return doc
+            st.progress(current.progress, text=f"보고서 생성 중... {current.message}")
+
+    panel()
 
 # ========== 5. 메인 함수 ==========
 def main():
@@ -870,6 +816,10 @@ def main():
     df = load_data()
     if df is None:
         st.stop()
+    index = load_index()
+    cube = load_cube()
+    pf_table = load_pf_table()
+    report_queue = get_report_queue()
 
     # ─── 사이드바 설정 ────────────────────────────────────────
     with st.sidebar:
@@ -879,9 +829,7 @@ def main():
         </div>
         """, unsafe_allow_html=True)
         
-        filtered_df = df.copy()
-        date_range = (df["날짜"].min(), df["날짜"].max())
-        work_types = df["작업유형"].unique()
+        date_range = (index.first_day, index.last_day)
         
         st.markdown("""
         <div class="sidebar-section">
@@ -900,66 +848,18 @@ def main():
         </div>
         """, unsafe_allow_html=True)
             
+        report_format = st.radio("보고서 형식", list(REPORT_FORMATS), horizontal=True,
+                                 format_func=str.upper, key="report_format")
         if st.button("종합 보고서 생성", key="generate_complete_report"):
-            with st.spinner("보고서 생성 중..."):
-                try:
-                    # 현재 설정된 분석 조건 가져오기
-                    view_type = st.session_state.get('analysis_period', '월별')
-                    
-                    if view_type == "월별":
-                        selected_month = st.session_state.get('month_selector', 1)
-                        current_year = filtered_df["년월"].dt.year.max()
-                        current_data = filtered_df[
-                            (filtered_df["년월"].dt.year == current_year) &
-                            (filtered_df["년월"].dt.month == selected_month)
-                        ]
-                        period_label = f"{selected_month}월"
-                    else:
-                        selected_range = st.session_state.get('period_range_selector', None)
-                        if selected_range and len(selected_range) == 2:
-                            start_day, end_day = selected_range
-                            current_data = filtered_df[
-                                (filtered_df["날짜"] >= start_day) & 
-                                (filtered_df["날짜"] <= end_day)
-                            ]
-                            period_label = f"{start_day} ~ {end_day} 기간"
-                        else:
-                            current_data = filtered_df
-                            period_label = "전체 기간"
-                    
-                    # 최근 날짜 데이터
-                    latest_date = filtered_df["날짜"].max()
-                    daily_data = filtered_df[filtered_df["날짜"] == latest_date]
-                    
-                    # 보고서 생성
-                    doc = create_comprehensive_docx_report_with_charts(
-                        filtered_df, current_data, daily_data, latest_date, 
-                        view_type, selected_month if view_type == "월별" else None, period_label
-                    )
-                    
-                    doc_buffer = BytesIO()
-                    doc.save(doc_buffer)
-                    doc_buffer.seek(0)
-                    
-                    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                    filename = f"전력분석보고서_{timestamp}.docx"
-                    
-                    st.download_button(
-                        label="보고서 다운로드",
-                        data=doc_buffer.getvalue(),
-                        file_name=filename,
-                        mime="application/vnd.openxmlformats-officedocument.wordprocessingml.document",
-                        key="download_complete_report"
-                    )
-                    
-                    st.success("보고서 생성 완료!")
-                    st.info(f"파일명: {filename}")
-                    
-                except Exception as e:
-                    st.error(f"보고서 생성 중 오류 발생: {str(e)}")
-                    st.info("오류가 지속되면 다른 날짜나 기간을 선택해보세요.")
+            # 현재 설정된 분석 조건으로 백그라운드 작업 등록 (같은 조건은 캐시/진행 중 작업 재사용)
+            view_type = st.session_state.get('analysis_period', '월별')
+            period = report_period(view_type, st.session_state.get('month_selector', 1),
+                                   st.session_state.get('period_range_selector', None))
+            st.session_state.report_job_id = report_queue.submit(view_type, period, report_format).job_id
+
+        report_status_panel(report_queue)
 
-    summary_data = filtered_df.copy()
+    summary_totals = cube.totals()
     period_label = "전체"
 
     # ─── 필터링 옵션 ────────────────────────────────────────
@@ -970,9 +870,9 @@ def main():
     
     with filter_col2:
         if view_type == "월별":
-            current_year = filtered_df["년월"].dt.year.max()
+            current_year = index.last_day.year
             months = list(range(1, 13))
-            default_month = filtered_df["년월"].dt.month.max()
+            default_month = index.last_day.month
             selected_month = st.selectbox("월", months, index=int(default_month) - 1, key="month_selector")
         else:
             st.markdown("")
@@ -983,8 +883,8 @@ def main():
             selected_range = st.date_input(
                 "기간 선택", 
                 value=(date(2024, 1, 1), date(2024, 1, 5)),
-                min_value=date_range[0] if len(date_range) == 2 else df["날짜"].min(),
-                max_value=date_range[1] if len(date_range) == 2 else df["날짜"].max(),
+                min_value=date_range[0] if len(date_range) == 2 else index.first_day,
+                max_value=date_range[1] if len(date_range) == 2 else index.last_day,
                 key="period_range_selector"
             )
         else:
@@ -993,13 +893,13 @@ def main():
     with filter_col4:
         st.markdown("")
     
-    current_data = pd.DataFrame()
-    previous_data = pd.DataFrame()
+    current_totals = None
+    previous_totals = None
 
-    # 데이터 처리 로직
+    # 데이터 처리 로직 (원본 대신 집계 큐브 조회)
     if view_type == "월별":
-        current_data = filtered_df[(filtered_df["년월"].dt.year == current_year) & (filtered_df["년월"].dt.month == selected_month)]
-        summary_data = current_data
+        current_totals = cube.totals(month=pd.Period(year=current_year, month=selected_month, freq="M"))
+        summary_totals = current_totals
         period_label = f"{selected_month}월"
 
         if selected_month > 1:
@@ -1008,7 +908,7 @@ def main():
         else:
             prev_year = current_year - 1
             prev_month = 12
-        previous_data = filtered_df[(filtered_df["년월"].dt.year == prev_year) & (filtered_df["년월"].dt.month == prev_month)]
+        previous_totals = cube.totals(month=pd.Period(year=prev_year, month=prev_month, freq="M"))
 
     else:
         if not isinstance(selected_range, tuple) or len(selected_range) != 2:
@@ -1018,22 +918,21 @@ def main():
             if start_day > end_day:
                 st.warning("⛔ 시작 날짜가 종료 날짜보다 이후입니다.")
             else:
-                period_df = filtered_df[(filtered_df["날짜"] >= start_day) & (filtered_df["날짜"] <= end_day)]
-                if period_df.empty:
+                current_totals = cube.totals(start_day, end_day)
+                if current_totals is None:
                     st.info(f"{start_day} ~ {end_day} 구간에는 데이터가 없습니다.")
                 else:
-                    current_data = period_df
-                    summary_data = period_df
+                    summary_totals = current_totals
                     period_label = f"{start_day} ~ {end_day} 기간"
                     
                     days = (end_day - start_day).days + 1
                     prev_start = start_day - timedelta(days=days)
                     prev_end = start_day - timedelta(days=1)
-                    previous_data = filtered_df[(filtered_df["날짜"] >= prev_start) & (filtered_df["날짜"] <= prev_end)]
+                    previous_totals = cube.totals(prev_start, prev_end)
 
     # 주요 지표 카드
-    if not summary_data.empty:
-        main_metrics_card = create_main_metrics_card(summary_data, period_label)
+    if summary_totals is not None:
+        main_metrics_card = create_main_metrics_card(summary_totals, period_label)
         st.markdown(main_metrics_card, unsafe_allow_html=True)
 
     # ─── 차트 섹션 ────────────────────────────────────────
@@ -1042,36 +941,30 @@ def main():
     with chart_col1:
         st.markdown('<div class="chart-container">', unsafe_allow_html=True)
         if view_type == "월별":
-            monthly_data = (filtered_df.groupby("년월").agg({
-                col1_select: ("sum" if col1_select not in ["지상역률(%)", "진상역률(%)"] else "mean"),
-                col2_select: ("sum" if col2_select not in ["지상역률(%)", "진상역률(%)"] else "mean")
-            }).reset_index())
+            monthly_data = cube.aggregate("month", [col1_select, col2_select])
             monthly_data["년월_str"] = monthly_data["년월"].astype(str)
 
             fig = create_dual_axis_chart(monthly_data, "년월_str", col1_select, col2_select,
                                        f"월별 {col1_select} vs {col2_select} 비교", "월", col1_select, col2_select)
-            st.plotly_chart(fig, use_container_width=True)
+            st.plotly_chart(fig, width="stretch")
 
         else:
-            if isinstance(current_data, pd.DataFrame) and not current_data.empty:
-                daily_data = (period_df.groupby("날짜").agg({
-                    col1_select: ("sum" if col1_select not in ["지상역률(%)", "진상역률(%)"] else "mean"),
-                    col2_select: ("sum" if col2_select not in ["지상역률(%)", "진상역률(%)"] else "mean")
-                }).reset_index())
+            if current_totals is not None:
+                daily_data = cube.aggregate("day", [col1_select, col2_select], start_day, end_day)
 
                 fig = create_dual_axis_chart(daily_data, "날짜", col1_select, col2_select,
                                            f"{start_day} ~ {end_day} 날짜별 {col1_select} vs {col2_select}",
                                            "날짜", col1_select, col2_select)
-                st.plotly_chart(fig, use_container_width=True)
+                st.plotly_chart(fig, width="stretch")
         st.markdown('</div>', unsafe_allow_html=True)
 
     with chart_col2:
         # 월별 분석일 때 비교 테이블
-        if view_type == "월별" and not current_data.empty and not previous_data.empty:
+        if view_type == "월별" and current_totals is not None and previous_totals is not None:
             st.markdown('<div class="section-header" style="margin: 0 0 1rem 0;"><h3>전월 대비 분석</h3></div>', unsafe_allow_html=True)
-            comparison_df = create_comparison_table(current_data, previous_data, "월")
+            comparison_df = create_comparison_table(current_totals, previous_totals, "월")
             st.markdown('<div class="comparison-table">', unsafe_allow_html=True)
-            st.dataframe(comparison_df, use_container_width=True, hide_index=True)
+            st.dataframe(comparison_df, width="stretch", hide_index=True)
             st.markdown('</div>', unsafe_allow_html=True)
         else:
             st.markdown("")
@@ -1085,20 +978,17 @@ def main():
     daily_df = pd.DataFrame()
 
     with col1:
-        available_dates = sorted(filtered_df["날짜"].unique())
+        available_dates = cube.days
         if available_dates:
             min_d, max_d = available_dates[0], available_dates[-1]
             default_d = max_d
             selected_date = st.date_input("분석할 날짜 선택", value=default_d, min_value=min_d, max_value=max_d, key="daily_date_selector")
 
-            daily_df = filtered_df[filtered_df["날짜"] == selected_date]
+            daily_df = index.day(selected_date)
             if daily_df.empty:
                 st.warning(f"{selected_date} 데이터가 없습니다.")
             else:
-                hourly_data = (daily_df.groupby("시간").agg({
-                    col1_select: ("sum" if col1_select not in ["지상역률(%)", "진상역률(%)"] else "mean"),
-                    col2_select: ("sum" if col2_select not in ["지상역률(%)", "진상역률(%)"] else "mean")
-                }).reset_index())
+                hourly_data = cube.aggregate("hour", [col1_select, col2_select], selected_date, selected_date)
 
                 full_hours = pd.DataFrame({"시간": list(range(24))})
                 hourly_data = pd.merge(full_hours, hourly_data, on="시간", how="left").fillna(0)
@@ -1109,7 +999,7 @@ def main():
                                            "시간", col1_select, col2_select, add_time_zones=True)
 
                 fig.update_xaxes(tickmode="linear", tick0=0, dtick=1, title_text="시간")
-                st.plotly_chart(fig, use_container_width=True)
+                st.plotly_chart(fig, width="stretch")
                 st.markdown('</div>', unsafe_allow_html=True)
         else:
             st.info("선택된 조건에 맞는 데이터가 없습니다.")
@@ -1118,67 +1008,20 @@ def main():
         st.markdown("<br><br>", unsafe_allow_html=True)
         st.markdown('<div class="section-header" style="margin: 0;"><h3>전일 대비 역률 요금</h3></div>', unsafe_allow_html=True)
 
-        if available_dates and selected_date in available_dates:
-            try:
-                date_idx = available_dates.index(selected_date)
-                if date_idx > 0:
-                    previous_date = available_dates[date_idx - 1]
-                    previous_daily_df = filtered_df[filtered_df["날짜"] == previous_date]
-
-                    if not daily_df.empty and not previous_daily_df.empty:
-                        current_daytime = daily_df[(daily_df['시간'] >= 9) & (daily_df['시간'] < 23)]
-                        previous_daytime = previous_daily_df[(previous_daily_df['시간'] >= 9) & (previous_daily_df['시간'] < 23)]
-                        current_nighttime = daily_df[(daily_df['시간'] >= 23) | (daily_df['시간'] < 9)]
-                        previous_nighttime = previous_daily_df[(previous_daily_df['시간'] >= 23) | (previous_daily_df['시간'] < 9)]
-                        
-                        if len(current_daytime) > 0:
-                            current_daytime_raw = current_daytime['지상역률(%)'].mean()
-                            current_daytime_pf = max(60, min(95, current_daytime_raw))
-                        else:
-                            current_daytime_pf = 90
-                        
-                        if len(previous_daytime) > 0:
-                            previous_daytime_raw = previous_daytime['지상역률(%)'].mean()
-                            previous_daytime_pf = max(60, min(95, previous_daytime_raw))
-                        else:
-                            previous_daytime_pf = 90
-                        
-                        if len(current_nighttime) > 0:
-                            current_leading_raw = current_nighttime['진상역률(%)'].mean()
-                            if current_leading_raw > 0:
-                                current_nighttime_pf = max(60, current_leading_raw)
-                            else:
-                                current_nighttime_pf = 100
-                        else:
-                            current_nighttime_pf = 100
-                        
-                        if len(previous_nighttime) > 0:
-                            previous_leading_raw = previous_nighttime['진상역률(%)'].mean()
-                            if previous_leading_raw > 0:
-                                previous_nighttime_pf = max(60, previous_leading_raw)
-                            else:
-                                previous_nighttime_pf = 100
-                        else:
-                            previous_nighttime_pf = 100
-                        
-                        daytime_card = create_simple_power_factor_card("주간", "주간", current_daytime_pf, previous_daytime_pf, "daytime", "daytime-card")
-                        nighttime_card = create_simple_power_factor_card("야간", "야간", current_nighttime_pf, previous_nighttime_pf, "nighttime", "nighttime-card")
-                        
-                        st.markdown(daytime_card, unsafe_allow_html=True)
-                        st.markdown(nighttime_card, unsafe_allow_html=True)
-                    else:
-                        st.info("선택된 날짜 또는 전일 데이터가 없습니다.")
-                else:
-                    if not daily_df.empty:
-                        summary_df = create_summary_table(daily_df, "일")
-                        st.markdown('<div class="comparison-table">', unsafe_allow_html=True)
-                        st.dataframe(summary_df, use_container_width=True, hide_index=True)
-                        st.markdown('</div>', unsafe_allow_html=True)
-                        st.info("첫 번째 날짜로 전일 데이터가 없어 비교할 수 없습니다.")
-                    else:
-                        st.info("선택된 날짜의 데이터가 없습니다.")
-            except (ValueError, IndexError):
-                st.info("이전 날짜를 찾을 수 없습니다.")
+        if available_dates and selected_date in pf_table.index:
+            pf_row = pf_table.loc[selected_date]
+            if not pd.isna(pf_row["주간_전일대비"]):
+                daytime_card = create_simple_power_factor_card("주간", "주간", pf_row["주간_지상역률"], pf_row["주간_전일대비"], "daytime", "daytime-card")
+                nighttime_card = create_simple_power_factor_card("야간", "야간", pf_row["야간_진상역률"], pf_row["야간_전일대비"], "nighttime", "nighttime-card")
+                
+                st.markdown(daytime_card, unsafe_allow_html=True)
+                st.markdown(nighttime_card, unsafe_allow_html=True)
+            else:
+                summary_df = create_summary_table(cube.totals(selected_date, selected_date), "일")
+                st.markdown('<div class="comparison-table">', unsafe_allow_html=True)
+                st.dataframe(summary_df, width="stretch", hide_index=True)
+                st.markdown('</div>', unsafe_allow_html=True)
+                st.info("첫 번째 날짜로 전일 데이터가 없어 비교할 수 없습니다.")
 
     # 상세 비교 데이터 표
     if available_dates and selected_date in available_dates:
@@ -1186,17 +1029,24 @@ def main():
             date_idx = available_dates.index(selected_date)
             if date_idx > 0:
                 previous_date = available_dates[date_idx - 1]
-                previous_daily_df = filtered_df[filtered_df["날짜"] == previous_date]
+                current_day = cube.totals(selected_date, selected_date)
+                previous_day = cube.totals(previous_date, previous_date)
                 
-                if not daily_df.empty and not previous_daily_df.empty:
+                if current_day is not None and previous_day is not None:
                     st.markdown('<div class="section-header"><h3>상세 비교 데이터</h3></div>', unsafe_allow_html=True)
-                    comparison_df = create_comparison_table(daily_df, previous_daily_df, "일")
+                    comparison_df = create_comparison_table(current_day, previous_day, "일")
                     st.markdown('<div class="comparison-table">', unsafe_allow_html=True)
-                    st.dataframe(comparison_df, use_container_width=True, hide_index=True)
+                    st.dataframe(comparison_df, width="stretch", hide_index=True)
                     st.markdown('</div>', unsafe_allow_html=True)
         except (ValueError, IndexError):
             pass
 
+    # ─── 연간 역률 추이 ────────────────────────────────────────
+    if not pf_table.empty:
+        st.markdown('<div class="chart-container">', unsafe_allow_html=True)
+        st.plotly_chart(create_pf_trend_chart(pf_table, selected_date if available_dates else None), width="stretch")
+        st.markdown('</div>', unsafe_allow_html=True)
+
     st.markdown("---")
 
     # ─── 시간대별 현황 차트 ────────────────────────────────────────
@@ -1204,20 +1054,15 @@ def main():
         col_chart1, col_chart2 = st.columns([2, 1])
         with col_chart1:
             st.markdown('<div class="chart-container">', unsafe_allow_html=True)
-            st.plotly_chart(create_hourly_stack_chart(daily_df), use_container_width=True)
+            st.plotly_chart(create_hourly_stack_chart(cube.hour_by_worktype("전기요금(원)", selected_date, selected_date)), width="stretch")
             st.markdown('</div>', unsafe_allow_html=True)
         with col_chart2:
             st.markdown('<div class="chart-container">', unsafe_allow_html=True)
-            st.plotly_chart(create_concentric_donut_chart(daily_df), use_container_width=True)
+            st.plotly_chart(create_concentric_donut_chart(cube.by_worktype(selected_date, selected_date)["전력사용량(kWh)"]), width="stretch")
             st.markdown('</div>', unsafe_allow_html=True)
 
         st.markdown(f'<div class="section-header"><h3>{selected_date} 작업유형별 상세 분석</h3></div>', unsafe_allow_html=True)
-        worktype_stats = (daily_df.groupby("작업유형").agg(
-            전력사용량_합계=("전력사용량(kWh)", "sum"),
-            전기요금_합계=("전기요금(원)", "sum"),
-            평균_지상역률=("지상역률(%)", "mean"),
-            탄소배출량_합계=("탄소배출량(tCO2)", "sum")
-        ).round(2))
+        worktype_stats = create_worktype_stats(cube.by_worktype(selected_date, selected_date))
         
         # 작업유형 한글 변환
         worktype_stats.index = worktype_stats.index.map({
@@ -1227,26 +1072,21 @@ def main():
         })
         
         st.markdown('<div class="comparison-table">', unsafe_allow_html=True)
-        st.dataframe(worktype_stats, use_container_width=True)
+        st.dataframe(worktype_stats, width="stretch")
         st.markdown('</div>', unsafe_allow_html=True)
     else:
         col_chart1, col_chart2 = st.columns([2, 1])
         with col_chart1:
             st.markdown('<div class="chart-container">', unsafe_allow_html=True)
-            st.plotly_chart(create_hourly_stack_chart(filtered_df), use_container_width=True)
+            st.plotly_chart(create_hourly_stack_chart(cube.hour_by_worktype("전기요금(원)")), width="stretch")
             st.markdown('</div>', unsafe_allow_html=True)
         with col_chart2:
             st.markdown('<div class="chart-container">', unsafe_allow_html=True)
-            st.plotly_chart(create_concentric_donut_chart(filtered_df), use_container_width=True)
+            st.plotly_chart(create_concentric_donut_chart(cube.by_worktype()["전력사용량(kWh)"]), width="stretch")
             st.markdown('</div>', unsafe_allow_html=True)
 
         st.markdown('<div class="section-header"><h3>전체 기간 작업유형별 상세 분석</h3></div>', unsafe_allow_html=True)
-        worktype_stats = (filtered_df.groupby("작업유형").agg(
-            전력사용량_합계=("전력사용량(kWh)", "sum"),
-            전기요금_합계=("전기요금(원)", "sum"),
-            평균_지상역률=("지상역률(%)", "mean"),
-            탄소배출량_합계=("탄소배출량(tCO2)", "sum")
-        ).round(2))
+        worktype_stats = create_worktype_stats(cube.by_worktype())
         
         # 작업유형 한글 변환
         worktype_stats.index = worktype_stats.index.map({
@@ -1256,7 +1096,7 @@ def main():
         })
         
         st.markdown('<div class="comparison-table">', unsafe_allow_html=True)
-        st.dataframe(worktype_stats, use_container_width=True)
+        st.dataframe(worktype_stats, width="stretch")
         st.markdown('</div>', unsafe_allow_html=True)
 
     # ─── 푸터 ────────────────────────────────────────
@@ -0,0 +1,9 @@
+import pytest
+
+from utills.data import load_train
+
+
+@pytest.fixture(scope="session")
+def train():
+    """train.csv (load_train 캐시 프레임)"""
+    return load_train()
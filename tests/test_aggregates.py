@@ -0,0 +1,58 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from utills.aggregates import PrefixSums, ShapAggregator
+
+FEATURES = ["a", "b", "c"]
+
+
+@pytest.fixture
+def values():
+    return np.random.default_rng(0).normal(size=(500, len(FEATURES)))
+
+
+def test_prefix_sums_match_slice_sums():
+    frame = pd.DataFrame(np.random.default_rng(1).normal(size=(200, 2)), columns=["x", "y"])
+    frame.loc[[3, 50], "y"] = np.nan
+    sums = PrefixSums(frame, ["x", "y"])
+    for start, stop in [(0, 200), (10, 11), (3, 120), (150, 150), (-5, 500)]:
+        expected = frame.iloc[max(start, 0):stop].sum()
+        totals = sums.range_totals(start, stop)
+        assert totals["x"] == pytest.approx(expected["x"], abs=1e-9)
+        assert sums.range_sum("y", start, stop) == pytest.approx(expected["y"], abs=1e-9)
+
+
+@pytest.mark.parametrize("batches", [[500], [1] * 40 + [460], [7, 100, 3, 390]])
+def test_shap_mean_var_match_numpy(values, batches):
+    agg = ShapAggregator(FEATURES, capacity=64)
+    edges = np.cumsum([0] + batches)
+    for start, stop in zip(edges[:-1], edges[1:]):
+        agg.update_batch(values[start:stop])
+
+    abs_vals = np.abs(values)
+    assert len(agg) == len(values)
+    np.testing.assert_allclose(list(agg.mean_abs().values()), abs_vals.mean(axis=0), rtol=1e-12)
+    np.testing.assert_allclose(list(agg.var_abs().values()), np.var(abs_vals, axis=0), rtol=1e-10)
+
+
+@pytest.mark.parametrize("batches", [[10], [30, 30, 30], [5, 200], [63, 1, 1]])
+def test_shap_ring_buffer_keeps_latest(values, batches):
+    agg = ShapAggregator(FEATURES, capacity=64)
+    edges = np.cumsum([0] + batches)
+    for start, stop in zip(edges[:-1], edges[1:]):
+        agg.update_batch(values[start:stop])
+
+    seen = values[:edges[-1]]
+    np.testing.assert_array_equal(agg.recent(), seen[-64:])
+    np.testing.assert_array_equal(agg.recent(5), seen[-5:])
+    assert agg.last() == dict(zip(FEATURES, seen[-1]))
+
+
+def test_shap_clear():
+    agg = ShapAggregator(FEATURES)
+    agg.update([1.0, -2.0, 3.0])
+    agg.clear()
+    assert not agg
+    assert agg.last() == {}
+    assert len(agg.recent()) == 0
@@ -0,0 +1,59 @@
+import io
+
+import numpy as np
+import pandas as pd
+from docx import Document
+
+from utills.docx_table import add_bulk_table, format_column
+
+
+def roundtrip(doc):
+    buffer = io.BytesIO()
+    doc.save(buffer)
+    buffer.seek(0)
+    return Document(buffer)
+
+
+def test_bulk_table_roundtrip():
+    frame = pd.DataFrame({
+        "날짜": ["2024-01-01", "2024-01-02", "<&>"],
+        "건수": np.array([1, 2000, 30], dtype=np.int64),
+        "전력사용량(kWh)": [1234.5678, np.nan, 0.1],
+        "휴일": [True, False, True],
+    })
+    doc = Document()
+    doc.add_paragraph("앞 문단")
+    add_bulk_table(doc, frame)
+    doc.add_paragraph("뒤 문단")
+
+    loaded = roundtrip(doc)
+    assert len(loaded.tables) == 1
+    table = loaded.tables[0]
+    rows = [[cell.text for cell in row.cells] for row in table.rows]
+    assert rows[0] == list(frame.columns)
+    expected = [format_column(frame[c], "{:,.2f}") for c in frame.columns]
+    assert rows[1:] == [list(r) for r in zip(*expected)]
+    assert rows[1:][0] == ["2024-01-01", "1", "1,234.57", "True"]
+    assert rows[2][2] == ""
+    assert rows[3][0] == "<&>"
+
+    # 표는 문서 끝(구역 속성 앞)에 순서대로 들어감
+    body = [child.tag.rsplit("}", 1)[-1] for child in loaded.element.body]
+    assert body[:3] == ["p", "tbl", "p"]
+    assert body[-1] == "sectPr"
+
+
+def test_bulk_table_header_and_alignment():
+    frame = pd.DataFrame({"이름": ["a"], "값": [1.5]})
+    doc = Document()
+    add_bulk_table(doc, frame, float_format="{:.1f}", col_widths=[1, 3])
+    table = roundtrip(doc).tables[0]
+
+    header = table.rows[0]
+    assert header._tr.trPr is not None and header._tr.trPr.xpath("./w:tblHeader")
+    assert all(run.bold for cell in header.cells for p in cell.paragraphs for run in p.runs)
+    value_cell = table.rows[1].cells[1]
+    assert value_cell.text == "1.5"
+    assert value_cell.paragraphs[0].alignment == 2  # WD_ALIGN_PARAGRAPH.RIGHT
+    widths = [cell.width for cell in table.rows[0].cells]
+    assert widths[1] > 2.9 * widths[0]
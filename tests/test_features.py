@@ -0,0 +1,38 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from utills.data import MODEL_DIR
+from utills.features import FEATURE_COLUMNS, MEASURE_COLUMNS, WORK_TYPE_CODES, build_features
+
+FEATURE_CSVS = ["target_pred_feature_xgboost.csv", "target_pred_feature_lstm.csv"]
+
+
+@pytest.mark.parametrize("name", FEATURE_CSVS)
+def test_build_features_matches_feature_csv(name):
+    """피처 CSV의 측정값/작업유형/역률 이진값만으로 나머지 피처를 다시 계산"""
+    csv = pd.read_csv(MODEL_DIR / name)
+    work_types = {code: work for work, code in WORK_TYPE_CODES.items()}
+    source = csv[["측정일시", "id", *MEASURE_COLUMNS, "진상역률_이진", "지상역률_이진"]].assign(
+        작업유형=csv["작업유형_encoded"].map(work_types))
+
+    features = build_features(source)
+    assert list(features.columns) == FEATURE_COLUMNS + ["측정일시", "id"]
+    for column in FEATURE_COLUMNS:
+        np.testing.assert_allclose(features[column].to_numpy(dtype=np.float64),
+                                   csv[column].to_numpy(dtype=np.float64), rtol=1e-12, atol=1e-12,
+                                   err_msg=column)
+
+
+def test_lag_features_zero_fill():
+    frame = pd.DataFrame({
+        "측정일시": pd.date_range("2024-01-01", periods=8, freq="15min"),
+        "작업유형": "Light_Load",
+        "전력사용량(kWh)": np.arange(1.0, 9.0),
+        "지상무효전력량(kVarh)": 1.0,
+        "진상무효전력량(kVarh)": 0.0,
+        "탄소배출량(tCO2)": 0.0,
+    })
+    features = build_features(frame)
+    np.testing.assert_array_equal(features["전력사용량_lag_2"], [0, 0, 1, 2, 3, 4, 5, 6])
+    np.testing.assert_array_equal(features["전력사용량_lag_6"], [0, 0, 0, 0, 0, 0, 1, 2])
@@ -0,0 +1,64 @@
+import datetime
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from utills.rollup import MEAN_COLUMNS, NUMERIC_COLUMNS, RollupCube
+
+AGG = {col: "mean" if col in MEAN_COLUMNS else "sum" for col in NUMERIC_COLUMNS}
+
+
+@pytest.fixture(scope="module")
+def cube(train):
+    return RollupCube.from_frame(train)
+
+
+def raw_groupby(frame, key):
+    """15분 원본을 그대로 groupby().agg() — 큐브 결과의 기준값"""
+    frame = frame.assign(**{col: frame[col].astype(np.float64) for col in NUMERIC_COLUMNS})
+    if key == "날짜":
+        frame = frame.assign(날짜=frame["날짜"].dt.date)
+    return frame.groupby(key, sort=True, observed=True).agg(AGG)[NUMERIC_COLUMNS]
+
+
+def assert_frame_close(result, expected):
+    assert list(result.index) == list(expected.index)
+    np.testing.assert_allclose(result[NUMERIC_COLUMNS].to_numpy(), expected.to_numpy(), rtol=1e-6)
+
+
+@pytest.mark.parametrize("level, key", [("month", "년월"), ("day", "날짜"), ("hour", "시간")])
+def test_aggregate_matches_raw_groupby(train, cube, level, key):
+    result = cube.aggregate(level, NUMERIC_COLUMNS).set_index(key)
+    assert_frame_close(result, raw_groupby(train, key))
+
+
+def test_aggregate_date_range(train, cube):
+    start, stop = datetime.date(2024, 3, 10), datetime.date(2024, 4, 5)
+    days = train["날짜"].dt.date
+    rows = train[(days >= start) & (days <= stop)]
+    for level, key in [("day", "날짜"), ("hour", "시간")]:
+        result = cube.aggregate(level, NUMERIC_COLUMNS, start=start, stop=stop).set_index(key)
+        assert_frame_close(result, raw_groupby(rows, key))
+
+
+def test_month_filter_and_totals(train, cube):
+    month = pd.Period("2024-06", "M")
+    rows = train[train["년월"] == month]
+    result = cube.aggregate("day", NUMERIC_COLUMNS, month=month).set_index("날짜")
+    assert_frame_close(result, raw_groupby(rows, "날짜"))
+
+    totals = cube.totals(month=month)
+    expected = rows[NUMERIC_COLUMNS].astype(np.float64).agg(AGG)
+    np.testing.assert_allclose(totals[NUMERIC_COLUMNS].to_numpy(), expected.to_numpy(), rtol=1e-6)
+    assert cube.totals(start=datetime.date(2030, 1, 1)) is None
+
+
+def test_by_worktype_and_hour_pivot(train, cube):
+    expected = raw_groupby(train, "작업유형")
+    assert_frame_close(cube.by_worktype(), expected)
+
+    pivot = cube.hour_by_worktype("전력사용량(kWh)")
+    raw = (train.assign(kwh=train["전력사용량(kWh)"].astype(np.float64))
+           .groupby(["시간", "작업유형"], observed=True)["kwh"].sum().unstack(fill_value=0))
+    np.testing.assert_allclose(pivot.to_numpy(), raw.loc[pivot.index, pivot.columns].to_numpy(), rtol=1e-6)
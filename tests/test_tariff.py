@@ -0,0 +1,30 @@
+import numpy as np
+import pytest
+
+from utills.tariff import DATASET_TARIFF, frame_cost, load_period_codes, validate
+
+# 라벨은 소수 넷째 자리 이하에서만 차이 (float 반올림 수준)
+LABEL_ATOL = 1e-3
+
+
+def test_dataset_tariff_reproduces_label(train):
+    computed = frame_cost(train, DATASET_TARIFF)
+    np.testing.assert_allclose(computed, train["전기요금(원)"].to_numpy(), rtol=0, atol=LABEL_ATOL)
+
+
+def test_power_factor_from_energy_matches_label(train):
+    """지상역률(%) 컬럼 없이 전력량으로 역률을 계산해도 라벨과 일치"""
+    computed = frame_cost(train.drop(columns="지상역률(%)"), DATASET_TARIFF)
+    np.testing.assert_allclose(computed, train["전기요금(원)"].to_numpy(), rtol=0, atol=LABEL_ATOL)
+
+
+def test_validate_totals(train):
+    result = validate(train)
+    assert result["rows"] == len(train)
+    assert result["max_abs_error"] <= LABEL_ATOL
+    assert result["computed_total"] == pytest.approx(train["전기요금(원)"].sum(), abs=1.0)
+
+
+def test_unknown_work_type():
+    with pytest.raises(ValueError):
+        load_period_codes(["Light_Load", "Peak"])
@@ -0,0 +1,48 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from utills.weather import WEATHER_COLUMNS, WEATHER_TOLERANCE, asof_weather, load_weather, parse_hour_minutes
+
+
+@pytest.fixture(scope="module")
+def weather():
+    return load_weather()
+
+
+def merge_asof_oracle(times, weather, tolerance):
+    """컬럼별로 결측 관측을 뺀 뒤 pd.merge_asof(backward) — asof_weather의 기준값"""
+    left = pd.DataFrame({"일시": pd.to_datetime(times)}).reset_index()
+    out = {}
+    for column in WEATHER_COLUMNS:
+        right = weather.loc[weather[column].notna(), ["일시", column]]
+        merged = pd.merge_asof(left.sort_values("일시"), right, on="일시", tolerance=tolerance)
+        out[column] = merged.sort_values("index")[column].to_numpy(dtype=np.float32)
+    return out
+
+
+@pytest.mark.parametrize("tolerance", [WEATHER_TOLERANCE, pd.Timedelta(minutes=30)])
+def test_asof_matches_merge_asof(train, weather, tolerance):
+    times = train["측정일시"].to_numpy()
+    result = asof_weather(times, weather, tolerance)
+    expected = merge_asof_oracle(times, weather, tolerance)
+    for column in WEATHER_COLUMNS:
+        np.testing.assert_array_equal(result[column], expected[column])
+
+
+def test_asof_unsorted_input_and_december(train, weather):
+    """입력 순서 유지, 마지막 관측 + 허용 간격 이후(12월)는 결측"""
+    times = pd.to_datetime(["2024-12-15 12:00", "2024-03-01 10:10", "2024-01-01 00:00",
+                            "2024-06-30 23:59", "2023-12-31 23:00"]).to_numpy()
+    result = asof_weather(times, weather)
+    expected = merge_asof_oracle(times, weather, WEATHER_TOLERANCE)
+    for column in WEATHER_COLUMNS:
+        np.testing.assert_array_equal(result[column], expected[column])
+        assert np.isnan(result[column][0]) and np.isnan(result[column][-1])
+
+
+def test_parse_hour_minutes():
+    np.testing.assert_array_equal(parse_hour_minutes(["0", "100", "2300", "1:30", "01:00"]), [0, 60, 1380, 90, 60])
+    np.testing.assert_array_equal(parse_hour_minutes(["0", "5", "23"]), [0, 300, 1380])
+    with pytest.raises(ValueError):
+        parse_hour_minutes(["2400"])
@@ -0,0 +1,126 @@
+import numpy as np
+
+
+# ========== 1. 누적합 기반 구간 합계 ==========
+class PrefixSums:
+    """컬럼별 누적합 배열 — 임의 구간 [start, stop) 합계를 O(1)로 계산"""
+
+    def __init__(self, frame, columns):
+        self.columns = list(columns)
+        values = frame[self.columns].to_numpy(dtype=np.float64, na_value=np.nan)
+        # 결측치는 0으로 보고 누적 (예측값이 없는 구간)
+        values = np.nan_to_num(values, nan=0.0)
+        self._prefix = np.zeros((len(frame) + 1, len(self.columns)), dtype=np.float64)
+        np.cumsum(values, axis=0, out=self._prefix[1:])
+        self._index = {col: i for i, col in enumerate(self.columns)}
+
+    def __len__(self):
+        return len(self._prefix) - 1
+
+    def _clip(self, start, stop):
+        n = len(self)
+        start = min(max(int(start), 0), n)
+        stop = min(max(int(stop), start), n)
+        return start, stop
+
+    def range_sum(self, column, start, stop):
+        """단일 컬럼의 [start, stop) 합계"""
+        start, stop = self._clip(start, stop)
+        j = self._index[column]
+        return float(self._prefix[stop, j] - self._prefix[start, j])
+
+    def range_totals(self, start, stop):
+        """모든 컬럼의 [start, stop) 합계 (dict)"""
+        start, stop = self._clip(start, stop)
+        totals = self._prefix[stop] - self._prefix[start]
+        return dict(zip(self.columns, totals.tolist()))
+
+
+# ========== 2. SHAP 스트리밍 집계 ==========
+class ShapAggregator:
+    """피처별 |SHAP| 평균/분산을 누적 갱신하고 최근 값은 고정 크기 링버퍼에 보관
+
+    - 평균/분산: Welford(배치는 Chan 병합) 방식으로 갱신 → 세션 길이와 무관하게 O(피처 수)
+    - 링버퍼: (capacity, 피처 수) NumPy 배열 — 메모리 고정
+    """
+
+    def __init__(self, feature_names, capacity=1024):
+        self.feature_names = list(feature_names)
+        self.capacity = int(capacity)
+        self._index = {f: i for i, f in enumerate(self.feature_names)}
+        self._buffer = np.zeros((self.capacity, len(self.feature_names)), dtype=np.float64)
+        self.clear()
+
+    def clear(self):
+        self.count = 0
+        self._head = 0  # 다음에 쓸 링버퍼 위치
+        self._mean_abs = np.zeros(len(self.feature_names), dtype=np.float64)
+        self._m2_abs = np.zeros(len(self.feature_names), dtype=np.float64)
+
+    def __len__(self):
+        return self.count
+
+    def __bool__(self):
+        return self.count > 0
+
+    def update(self, values):
+        """한 틱의 SHAP 벡터 추가"""
+        self.update_batch(np.asarray(values, dtype=np.float64).reshape(1, -1))
+
+    def update_batch(self, values):
+        """여러 틱의 SHAP 행렬 (n, 피처 수)을 한 번에 추가"""
+        values = np.asarray(values, dtype=np.float64)
+        n = len(values)
+        if n == 0:
+            return
+
+        # 평균/분산 병합
+        abs_vals = np.abs(values)
+        batch_mean = abs_vals.mean(axis=0)
+        batch_m2 = ((abs_vals - batch_mean) ** 2).sum(axis=0)
+        total = self.count + n
+        delta = batch_mean - self._mean_abs
+        self._mean_abs += delta * (n / total)
+        self._m2_abs += batch_m2 + delta ** 2 * (self.count * n / total)
+        self.count = total
+
+        # 링버퍼 기록 (capacity보다 길면 마지막 capacity개만)
+        if n >= self.capacity:
+            self._buffer[:] = values[-self.capacity:]
+            self._head = 0
+            return
+        end = self._head + n
+        if end <= self.capacity:
+            self._buffer[self._head:end] = values
+        else:
+            split = self.capacity - self._head
+            self._buffer[self._head:] = values[:split]
+            self._buffer[:n - split] = values[split:]
+        self._head = end % self.capacity
+
+    def mean_abs(self, features=None):
+        """피처별 평균 |SHAP| (dict)"""
+        return self._select(self._mean_abs, features)
+
+    def var_abs(self, features=None):
+        """피처별 |SHAP| 분산 (dict)"""
+        var = self._m2_abs / self.count if self.count else self._m2_abs
+        return self._select(var, features)
+
+    def recent(self, n=None):
+        """최근 n개 SHAP 벡터 (오래된 순, (n, 피처 수) 배열)"""
+        size = min(self.count, self.capacity)
+        n = size if n is None else min(int(n), size)
+        idx = (self._head - n + np.arange(n)) % self.capacity
+        return self._buffer[idx]
+
+    def last(self, features=None):
+        """가장 최근 SHAP 벡터 (dict)"""
+        if not self.count:
+            return {}
+        return self._select(self._buffer[(self._head - 1) % self.capacity], features)
+
+    def _select(self, arr, features):
+        if features is None:
+            features = self.feature_names
+        return {f: float(arr[self._index[f]]) for f in features if f in self._index}
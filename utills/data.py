@@ -0,0 +1,239 @@
+import hashlib
+import os
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from utills.aggregates import PrefixSums
+
+# ─── 경로 설정 ────────────────────────────────────────
+ROOT_DIR = Path(__file__).resolve().parent.parent
+DATA_DIR = ROOT_DIR / "data"
+MODEL_DIR = ROOT_DIR / "models"
+CACHE_DIR = ROOT_DIR / "cache"
+
+TRAIN_CSV = DATA_DIR / "train.csv"
+TEST_CSV = DATA_DIR / "test.csv"
+
+# 캐시 포맷이 바뀌면 올려서 기존 캐시를 무효화
+CACHE_VERSION = 2
+
+
+# ========== 1. 캐시 키 / 저장 ==========
+def source_signature(*paths):
+    """원본 파일들의 크기 + 수정시각 기반 시그니처"""
+    parts = []
+    for path in paths:
+        stat = os.stat(path)
+        parts.append(f"{Path(path).resolve()}|{stat.st_size}|{stat.st_mtime_ns}")
+    parts.append(f"v{CACHE_VERSION}")
+    return hashlib.sha1("\n".join(parts).encode("utf-8")).hexdigest()[:16]
+
+
+def cache_file_for(name, sources, suffix):
+    """cache/<name>-<시그니처>.<suffix> 경로"""
+    return CACHE_DIR / f"{name}-{source_signature(*sources)}.{suffix}"
+
+
+def _drop_stale(name, keep, suffix):
+    """같은 이름의 이전 버전 캐시 삭제"""
+    for old in CACHE_DIR.glob(f"{name}-*.{suffix}"):
+        if old != keep:
+            try:
+                old.unlink()
+            except OSError:
+                pass
+
+
+def _write_cache(cache_file, name, suffix, write):
+    """임시 파일에 쓴 뒤 교체 (동시에 여러 프로세스가 만들어도 안전)"""
+    try:
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        tmp_file = cache_file.with_name(f"{cache_file.name}.tmp{os.getpid()}")
+        write(tmp_file)
+        os.replace(tmp_file, cache_file)
+        _drop_stale(name, cache_file, suffix)
+    except (ImportError, OSError):
+        # pyarrow 미설치 / 쓰기 권한 없음 → 캐시 없이 진행
+        pass
+
+
+def read_cached_frame(path, build, name=None):
+    """원본이 그대로면 Parquet 캐시를, 바뀌었으면 build(path) 결과를 캐시 후 반환"""
+    name = name or Path(path).stem
+    cache_file = cache_file_for(name, [path], "parquet")
+    if cache_file.exists():
+        try:
+            return pd.read_parquet(cache_file)
+        except Exception:
+            pass
+
+    df = build(path)
+    _write_cache(cache_file, name, "parquet",
+                 lambda tmp: df.to_parquet(tmp, index=False))
+    return df
+
+
+def read_cached_array(name, sources, build):
+    """sources가 그대로면 .npy 캐시를 메모리 맵으로, 아니면 build() 결과를 캐시 후 반환"""
+    cache_file = cache_file_for(name, sources, "npy")
+    if cache_file.exists():
+        try:
+            return np.load(cache_file, mmap_mode="r")
+        except (OSError, ValueError):
+            pass
+
+    arr = np.ascontiguousarray(build())
+
+    def save(tmp_file):
+        with open(tmp_file, "wb") as f:
+            np.save(f, arr)
+
+    _write_cache(cache_file, name, "npy", save)
+    return arr
+
+
+def read_cached_bytes(name, sources, build, suffix="bin"):
+    """sources가 그대로면 cache/ 의 파일 내용을, 아니면 build() 결과(bytes)를 캐시 후 반환"""
+    cache_file = cache_file_for(name, sources, suffix)
+    if cache_file.exists():
+        try:
+            return cache_file.read_bytes()
+        except OSError:
+            pass
+
+    data = build()
+    _write_cache(cache_file, name, suffix, lambda tmp: tmp.write_bytes(data))
+    return data
+
+
+# ========== 2. train.csv 로드 ==========
+# 소수 둘째 자리 측정값/역률 → float32로 충분 (전기요금은 합계 정밀도를 위해 float64 유지)
+FLOAT32_COLUMNS = ["전력사용량(kWh)", "지상무효전력량(kVarh)", "진상무효전력량(kVarh)",
+                   "탄소배출량(tCO2)", "지상역률(%)", "진상역률(%)"]
+
+TRAIN_DTYPES = {"id": np.int32, "작업유형": "category", **dict.fromkeys(FLOAT32_COLUMNS, np.float32)}
+
+
+def add_calendar_columns(df):
+    """측정일시에서 날짜/시간/월/일/년월 파생 (날짜는 파이썬 date 객체 대신 datetime64 자정값)"""
+    ts = df["측정일시"].dt
+    df["날짜"] = ts.normalize()
+    df["시간"] = ts.hour.astype(np.int8)
+    df["월"] = ts.month.astype(np.int8)
+    df["일"] = ts.day.astype(np.int8)
+    df["년월"] = ts.to_period("M")
+    return df
+
+
+def parse_train_csv(path=TRAIN_CSV):
+    """CSV 파싱 + 파생 컬럼 생성 (캐시 미스 시 사용)"""
+    df = pd.read_csv(path, dtype=TRAIN_DTYPES)
+    df["측정일시"] = pd.to_datetime(df["측정일시"])
+    return add_calendar_columns(df)
+
+
+def frame_memory(df):
+    """프레임 메모리 사용량 (전체 바이트, 행당 바이트)"""
+    total = int(df.memory_usage(deep=True).sum())
+    return total, total / max(len(df), 1)
+
+
+def load_train(path=TRAIN_CSV, use_cache=True):
+    """train.csv 로드 (타입이 지정된 컬럼형 캐시 사용)"""
+    if not use_cache:
+        return parse_train_csv(path)
+    return read_cached_frame(path, parse_train_csv)
+
+
+class TimeIndex:
+    """날짜 순으로 정렬된 프레임에 대한 날짜 구간 조회
+
+    날짜 경계를 이진 탐색(O(log n))해 연속 구간을 iloc 슬라이스로 반환 → 전체 마스크 비교/복사 없음
+    (train.csv의 00:00 행은 전날 마지막 행으로 들어 있으므로 측정일시가 아닌 날짜 기준, 날짜 안 순서는 원본 유지)
+    """
+
+    def __init__(self, df):
+        days = np.asarray(df["날짜"]).astype("datetime64[D]")
+        if len(days) and (np.diff(days) < np.timedelta64(0, "D")).any():
+            order = np.argsort(days, kind="stable")
+            df, days = df.iloc[order].reset_index(drop=True), days[order]
+        self.frame = df
+        self._days = days
+
+    def __len__(self):
+        return len(self.frame)
+
+    @property
+    def first_day(self):
+        return self._days[0].astype(object)
+
+    @property
+    def last_day(self):
+        return self._days[-1].astype(object)
+
+    def _bounds(self, start, stop):
+        """[start, stop] (양끝 포함) 날짜의 행 위치"""
+        i = int(np.searchsorted(self._days, np.datetime64(start, "D"), side="left"))
+        j = int(np.searchsorted(self._days, np.datetime64(stop, "D"), side="right"))
+        return i, max(i, j)
+
+    def range(self, start, stop):
+        """start ~ stop 날짜 (양끝 포함) 구간"""
+        i, j = self._bounds(start, stop)
+        return self.frame.iloc[i:j]
+
+    def day(self, day):
+        return self.range(day, day)
+
+    def month(self, period):
+        """년월(Period) 한 달 구간"""
+        return self.range(period.start_time.date(), period.end_time.date())
+
+
+# ========== 3. 실시간 모니터링 공유 데이터 ==========
+MONITOR_TARGET_CSV = MODEL_DIR / "final_lstm_target.csv"
+MONITOR_FEATURE_CSV = MODEL_DIR / "target_pred_feature_lstm.csv"
+
+# 모니터링 시작 지점 (2024-12-01 12:00)
+MONITOR_START_ID = 32111
+
+# 피처 데이터에서 모델 입력이 아닌 컬럼
+NON_FEATURE_COLUMNS = ["id", "측정일시", "target"]
+
+# KPI 카드에 누적 표시하는 컬럼 (target = 예측 전기요금)
+KPI_COLUMNS = ["target", "전력사용량(kWh)", "지상무효전력량(kVarh)", "진상무효전력량(kVarh)", "탄소배출량(tCO2)"]
+
+
+@dataclass(frozen=True)
+class MonitorStore:
+    """모든 세션이 함께 읽는 실시간 모니터링 데이터 (읽기 전용)"""
+    data: pd.DataFrame
+    feat_data: pd.DataFrame
+    start_idx: int
+    feature_names: tuple
+    kpi_sums: PrefixSums
+
+    def __len__(self):
+        return len(self.data)
+
+    def kpi_totals(self, start, stop):
+        """[start, stop) 구간 KPI 합계 — 누적합 차이로 O(1)"""
+        return self.kpi_sums.range_totals(start, stop)
+
+
+def load_monitor_store(target_path=MONITOR_TARGET_CSV, feature_path=MONITOR_FEATURE_CSV,
+                       start_id=MONITOR_START_ID):
+    """예측 결과 / 피처 CSV를 한 번 읽어 MonitorStore 생성"""
+    data = pd.read_csv(target_path, parse_dates=["측정일시"])
+    feat_data = pd.read_csv(feature_path, parse_dates=["측정일시"])
+
+    matches = np.flatnonzero(data["id"].to_numpy() == start_id)
+    start_idx = int(matches[0]) if len(matches) else 0
+    feature_names = tuple(feat_data.columns.drop(NON_FEATURE_COLUMNS))
+
+    kpi_frame = feat_data[KPI_COLUMNS[1:]].assign(target=data["target"].to_numpy())
+    kpi_sums = PrefixSums(kpi_frame, KPI_COLUMNS)
+    return MonitorStore(data, feat_data, start_idx, feature_names, kpi_sums)
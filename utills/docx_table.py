@@ -0,0 +1,76 @@
+"""python-docx 대용량 표 작성
+
+add_table() + cell.text 는 셀마다 프록시 객체를 만들고 XML 트리를 다시 탐색해서 (행 × 열)이 커지면 매우 느림
+→ 표 전체 <w:tbl> XML 문자열을 한 번에 만들고 parse_xml 한 번으로 본문에 삽입
+"""
+from xml.sax.saxutils import escape
+
+import numpy as np
+import pandas as pd
+from docx.oxml import parse_xml
+from docx.oxml.ns import nsdecls
+from docx.table import Table
+
+# 1 twip = 635 EMU (표 너비 단위 변환)
+EMU_PER_TWIP = 635
+
+
+def format_column(values, float_format):
+    """컬럼 값 → 셀 문자열 목록 (숫자는 float_format, 결측은 빈칸)"""
+    if pd.api.types.is_bool_dtype(values) or not pd.api.types.is_numeric_dtype(values):
+        return ["" if pd.isna(v) else str(v) for v in values]
+    if pd.api.types.is_integer_dtype(values):
+        return [f"{v:,}" for v in values.tolist()]
+    return ["" if np.isnan(v) else float_format.format(v) for v in values.to_numpy(dtype=np.float64)]
+
+
+def _cell_xml(text, width, bold=False, align=None):
+    ppr = f'<w:pPr><w:jc w:val="{align}"/></w:pPr>' if align else ""
+    rpr = "<w:rPr><w:b/></w:rPr>" if bold else ""
+    run = f'<w:r>{rpr}<w:t xml:space="preserve">{escape(text)}</w:t></w:r>' if text else ""
+    return f'<w:tc><w:tcPr><w:tcW w:w="{width}" w:type="dxa"/></w:tcPr><w:p>{ppr}{run}</w:p></w:tc>'
+
+
+def _content_width(doc):
+    """마지막 구역의 본문 폭 (twip)"""
+    section = doc.sections[-1]
+    return int((section.page_width - section.left_margin - section.right_margin) / EMU_PER_TWIP)
+
+
+def add_bulk_table(doc, frame, style="Table Grid", float_format="{:,.2f}", col_widths=None):
+    """DataFrame → 문서 끝에 표 추가 (머리글 행은 굵게 + 페이지마다 반복, 숫자 컬럼은 오른쪽 정렬)
+
+    col_widths: 컬럼별 상대 너비 (기본: 균등)
+    """
+    columns = [str(c) for c in frame.columns]
+    total = _content_width(doc)
+    weights = np.ones(len(columns)) if col_widths is None else np.asarray(col_widths, dtype=np.float64)
+    widths = np.floor(total * weights / weights.sum()).astype(int).tolist()
+    numeric = [pd.api.types.is_numeric_dtype(frame[c]) and not pd.api.types.is_bool_dtype(frame[c])
+               for c in frame.columns]
+    cells = [format_column(frame[c], float_format) for c in frame.columns]
+
+    style_id = doc.styles[style].style_id
+    parts = [
+        f'<w:tbl {nsdecls("w")}><w:tblPr><w:tblStyle w:val="{style_id}"/><w:tblW w:w="0" w:type="auto"/>'
+        '<w:tblLook w:val="04A0" w:firstRow="1" w:lastRow="0" w:firstColumn="1" w:lastColumn="0" '
+        'w:noHBand="0" w:noVBand="1"/></w:tblPr><w:tblGrid>',
+        "".join(f'<w:gridCol w:w="{w}"/>' for w in widths),
+        "</w:tblGrid><w:tr><w:trPr><w:tblHeader/></w:trPr>",
+        "".join(_cell_xml(name, w, bold=True, align="center") for name, w in zip(columns, widths)),
+        "</w:tr>",
+    ]
+    aligns = ["right" if is_num else None for is_num in numeric]
+    for row in zip(*cells):
+        parts.append("<w:tr>")
+        parts.append("".join(_cell_xml(text, w, align=a) for text, w, a in zip(row, widths, aligns)))
+        parts.append("</w:tr>")
+    parts.append("</w:tbl>")
+
+    tbl = parse_xml("".join(parts))
+    body = doc.element.body
+    if body.sectPr is not None:
+        body.sectPr.addprevious(tbl)
+    else:
+        body.append(tbl)
+    return Table(tbl, doc._body)
@@ -0,0 +1,103 @@
+"""XGBoost TreeSHAP 기여도 일괄 계산 및 캐시
+
+사용법 (배포 시 캐시 미리 생성):
+    python -m utills.explain
+"""
+import pickle
+import time
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from utills.data import MODEL_DIR, NON_FEATURE_COLUMNS, read_cached_array
+
+XGB_MODEL_PATH = MODEL_DIR / "xgboost.pkl"
+XGB_FEATURE_CSV = MODEL_DIR / "target_pred_feature_xgboost.csv"
+
+
+def load_xgb_model(path=XGB_MODEL_PATH):
+    """xgboost.pkl (XGBRegressor) 로드"""
+    with open(path, "rb") as f:
+        return pickle.load(f)
+
+
+def model_feature_names(model):
+    """학습 시 사용한 피처 순서"""
+    names = getattr(model, "feature_names_in_", None)
+    if names is None:
+        names = model.get_booster().feature_names
+    return [str(n) for n in names]
+
+
+def compute_contributions(model, features):
+    """전체 행에 대한 TreeSHAP 기여도를 한 번에 계산 (마지막 열 = bias)"""
+    import xgboost as xgb
+
+    names = model_feature_names(model)
+    dmatrix = xgb.DMatrix(features[names].to_numpy(dtype=np.float32), feature_names=names)
+    return model.get_booster().predict(dmatrix, pred_contribs=True).astype(np.float32)
+
+
+@dataclass(frozen=True)
+class ShapTable:
+    """행 번호로 O(1) 조회하는 SHAP 기여도 표"""
+    ids: np.ndarray
+    values: np.ndarray        # (행 수, 피처 수)
+    base_values: np.ndarray   # (행 수,)
+    feature_names: tuple
+
+    def __len__(self):
+        return len(self.values)
+
+    def row(self, i):
+        return self.values[i]
+
+    def rows(self, start, stop):
+        return self.values[start:stop]
+
+    def align_to(self, ids):
+        """다른 프레임의 id 순서에 맞춘 ShapTable 반환 (없는 id는 0)"""
+        ids = np.asarray(ids)
+        if len(ids) == len(self.ids) and np.array_equal(ids, self.ids):
+            return self
+        pos = pd.Index(self.ids).get_indexer(ids)
+        values = np.where((pos >= 0)[:, None], self.values[pos], 0.0).astype(np.float32)
+        base = np.where(pos >= 0, self.base_values[pos], 0.0).astype(np.float32)
+        return ShapTable(ids, values, base, self.feature_names)
+
+
+def load_shap_table(model_path=XGB_MODEL_PATH, feature_path=XGB_FEATURE_CSV):
+    """모델/피처 파일이 바뀌지 않았으면 cache/ 의 기여도 배열을 그대로 사용
+
+    파일이 없으면 FileNotFoundError, 피처 CSV 컬럼이 모델 피처와 다르면 ValueError
+    """
+    features = pd.read_csv(feature_path)
+    names = [c for c in features.columns if c not in NON_FEATURE_COLUMNS]
+
+    def build():
+        model = load_xgb_model(model_path)
+        model_names = model_feature_names(model)
+        # 표의 열 = CSV 피처 컬럼 — 모델 입력과 한 개라도 다르면 기여도를 맞출 수 없으므로 중단
+        extra = [n for n in names if n not in model_names]
+        missing = [n for n in model_names if n not in names]
+        if extra or missing:
+            raise ValueError(f"피처 CSV와 모델 피처가 다릅니다 (모델에 없는 컬럼: {extra}, CSV에 없는 피처: {missing})")
+        contribs = compute_contributions(model, features)
+        # 모델 피처 순서 → CSV 컬럼 순서로 정렬 (bias 열은 맨 뒤 유지)
+        order = [model_names.index(n) for n in names] + [len(model_names)]
+        return contribs[:, order]
+
+    contribs = read_cached_array("xgb_shap", [model_path, feature_path], build)
+    return ShapTable(
+        ids=features["id"].to_numpy(),
+        values=contribs[:, :-1],
+        base_values=contribs[:, -1],
+        feature_names=tuple(names),
+    )
+
+
+if __name__ == "__main__":
+    t0 = time.perf_counter()
+    table = load_shap_table()
+    print(f"SHAP 기여도 {table.values.shape} 준비 완료 ({time.perf_counter() - t0:.1f}s)")
@@ -0,0 +1,114 @@
+"""전기요금 예측 모델 입력 피처 생성 (target_pred_feature_*.csv 와 동일한 컬럼) — 배치 전용
+
+build_features()는 측정값 프레임 전체를 NumPy 벡터 연산으로 한 번에 계산
+모니터/예측기는 사전 계산된 피처 CSV를 그대로 읽으므로 실시간 경로에서는 쓰지 않음
+(사용처: train.csv 피처로 LSTM 스케일러 산출, tariff의 역률 계산)
+
+- lag 피처는 입력 행 순서 기준이며 앞부분(이력이 없는 구간)은 0으로 채움
+- 역률 이진 피처는 입력에 있으면 그대로 사용 — 피처 CSV를 다시 계산하면 모든 컬럼이 일치
+- 없으면 역률 기준값(지상 65 / 진상 95)으로 근사. 피처 CSV의 이진값은 이 규칙을 따르지 않음
+  (CSV 전력량으로 계산한 역률 기준 지상 478행, 진상 96행 불일치)
+"""
+import numpy as np
+import pandas as pd
+
+MEASURE_COLUMNS = ["전력사용량(kWh)", "지상무효전력량(kVarh)", "진상무효전력량(kVarh)", "탄소배출량(tCO2)"]
+
+FEATURE_COLUMNS = MEASURE_COLUMNS + [
+    "year", "month", "day", "hour", "minute", "dayofweek", "is_weekend",
+    "hour_sin", "hour_cos", "month_sin", "month_cos", "dow_sin", "dow_cos",
+    "작업유형_encoded", "진상역률_이진", "지상역률_이진",
+    "total_power", "active_power_ratio", "power_efficiency",
+    "전력사용량_lag_2", "전력사용량_lag_3", "전력사용량_lag_6",
+    "전력사용량_log", "power_interaction", "hour_month",
+]
+
+# 학습 시 LabelEncoder 순서 (알파벳순)
+WORK_TYPE_CODES = {"Light_Load": 0, "Maximum_Load": 1, "Medium_Load": 2}
+
+LAG_STEPS = (2, 3, 6)
+
+# 역률 이진 근사 기준 (%) — 지상 65 이상, 진상 95 이상이면 1 (피처 CSV 이진값과는 다름)
+LAGGING_PF_THRESHOLD = 65
+LEADING_PF_THRESHOLD = 95
+
+EPS = 1e-8
+
+
+def power_factor(kwh, kvarh):
+    """유효/무효 전력량으로 역률(%) 계산 (train.csv와 동일하게 둘 다 0이면 0)"""
+    kwh = np.asarray(kwh, dtype=np.float64)
+    apparent = np.hypot(kwh, np.asarray(kvarh, dtype=np.float64))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        pf = np.where(apparent > 0, kwh / apparent * 100, 0.0)
+    return pf
+
+
+def _pf_flags(frame, kwh, lag_kvarh, lead_kvarh):
+    """역률 이진 피처: 이미 있으면 그대로, 없으면 역률(컬럼 또는 전력량으로 계산)을 근사 기준과 비교"""
+    if "진상역률_이진" in frame and "지상역률_이진" in frame:
+        return frame["진상역률_이진"].to_numpy(), frame["지상역률_이진"].to_numpy()
+    if "진상역률(%)" in frame and "지상역률(%)" in frame:
+        lead_pf = frame["진상역률(%)"].to_numpy(dtype=np.float64)
+        lag_pf = frame["지상역률(%)"].to_numpy(dtype=np.float64)
+    else:
+        lead_pf = power_factor(kwh, lead_kvarh)
+        lag_pf = power_factor(kwh, lag_kvarh)
+    return ((lead_pf >= LEADING_PF_THRESHOLD).astype(np.int64),
+            (lag_pf >= LAGGING_PF_THRESHOLD).astype(np.int64))
+
+
+def build_features(frame, keep=("측정일시", "id")):
+    """측정일시/작업유형/측정값 프레임 → FEATURE_COLUMNS (+ keep 컬럼) 프레임"""
+    ts = pd.to_datetime(frame["측정일시"])
+    kwh = frame["전력사용량(kWh)"].to_numpy(dtype=np.float64)
+    lag_kvarh = frame["지상무효전력량(kVarh)"].to_numpy(dtype=np.float64)
+    lead_kvarh = frame["진상무효전력량(kVarh)"].to_numpy(dtype=np.float64)
+    co2 = frame["탄소배출량(tCO2)"].to_numpy(dtype=np.float64)
+
+    dt = ts.dt
+    hour = dt.hour.to_numpy(dtype=np.int64)
+    month = dt.month.to_numpy(dtype=np.int64)
+    dow = dt.dayofweek.to_numpy(dtype=np.int64)
+    total = kwh + lag_kvarh + lead_kvarh
+    lead_flag, lag_flag = _pf_flags(frame, kwh, lag_kvarh, lead_kvarh)
+
+    out = {
+        "전력사용량(kWh)": kwh,
+        "지상무효전력량(kVarh)": lag_kvarh,
+        "진상무효전력량(kVarh)": lead_kvarh,
+        "탄소배출량(tCO2)": co2,
+        "year": dt.year.to_numpy(dtype=np.int64),
+        "month": month,
+        "day": dt.day.to_numpy(dtype=np.int64),
+        "hour": hour,
+        "minute": dt.minute.to_numpy(dtype=np.int64),
+        "dayofweek": dow,
+        "is_weekend": (dow >= 5).astype(np.int64),
+        "hour_sin": np.sin(2 * np.pi * hour / 24),
+        "hour_cos": np.cos(2 * np.pi * hour / 24),
+        "month_sin": np.sin(2 * np.pi * month / 12),
+        "month_cos": np.cos(2 * np.pi * month / 12),
+        "dow_sin": np.sin(2 * np.pi * dow / 7),
+        "dow_cos": np.cos(2 * np.pi * dow / 7),
+        "작업유형_encoded": frame["작업유형"].map(WORK_TYPE_CODES).to_numpy(dtype=np.int64),
+        "진상역률_이진": lead_flag,
+        "지상역률_이진": lag_flag,
+        "total_power": total,
+        "active_power_ratio": kwh / (total + EPS),
+        "power_efficiency": kwh / (co2 + EPS),
+    }
+    for step in LAG_STEPS:
+        lagged = np.zeros_like(kwh)
+        lagged[step:] = kwh[:-step]
+        out[f"전력사용량_lag_{step}"] = lagged
+    out["전력사용량_log"] = np.log1p(kwh)
+    out["power_interaction"] = kwh * lag_kvarh
+    out["hour_month"] = hour * month
+
+    features = pd.DataFrame(out, index=frame.index)[FEATURE_COLUMNS]
+    for col in keep:
+        if col in frame:
+            features[col] = frame[col]
+    return features
+
@@ -0,0 +1,391 @@
+"""lstm.h5 NumPy 추론 (TensorFlow/Keras 불필요)
+
+- h5py로 model_config / 가중치를 읽어 그래프를 그대로 NumPy로 실행
+- predict(): 48스텝 윈도우 전체를 계산하는 배치 추론 (Keras와 동일)
+- LSTMStream: LSTM 은닉/셀 상태를 틱 사이에 유지 → 새 측정값마다 1스텝만 계산
+
+입력 표준화에는 학습 때 저장한 models/lstm_scalers.npz가 필요 — 없으면 예측을 거부
+(allow_estimate=True로 명시할 때만 경고와 함께 예측 대상 피처 분포로 추정, 결과는 보정되지 않은 값)
+
+사용법 (lstm_target.csv 대비 검증):
+    python -m utills.lstm
+    python -m utills.lstm --fit-scalers   # train.csv로 스케일러 산출, 검증 통과 시에만 저장
+"""
+import argparse
+import json
+import sys
+import time
+import warnings
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from utills.data import DATA_DIR, MODEL_DIR, NON_FEATURE_COLUMNS
+from utills.features import build_features
+
+LSTM_MODEL_PATH = MODEL_DIR / "lstm.h5"
+LSTM_SCALER_PATH = MODEL_DIR / "lstm_scalers.npz"
+LSTM_FEATURE_CSV = MODEL_DIR / "target_pred_feature_lstm.csv"
+LSTM_TARGET_CSV = MODEL_DIR / "lstm_target.csv"
+
+# lstm_target.csv 재현 허용 오차 (원) — float32 추론 오차 수준
+VERIFY_ATOL = 0.5
+
+# 시퀀스 입력(5개)으로 쓰는 컬럼 — 나머지 24개 피처는 static 입력
+SEQ_COLUMNS = ["전력사용량(kWh)", "지상무효전력량(kVarh)", "진상무효전력량(kVarh)", "탄소배출량(tCO2)", "total_power"]
+
+
+def _sigmoid(x):
+    return 0.5 * (np.tanh(0.5 * x) + 1.0)
+
+
+# ========== 1. 레이어 ==========
+class _LSTMLayer:
+    """Keras LSTM (게이트 순서 i, f, c, o / tanh, sigmoid)"""
+
+    def __init__(self, kernel, recurrent_kernel, bias, return_sequences):
+        self.kernel = kernel
+        self.recurrent_kernel = recurrent_kernel
+        self.bias = bias
+        self.units = recurrent_kernel.shape[0]
+        self.return_sequences = return_sequences
+
+    def zero_state(self, batch):
+        zeros = np.zeros((batch, self.units), dtype=self.kernel.dtype)
+        return zeros, zeros.copy()
+
+    def step(self, x_t, state):
+        h, c = state
+        u = self.units
+        z = x_t @ self.kernel + self.bias + h @ self.recurrent_kernel
+        i = _sigmoid(z[:, :u])
+        f = _sigmoid(z[:, u:2 * u])
+        g = np.tanh(z[:, 2 * u:3 * u])
+        o = _sigmoid(z[:, 3 * u:])
+        c = f * c + i * g
+        h = o * np.tanh(c)
+        return h, (h, c)
+
+    def run(self, x):
+        """(B, T, F) 윈도우 전체 — 입력 투영은 한 번에 계산"""
+        batch, steps, _ = x.shape
+        h, c = self.zero_state(batch)
+        u = self.units
+        zx = x @ self.kernel + self.bias
+        outputs = np.empty((batch, steps, u), dtype=zx.dtype) if self.return_sequences else None
+        for t in range(steps):
+            z = zx[:, t] + h @ self.recurrent_kernel
+            i = _sigmoid(z[:, :u])
+            f = _sigmoid(z[:, u:2 * u])
+            g = np.tanh(z[:, 2 * u:3 * u])
+            o = _sigmoid(z[:, 3 * u:])
+            c = f * c + i * g
+            h = o * np.tanh(c)
+            if outputs is not None:
+                outputs[:, t] = h
+        return outputs if outputs is not None else h
+
+
+class _BatchNorm:
+    def __init__(self, gamma, beta, mean, var, epsilon):
+        self.scale = gamma / np.sqrt(var + epsilon)
+        self.shift = beta - mean * self.scale
+
+    def __call__(self, x):
+        return x * self.scale + self.shift
+
+
+class _Dense:
+    def __init__(self, kernel, bias, activation):
+        self.kernel = kernel
+        self.bias = bias
+        self.activation = activation
+
+    def __call__(self, x):
+        y = x @ self.kernel + self.bias
+        if self.activation == "relu":
+            return np.maximum(y, 0)
+        if self.activation == "linear":
+            return y
+        raise ValueError(f"지원하지 않는 활성화 함수: {self.activation}")
+
+
+# ========== 2. 모델 그래프 ==========
+class NumpyLSTMModel:
+    """Keras Functional 모델(Input/LSTM/BatchNormalization/Dense/Dropout/Concatenate)의 NumPy 실행기"""
+
+    def __init__(self, layers, input_names, output_name, seq_len):
+        self.layers = layers              # [(이름, 종류, 연산, 입력 이름들)] — 위상 정렬 순서
+        self.input_names = input_names    # [sequence_input, static_input]
+        self.output_name = output_name
+        self.seq_len = seq_len
+        self._lstms = {name: op for name, kind, op, _ in layers if kind == "LSTM"}
+
+    @classmethod
+    def from_h5(cls, path=LSTM_MODEL_PATH):
+        import h5py
+
+        with h5py.File(path, "r") as f:
+            config = json.loads(f.attrs["model_config"])["config"]
+            weights = f["model_weights"]
+
+            def w(name, key):
+                group = weights[name][name]
+                if key not in group:
+                    group = group["lstm_cell"]
+                return group[key][()]
+
+            layers = []
+            seq_len = None
+            for layer in config["layers"]:
+                kind, name, cfg = layer["class_name"], layer["name"], layer["config"]
+                inbound = []
+                for node in layer["inbound_nodes"]:
+                    args = node["args"][0]
+                    for arg in (args if isinstance(args, list) else [args]):
+                        inbound.append(arg["config"]["keras_history"][0])
+
+                if kind == "InputLayer":
+                    if len(cfg["batch_shape"]) == 3:
+                        seq_len = cfg["batch_shape"][1]
+                    op = None
+                elif kind == "LSTM":
+                    op = _LSTMLayer(w(name, "kernel"), w(name, "recurrent_kernel"), w(name, "bias"),
+                                    cfg["return_sequences"])
+                elif kind == "BatchNormalization":
+                    op = _BatchNorm(w(name, "gamma"), w(name, "beta"), w(name, "moving_mean"),
+                                    w(name, "moving_variance"), cfg["epsilon"])
+                elif kind == "Dense":
+                    op = _Dense(w(name, "kernel"), w(name, "bias"), cfg["activation"])
+                elif kind in ("Dropout", "Concatenate"):
+                    op = None  # 추론 시 Dropout은 항등
+                else:
+                    raise ValueError(f"지원하지 않는 레이어: {kind}")
+                layers.append((name, kind, op, inbound))
+
+            input_names = [x[0] for x in config["input_layers"]]
+            output_name = config["output_layers"][0][0]
+        return cls(layers, input_names, output_name, seq_len)
+
+    def _run(self, inputs, lstm_fn):
+        values = dict(inputs)
+        for name, kind, op, inbound in self.layers:
+            if kind == "InputLayer":
+                continue
+            args = [values[n] for n in inbound]
+            if kind == "LSTM":
+                values[name] = lstm_fn(name, op, args[0])
+            elif kind == "Concatenate":
+                values[name] = np.concatenate(args, axis=-1)
+            elif kind == "Dropout":
+                values[name] = args[0]
+            else:
+                values[name] = op(args[0])
+        return values[self.output_name][..., 0]
+
+    def predict(self, seq, static):
+        """배치 추론: seq (B, T, 5), static (B, 24) → (B,)"""
+        inputs = dict(zip(self.input_names, (np.asarray(seq, np.float32), np.asarray(static, np.float32))))
+        return self._run(inputs, lambda name, op, x: op.run(x))
+
+    def new_state(self, batch=1):
+        return {name: op.zero_state(batch) for name, op in self._lstms.items()}
+
+    def step(self, seq_t, static, state):
+        """스트리밍 1스텝: seq_t (B, 5), static (B, 24) — state는 갱신됨"""
+        inputs = dict(zip(self.input_names, (np.asarray(seq_t, np.float32), np.asarray(static, np.float32))))
+
+        def lstm_step(name, op, x_t):
+            h, state[name] = op.step(x_t, state[name])
+            return h
+
+        return self._run(inputs, lstm_step)
+
+
+# ========== 3. 입력 스케일링 ==========
+@dataclass(frozen=True)
+class LSTMInputSpec:
+    """피처 → 모델 입력 변환 (표준화) 및 출력 역변환"""
+    seq_columns: tuple
+    static_columns: tuple
+    x_mean: np.ndarray
+    x_scale: np.ndarray
+    y_mean: float
+    y_scale: float
+
+    @property
+    def columns(self):
+        return self.seq_columns + self.static_columns
+
+    def transform(self, features):
+        """DataFrame → (seq 피처, static 피처) 표준화 행렬"""
+        x = features[list(self.columns)].to_numpy(dtype=np.float32)
+        x = (x - self.x_mean) / self.x_scale
+        n_seq = len(self.seq_columns)
+        return x[:, :n_seq], x[:, n_seq:]
+
+    def transform_row(self, row):
+        """단일 행(Series/dict) → (1, 5), (1, 24)"""
+        x = np.array([[row[c] for c in self.columns]], dtype=np.float32)
+        x = (x - self.x_mean) / self.x_scale
+        n_seq = len(self.seq_columns)
+        return x[:, :n_seq], x[:, n_seq:]
+
+    def inverse_target(self, y):
+        return y * self.y_scale + self.y_mean
+
+    def save(self, path=LSTM_SCALER_PATH):
+        np.savez(path, seq_columns=np.array(self.seq_columns), static_columns=np.array(self.static_columns),
+                 x_mean=self.x_mean, x_scale=self.x_scale, y_mean=self.y_mean, y_scale=self.y_scale)
+
+    @classmethod
+    def load(cls, path=LSTM_SCALER_PATH):
+        z = np.load(path)
+        return cls(tuple(z["seq_columns"].tolist()), tuple(z["static_columns"].tolist()),
+                   z["x_mean"].astype(np.float32), z["x_scale"].astype(np.float32),
+                   float(z["y_mean"]), float(z["y_scale"]))
+
+    @classmethod
+    def fit(cls, features, target):
+        """주어진 피처/타깃 분포로 표준화 파라미터 추정 (학습 때 값과 다름 — 진단용)"""
+        static = [c for c in features.columns if c not in NON_FEATURE_COLUMNS and c not in SEQ_COLUMNS]
+        x = features[SEQ_COLUMNS + static].to_numpy(dtype=np.float64)
+        scale = x.std(axis=0)
+        scale[scale == 0] = 1.0
+        target = np.asarray(target, dtype=np.float64)
+        return cls(tuple(SEQ_COLUMNS), tuple(static), x.mean(axis=0).astype(np.float32),
+                   scale.astype(np.float32), float(np.nanmean(target)), float(np.nanstd(target)))
+
+
+def default_input_spec(features, allow_estimate=False):
+    """models/lstm_scalers.npz 로드
+
+    파일이 없으면 FileNotFoundError — allow_estimate=True일 때만 경고 후 피처/train.csv 요금 분포로 추정
+    (예측할 구간의 피처로 맞춘 표준화라 예측값이 보정되지 않음)
+    """
+    if LSTM_SCALER_PATH.exists():
+        return LSTMInputSpec.load(LSTM_SCALER_PATH)
+    if not allow_estimate:
+        raise FileNotFoundError(f"LSTM 입력 스케일러가 없습니다: {LSTM_SCALER_PATH} "
+                                "(학습 때 LSTMInputSpec.save()로 저장한 파일 필요)")
+    warnings.warn(f"{LSTM_SCALER_PATH.name} 없음 — 입력 피처 분포로 스케일러를 추정합니다. "
+                  "LSTM 예측값이 보정되지 않았습니다.", RuntimeWarning, stacklevel=2)
+    target = pd.read_csv(DATA_DIR / "train.csv", usecols=["전기요금(원)"])["전기요금(원)"]
+    return LSTMInputSpec.fit(features, target)
+
+
+def training_input_spec(train_path=DATA_DIR / "train.csv"):
+    """train.csv 피처/요금 분포로 표준화 파라미터 산출 (verify로 재현 여부 확인 후 저장)"""
+    train = pd.read_csv(train_path)
+    return LSTMInputSpec.fit(build_features(train), train["전기요금(원)"])
+
+
+# ========== 4. 예측 API ==========
+def predict_windows(model, spec, features):
+    """시간순 피처 프레임 전체에 대해 48스텝 윈도우 예측 (앞 seq_len-1 행은 NaN)"""
+    seq, static = spec.transform(features)
+    n, t = len(seq), model.seq_len
+    out = np.full(n, np.nan, dtype=np.float32)
+    if n < t:
+        return out
+    windows = np.lib.stride_tricks.sliding_window_view(seq, (t, seq.shape[1]))[:, 0]
+    out[t - 1:] = spec.inverse_target(model.predict(windows, static[t - 1:]))
+    return out
+
+
+class LSTMStream:
+    """틱마다 1스텝씩 진행하는 스트리밍 추론 (은닉/셀 상태 유지)
+
+    학습은 48스텝 윈도우(상태 초기화)로 했기 때문에 상태를 계속 이어가면
+    윈도우 추론과 값이 조금 달라질 수 있음 — reset_every 스텝마다 상태를 초기화해
+    최근 구간만 반영하도록 제한 가능
+    """
+
+    def __init__(self, model, spec, reset_every=None):
+        self.model = model
+        self.spec = spec
+        self.reset_every = reset_every
+        self.reset()
+
+    def reset(self):
+        self.state = self.model.new_state(1)
+        self.steps = 0
+
+    def update(self, row):
+        """새 측정값 한 행(Series/dict) → 예측 전기요금"""
+        seq, static = self.spec.transform_row(row)
+        return self.advance(seq, static)
+
+    def advance(self, seq_t, static_t):
+        """표준화된 입력 한 스텝 (1, 5), (1, 24) → 예측 전기요금"""
+        if self.reset_every and self.steps >= self.reset_every:
+            self.reset()
+        y = self.model.step(seq_t, static_t, self.state)
+        self.steps += 1
+        return float(self.spec.inverse_target(y)[0])
+
+
+# ========== 5. 검증 ==========
+def verify(feature_path=LSTM_FEATURE_CSV, target_path=LSTM_TARGET_CSV, spec=None):
+    """윈도우/스트리밍 추론 결과를 lstm_target.csv와 비교
+
+    matches_target: 윈도우 예측이 모든 행에서 VERIFY_ATOL 이내인지
+    """
+    features = pd.read_csv(feature_path)
+    expected = pd.read_csv(target_path)["target"].to_numpy(dtype=np.float64)
+    model = NumpyLSTMModel.from_h5()
+    if spec is None:
+        spec = default_input_spec(features, allow_estimate=True)
+        scaler = "lstm_scalers.npz" if LSTM_SCALER_PATH.exists() else "추정값"
+    else:
+        scaler = "지정값"
+
+    t0 = time.perf_counter()
+    window_pred = predict_windows(model, spec, features)
+    window_sec = time.perf_counter() - t0
+
+    # 표준화는 컬럼 배열로 한 번에, 스텝 진행만 행 단위
+    stream = LSTMStream(model, spec)
+    t0 = time.perf_counter()
+    seq, static = spec.transform(features)
+    stream_pred = np.array([stream.advance(seq[i:i + 1], static[i:i + 1]) for i in range(len(seq))])
+    stream_sec = time.perf_counter() - t0
+
+    mask = ~np.isnan(expected) & ~np.isnan(window_pred)
+    err = np.abs(window_pred[mask] - expected[mask])
+    return {
+        "rows": int(mask.sum()),
+        "scaler": scaler,
+        "matches_target": bool(len(err) and err.max() <= VERIFY_ATOL),
+        "window_mae": float(err.mean()),
+        "window_max_err": float(err.max()),
+        "window_corr": float(np.corrcoef(window_pred[mask], expected[mask])[0, 1]),
+        "stream_vs_window_mae": float(np.abs(stream_pred[mask] - window_pred[mask]).mean()),
+        "window_ms_per_row": window_sec * 1000 / len(features),
+        "stream_ms_per_row": stream_sec * 1000 / len(features),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="lstm.h5 NumPy 추론 검증")
+    parser.add_argument("--fit-scalers", action="store_true",
+                        help="train.csv로 스케일러를 산출해 검증 통과 시 models/lstm_scalers.npz로 저장")
+    args = parser.parse_args(argv)
+
+    spec = training_input_spec() if args.fit_scalers else None
+    result = verify(spec=spec)
+    for key, value in result.items():
+        print(f"{key:>22}: {value:.4f}" if isinstance(value, float) else f"{key:>22}: {value}")
+    if not result["matches_target"]:
+        print(f"lstm_target.csv와 허용 오차({VERIFY_ATOL}원) 이내로 일치하지 않습니다"
+              + (" — 스케일러를 저장하지 않습니다" if args.fit_scalers else ""), file=sys.stderr)
+        return 1
+    if args.fit_scalers:
+        spec.save(LSTM_SCALER_PATH)
+        print(f"저장: {LSTM_SCALER_PATH}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
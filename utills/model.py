@@ -0,0 +1,158 @@
+"""전기요금 예측 모델 추론 엔진
+
+- 모델은 프로세스당 한 번만 로드 (get_predictor)
+- 로드 직후 워밍업 추론으로 첫 호출 지연 제거
+- 배치 / 단일 행 예측 API, 단일 행 지연시간 통계
+"""
+import threading
+import time
+from collections import deque
+
+import numpy as np
+import pandas as pd
+
+from utills.explain import XGB_MODEL_PATH, load_xgb_model, model_feature_names
+from utills.lstm import LSTM_FEATURE_CSV, LSTM_MODEL_PATH, LSTM_SCALER_PATH, LSTMStream, NumpyLSTMModel, default_input_spec, predict_windows
+
+# 단일 행 예측 지연시간 목표 (ms) — 10초 새로고침 주기 대비 충분히 작게
+SINGLE_ROW_TARGET_MS = 10.0
+
+# 지연시간 통계에 보관하는 최근 호출 수
+LATENCY_WINDOW = 512
+
+
+# ========== 1. 공통 ==========
+class _Predictor:
+    """단일 행 예측 지연시간 기록 공통 부분"""
+
+    # False면 학습 때 입력 스케일러 없이 추정값으로 예측 중 (값을 신뢰할 수 없음)
+    calibrated = True
+
+    def _init_latency(self):
+        self._latencies = deque(maxlen=LATENCY_WINDOW)
+
+    def _record(self, t0):
+        self._latencies.append((time.perf_counter() - t0) * 1000)
+
+    def latency_stats(self):
+        """최근 단일 행 예측 지연시간 (ms) 요약"""
+        if not self._latencies:
+            return {"count": 0, "p50_ms": 0.0, "p95_ms": 0.0, "max_ms": 0.0, "within_target": True,
+                    "calibrated": self.calibrated}
+        lat = np.fromiter(self._latencies, dtype=np.float64)
+        p95 = float(np.percentile(lat, 95))
+        return {
+            "count": len(lat),
+            "p50_ms": float(np.percentile(lat, 50)),
+            "p95_ms": p95,
+            "max_ms": float(lat.max()),
+            "within_target": p95 <= SINGLE_ROW_TARGET_MS,
+            "calibrated": self.calibrated,
+        }
+
+
+# ========== 2. XGBoost 예측기 ==========
+class XGBoostPredictor(_Predictor):
+    """xgboost.pkl 기반 전기요금 예측기 (피처 순서 = 학습 시 순서)"""
+
+    def __init__(self, path=XGB_MODEL_PATH, warm_up=True):
+        model = load_xgb_model(path)
+        self.path = path
+        self.feature_names = model_feature_names(model)
+        self._booster = model.get_booster()
+        self._init_latency()
+        if warm_up:
+            self.warm_up()
+
+    def warm_up(self, n_rows=8):
+        """스레드 풀/트리 캐시 초기화용 더미 추론"""
+        dummy = np.zeros((n_rows, len(self.feature_names)), dtype=np.float32)
+        self._booster.inplace_predict(dummy)
+        self._booster.inplace_predict(dummy[:1])
+
+    def _as_matrix(self, features):
+        if isinstance(features, pd.DataFrame):
+            return features[self.feature_names].to_numpy(dtype=np.float32)
+        arr = np.asarray(features, dtype=np.float32)
+        return arr.reshape(-1, len(self.feature_names))
+
+    def _as_row(self, row):
+        if isinstance(row, (pd.Series, dict)):
+            return np.array([[row[f] for f in self.feature_names]], dtype=np.float32)
+        return np.asarray(row, dtype=np.float32).reshape(1, -1)
+
+    def predict_batch(self, features):
+        """여러 행 예측 (DataFrame 또는 (n, 피처 수) 배열)"""
+        matrix = self._as_matrix(features)
+        if len(matrix) == 0:
+            return np.empty(0, dtype=np.float32)
+        return np.asarray(self._booster.inplace_predict(matrix), dtype=np.float32).reshape(-1)
+
+    def predict_one(self, row):
+        """단일 행 예측 (Series / dict / 1차원 배열) — 지연시간 기록"""
+        t0 = time.perf_counter()
+        pred = float(self._booster.inplace_predict(self._as_row(row))[0])
+        self._record(t0)
+        return pred
+
+
+# ========== 3. LSTM 예측기 (NumPy) ==========
+class LSTMPredictor(_Predictor):
+    """lstm.h5 NumPy 예측기 — 배치는 48스텝 윈도우, 단일 행은 상태 유지 스트리밍
+
+    lstm_scalers.npz가 없으면 FileNotFoundError
+    allow_uncalibrated=True면 경고 후 추정 스케일러로 예측하고 calibrated=False로 표시
+    """
+
+    def __init__(self, path=LSTM_MODEL_PATH, reference_path=LSTM_FEATURE_CSV, warm_up=True,
+                 allow_uncalibrated=False):
+        self.path = path
+        self.model = NumpyLSTMModel.from_h5(path)
+        self.calibrated = LSTM_SCALER_PATH.exists()
+        self.spec = default_input_spec(pd.read_csv(reference_path), allow_estimate=allow_uncalibrated)
+        self.feature_names = list(self.spec.columns)
+        self.stream = LSTMStream(self.model, self.spec)
+        self._init_latency()
+        if warm_up:
+            self.warm_up()
+
+    def warm_up(self):
+        dummy = dict.fromkeys(self.feature_names, 0.0)
+        LSTMStream(self.model, self.spec).update(dummy)
+
+    def predict_batch(self, features):
+        """시간순 피처 프레임 → 윈도우 예측 (앞 47행은 NaN)"""
+        return predict_windows(self.model, self.spec, features)
+
+    def predict_one(self, row):
+        """새 측정값 한 행 → 1스텝 스트리밍 예측 (reset_stream()으로 상태 초기화)"""
+        t0 = time.perf_counter()
+        pred = self.stream.update(row)
+        self._record(t0)
+        return pred
+
+    def reset_stream(self):
+        self.stream.reset()
+
+
+# ========== 4. 프로세스 단위 모델 캐시 ==========
+_PREDICTORS = {}
+_LOCK = threading.Lock()
+
+PREDICTOR_TYPES = {
+    "xgboost": (XGBoostPredictor, XGB_MODEL_PATH),
+    "lstm": (LSTMPredictor, LSTM_MODEL_PATH),
+}
+
+
+def get_predictor(name="xgboost", **options):
+    """이름(+생성 옵션)별 예측기를 한 번만 로드해 재사용"""
+    key = (name, tuple(sorted(options.items())))
+    predictor = _PREDICTORS.get(key)
+    if predictor is not None:
+        return predictor
+    with _LOCK:
+        if key not in _PREDICTORS:
+            cls, path = PREDICTOR_TYPES[name]
+            _PREDICTORS[key] = cls(path, **options)
+        return _PREDICTORS[key]
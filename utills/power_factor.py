@@ -0,0 +1,78 @@
+"""한전 역률 요금 영향 — 전체 날짜의 일별 역률 표를 한 번에 계산
+
+- 주간(09~23시): 지상역률 평균을 60~95%로 제한, 90% 기준으로 1%p당 0.5% 가감
+- 야간(23~09시): 진상역률 평균 (0 이하/데이터 없음은 100%), 95% 미만이면 1%p당 0.5% 추가
+- 전일대비: 데이터가 있는 직전 날짜 대비 요금 영향 차이 (첫 날짜는 NaN)
+
+역률 카드/추이 차트는 이 표를 날짜로 조회만 함
+"""
+import numpy as np
+import pandas as pd
+
+# 주간 시간대 [시작, 끝) — 나머지는 야간
+DAYTIME_HOURS = (9, 23)
+
+# 해당 시간대 데이터가 없을 때 쓰는 기본 역률 (%)
+DEFAULT_DAYTIME_PF = 90.0
+DEFAULT_NIGHTTIME_PF = 100.0
+
+# 전일대비 차이가 이보다 작으면 "동일"로 표시 (%p)
+SAME_RATE_TOLERANCE = 0.1
+
+PF_TABLE_COLUMNS = ["주간_지상역률", "야간_진상역률", "주간_요금영향", "야간_요금영향",
+                    "주간_전일대비", "야간_전일대비"]
+
+
+def rate_impact(pf, time_period):
+    """역률 → 한전 요금 영향 (%, +는 할증) — 스칼라/배열 모두 가능"""
+    pf = np.asarray(pf, dtype=np.float64)
+    if time_period == "daytime":
+        return (90 - np.clip(pf, 60, 95)) * 0.5
+    adjusted = np.where(pf <= 0, 100, np.maximum(pf, 60))
+    return np.maximum(95 - adjusted, 0) * 0.5
+
+
+def _period_mean(codes, n_days, values, counts, mask):
+    """날짜 코드별 mask 구간 평균 (합계/건수, 데이터가 없는 날짜는 NaN)"""
+    sums = np.bincount(codes[mask], weights=values[mask], minlength=n_days)
+    totals = np.bincount(codes[mask], weights=counts[mask], minlength=n_days)
+    out = np.full(n_days, np.nan)
+    np.divide(sums, totals, out=out, where=totals > 0)
+    return out
+
+
+def _day_over_day(values):
+    """직전 날짜 대비 차이 (첫 날짜는 NaN)"""
+    out = np.full(len(values), np.nan)
+    out[1:] = np.diff(values)
+    return out
+
+
+def daily_power_factor(hourly):
+    """(날짜, 시간) 합계 큐브 → 날짜 인덱스의 일별 역률/요금 영향 표
+
+    hourly: RollupCube.hourly (역률 컬럼은 합계, 건수 포함)
+    """
+    codes, days = pd.factorize(hourly["날짜"], sort=True)
+    n_days = len(days)
+    hours = hourly["시간"].to_numpy()
+    counts = hourly["건수"].to_numpy(dtype=np.float64)
+    daytime = (hours >= DAYTIME_HOURS[0]) & (hours < DAYTIME_HOURS[1])
+
+    day_raw = _period_mean(codes, n_days, hourly["지상역률(%)"].to_numpy(dtype=np.float64), counts, daytime)
+    night_raw = _period_mean(codes, n_days, hourly["진상역률(%)"].to_numpy(dtype=np.float64), counts, ~daytime)
+
+    day_pf = np.where(np.isnan(day_raw), DEFAULT_DAYTIME_PF, np.clip(day_raw, 60, 95))
+    night_pf = np.where(np.isnan(night_raw) | (night_raw <= 0), DEFAULT_NIGHTTIME_PF, np.maximum(night_raw, 60))
+    day_impact = rate_impact(day_pf, "daytime")
+    night_impact = rate_impact(night_pf, "nighttime")
+
+    table = pd.DataFrame({
+        "주간_지상역률": day_pf,
+        "야간_진상역률": night_pf,
+        "주간_요금영향": day_impact,
+        "야간_요금영향": night_impact,
+        "주간_전일대비": _day_over_day(day_impact),
+        "야간_전일대비": _day_over_day(night_impact),
+    }, index=pd.Index(days, name="날짜"))
+    return table[PF_TABLE_COLUMNS]
@@ -0,0 +1,642 @@
+"""종합 보고서(docx / PDF) 생성 / 백그라운드 작업 큐
+
+- create_comprehensive_docx_report_with_charts(): 화면 설정에 따른 docx 보고서 (차트 PNG, 상세 표 포함)
+- report_tables(): 기간 비교 / 일별 / 시간별 상세 표 (큐브 조회, 표는 add_bulk_table로 한 번에 작성)
+- build_report(): (보기 방식, 기간, 형식) → 보고서 바이트 (작업 프로세스에서 실행, PDF는 utills.report_pdf)
+- ReportJobQueue: 프로세스 풀에서 차트들을 병렬로 그린 뒤 보고서를 만들고 진행률/결과를 보관
+  (보기 방식, 기간, 형식, 데이터 버전)이 같은 요청은 캐시된 바이트나 진행 중인 작업을 그대로 반환
+
+- main(): 월별 전체 / 기간 목록 보고서를 프로세스 풀에서 한 번에 생성해 폴더에 저장 (헤드리스)
+
+Streamlit에 의존하지 않으므로 작업 프로세스(spawn)에서도 그대로 import 가능
+
+사용법 (일괄 생성):
+    python -m utills.report                                   # 데이터가 있는 모든 달
+    python -m utills.report --months 1 2 3 --out reports/2024Q1
+    python -m utills.report --ranges 2024-03-01:2024-03-10 2024-06-01:2024-06-30 --workers 4
+    python -m utills.report --format pdf --out reports/pdf
+"""
+import argparse
+import itertools
+import json
+import multiprocessing
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from io import BytesIO
+from pathlib import Path
+
+import pandas as pd
+from docx import Document
+from docx.enum.text import WD_ALIGN_PARAGRAPH
+from docx.oxml import parse_xml
+from docx.shared import Cm
+
+from utills.data import ROOT_DIR, TRAIN_CSV, TimeIndex, load_train, source_signature
+from utills.docx_table import add_bulk_table
+from utills.report_charts import (CHART_TITLES, REPORT_CHARTS, period_bounds, render_chart,
+                                  render_report_charts, report_cube)
+from utills.rollup import NUMERIC_COLUMNS
+
+# 보고서 작업 프로세스 수 / 결과 캐시 크기 (보고서 개수)
+REPORT_WORKERS = 2
+REPORT_CACHE_SIZE = 32
+
+# 완료된 작업 정보를 최대 몇 개까지 보관할지
+MAX_FINISHED_JOBS = 128
+
+# 진행률 중 차트 렌더링 단계가 차지하는 비율 (나머지는 문서 작성)
+CHART_PROGRESS_SHARE = 0.6
+
+# 문서에 넣는 차트 폭
+CHART_WIDTH = Cm(15)
+
+# 기간이 이 일수 이하일 때만 (날짜 × 시간) 상세 표를 넣음 (한 달 ≈ 744행)
+HOURLY_DETAIL_MAX_DAYS = 31
+
+# 일괄 생성 기본 저장 폴더
+REPORT_DIR = ROOT_DIR / "reports"
+
+DOCX_MIME = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+PDF_MIME = "application/pdf"
+
+# 보고서 형식 → MIME 타입
+REPORT_FORMATS = {"docx": DOCX_MIME, "pdf": PDF_MIME}
+
+# 작업 상태
+QUEUED, RUNNING, DONE, FAILED = "queued", "running", "done", "failed"
+
+
+# ========== 1. docx 보고서 ==========
+def report_header_rows(period_label):
+    """보고서 머리 표 행 (항목, 값, 항목, 값) — 두 번째 항목이 비어 있으면 값 칸을 끝까지 합침"""
+    return [
+        ("보고처", "에너지관리팀", "보고서명", f"전력 분석 보고서 ({period_label})"),
+        ("장소", "본사", "취급분류", "○기밀 ●보통"),
+        ("작성일자", datetime.now().strftime("%Y년 %m월 %d일"), "작성자", "전력분석팀"),
+        ("참가자", "에너지관리팀, 시설관리팀, 경영진", "", ""),
+        ("자료출처", "전력량계 실시간 데이터, 한국전력공사 요금체계", "", "")
+    ]
+
+
+def create_comprehensive_docx_report_with_charts(df, current_data, daily_data, selected_date, view_type="월별", selected_month=1, period_label="전체", charts=None, tables=None):
+    """현재 화면 설정에 따른 동적 보고서 생성 (charts: 차트 종류 → PNG 바이트, tables: (제목, 표) 목록)"""
+    doc = Document()
+    
+    # 전체 문서에 테두리 추가
+    sections = doc.sections
+    for section in sections:
+        sectPr = section._sectPr
+        pgBorders = sectPr.xpath('.//w:pgBorders')
+        if not pgBorders:
+            pgBorders_xml = '''
+            <w:pgBorders xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main" 
+                         w:offsetFrom="page">
+                <w:top w:val="single" w:sz="12" w:space="24" w:color="auto"/>
+                <w:left w:val="single" w:sz="12" w:space="24" w:color="auto"/>
+                <w:bottom w:val="single" w:sz="12" w:space="24" w:color="auto"/>
+                <w:right w:val="single" w:sz="12" w:space="24" w:color="auto"/>
+            </w:pgBorders>
+            '''
+            pgBorders = parse_xml(pgBorders_xml)
+            sectPr.append(pgBorders)
+    
+    # 보고서 헤더 테이블
+    header_table = doc.add_table(rows=6, cols=4)
+    header_table.style = 'Table Grid'
+    
+    # 제목 행
+    title_cell = header_table.rows[0].cells[0]
+    title_cell.merge(header_table.rows[0].cells[3])
+    title_cell.text = "보 고 서"
+    title_cell.paragraphs[0].alignment = WD_ALIGN_PARAGRAPH.CENTER
+    title_para = title_cell.paragraphs[0]
+    title_para.runs[0].font.size = Cm(0.8)
+    title_para.runs[0].bold = True
+    
+    # 헤더 정보 입력
+    header_data = report_header_rows(period_label)
+    
+    for i, (col1, val1, col2, val2) in enumerate(header_data, 1):
+        header_table.rows[i].cells[0].text = col1
+        header_table.rows[i].cells[1].text = val1
+        if col2:
+            header_table.rows[i].cells[2].text = col2
+            header_table.rows[i].cells[3].text = val2
+        else:
+            header_table.rows[i].cells[1].merge(header_table.rows[i].cells[3])
+    
+    doc.add_paragraph()
+    
+    # 보고내용 제목
+    content_title = doc.add_heading('보고내용', level=1)
+    content_title.alignment = WD_ALIGN_PARAGRAPH.CENTER
+    
+    # === 1. 기간별 분석 ===
+    if view_type == "월별":
+        doc.add_heading(f'1. {selected_month}월 전력 사용 분석', level=2)
+        
+        if not current_data.empty:
+            total_kwh = current_data["전력사용량(kWh)"].sum()
+            total_cost = current_data["전기요금(원)"].sum()
+            avg_pf = current_data["지상역률(%)"].mean()
+            total_carbon = current_data["탄소배출량(tCO2)"].sum()
+            avg_price = total_cost / total_kwh if total_kwh > 0 else 0
+            
+            doc.add_paragraph(f"□ {selected_month}월 총 전력사용량: {total_kwh:,.1f} kWh")
+            doc.add_paragraph(f"□ {selected_month}월 총 전기요금: {total_cost:,.0f} 원")
+            doc.add_paragraph(f"□ {selected_month}월 평균 단가: {avg_price:.1f} 원/kWh")
+            doc.add_paragraph(f"□ {selected_month}월 평균 역률: {avg_pf:.1f}%")
+            doc.add_paragraph(f"□ {selected_month}월 탄소배출량: {total_carbon:.2f} tCO2")
+    else:
+        doc.add_heading(f'1. {period_label} 전력 사용 분석', level=2)
+        
+        if not current_data.empty:
+            total_kwh = current_data["전력사용량(kWh)"].sum()
+            total_cost = current_data["전기요금(원)"].sum()
+            avg_pf = current_data["지상역률(%)"].mean()
+            total_carbon = current_data["탄소배출량(tCO2)"].sum()
+            avg_price = total_cost / total_kwh if total_kwh > 0 else 0
+            
+            doc.add_paragraph(f"□ 기간 총 전력사용량: {total_kwh:,.1f} kWh")
+            doc.add_paragraph(f"□ 기간 총 전기요금: {total_cost:,.0f} 원")
+            doc.add_paragraph(f"□ 기간 평균 단가: {avg_price:.1f} 원/kWh")
+            doc.add_paragraph(f"□ 기간 평균 역률: {avg_pf:.1f}%")
+            doc.add_paragraph(f"□ 기간 탄소배출량: {total_carbon:.2f} tCO2")
+    
+    # === 2. 차트 ===
+    if charts:
+        doc.add_heading('2. 주요 차트', level=2)
+        for chart_type in REPORT_CHARTS:
+            if charts.get(chart_type):
+                doc.add_picture(BytesIO(charts[chart_type]), width=CHART_WIDTH)
+                doc.paragraphs[-1].alignment = WD_ALIGN_PARAGRAPH.CENTER
+                caption = doc.add_paragraph(f"[그림] {CHART_TITLES[chart_type]}")
+                caption.alignment = WD_ALIGN_PARAGRAPH.CENTER
+    
+    # === 3. 상세 데이터 ===
+    if tables:
+        doc.add_heading('3. 상세 데이터', level=2)
+        for i, (title, table) in enumerate(tables, 1):
+            doc.add_heading(f'3-{i}. {title}', level=3)
+            add_bulk_table(doc, table)
+    
+    return doc
+
+
+# ========== 2. 보고서 입력 데이터 ==========
+# 작업 프로세스 안에서 재사용하는 (경로, 데이터 버전) → (프레임, 날짜 인덱스)
+_REPORT_DATA = {}
+
+
+def report_period(view_type, selected_month=None, selected_range=None):
+    """화면 설정 → 캐시 키로 쓰는 기간 값 (월별: 월, 일별: (시작, 끝) ISO 문자열, 기간 미선택: None=전체)"""
+    if view_type == "월별":
+        return int(selected_month or 1)
+    if selected_range and len(selected_range) == 2:
+        start, end = selected_range
+        return (start.isoformat(), end.isoformat())
+    return None
+
+
+def _report_data(path):
+    key = (str(path), source_signature(path))
+    if key not in _REPORT_DATA:
+        _REPORT_DATA.clear()
+        df = load_train(path)
+        _REPORT_DATA[key] = (df, TimeIndex(df))
+    return _REPORT_DATA[key]
+
+
+def period_label(view_type, period):
+    """기간 값 → 보고서 제목에 쓰는 이름 (1월 / 시작 ~ 끝 기간 / 전체 기간)"""
+    if view_type == "월별":
+        return f"{period}월"
+    if period is not None:
+        return f"{period[0]} ~ {period[1]} 기간"
+    return "전체 기간"
+
+
+def report_inputs(df, index, view_type, period):
+    """기간 값 → (current_data, period_label, selected_month)"""
+    label = period_label(view_type, period)
+    if view_type == "월별":
+        current_data = index.month(pd.Period(year=index.last_day.year, month=period, freq="M"))
+        return current_data, label, period
+    if period is not None:
+        start, end = (date.fromisoformat(d) for d in period)
+        return index.range(start, end), label, None
+    return df, label, None
+
+
+def create_comparison_table(current, previous, period_type="일"):
+    """비교 테이블 생성 (current/previous: 큐브 구간 합계, 역률은 평균)"""
+    comparison_dict = {"항목": [], f"현재{period_type}": [], f"이전{period_type}": [], "변화량": [], "변화율(%)": []}
+
+    for col in NUMERIC_COLUMNS:
+        current_val = current[col]
+        previous_val = previous[col]
+
+        change = current_val - previous_val
+        change_pct = (change / previous_val * 100) if previous_val != 0 else 0
+
+        comparison_dict["항목"].append(col)
+        comparison_dict[f"현재{period_type}"].append(f"{current_val:.2f}")
+        comparison_dict[f"이전{period_type}"].append(f"{previous_val:.2f}")
+        comparison_dict["변화량"].append(f"{change:+.2f}")
+        comparison_dict["변화율(%)"].append(f"{change_pct:+.1f}%")
+    return pd.DataFrame(comparison_dict)
+
+
+def report_tables(cube, period, hourly=True):
+    """보고서 상세 표 목록 [(제목, DataFrame)] — 직전 기간 비교, 일별, (짧은 기간이면) 날짜 × 시간별
+
+    hourly=False: 날짜 × 시간별 표 제외 (PDF는 부록에서 날짜마다 따로 넣음)
+    """
+    start, end = period_bounds(cube, period)
+    tables = []
+    if start is not None:
+        if isinstance(period, int):
+            prev_end = start - pd.Timedelta(days=1)
+            prev_start, period_type = prev_end.replace(day=1), "월"
+        else:
+            days = (end - start).days + 1
+            prev_start, prev_end, period_type = start - pd.Timedelta(days=days), start - pd.Timedelta(days=1), "기간"
+        current, previous = cube.totals(start, end), cube.totals(prev_start, prev_end)
+        if current is not None and previous is not None:
+            tables.append((f"직전 {period_type} 대비", create_comparison_table(current, previous, period_type)))
+
+    daily = cube.aggregate("day", NUMERIC_COLUMNS, start, end)
+    daily["날짜"] = [str(d) for d in daily["날짜"]]
+    tables.append(("일별 상세", daily))
+
+    if hourly and start is not None and (end - start).days + 1 <= HOURLY_DETAIL_MAX_DAYS:
+        hourly = cube.aggregate("day_hour", NUMERIC_COLUMNS, start, end)
+        hourly.insert(0, "일시", [f"{d} {h:02d}시" for d, h in zip(hourly.pop("날짜"), hourly.pop("시간"))])
+        tables.append(("시간별 상세", hourly))
+    return tables
+
+
+def build_report_bytes(view_type, period, path=TRAIN_CSV, progress=None, charts=None):
+    """보고서 한 건 생성 → docx 바이트 (progress(비율, 메시지)로 단계 보고)
+
+    charts: 미리 렌더링한 차트 PNG — 없으면 이 프로세스에서 차례로 렌더링 (캐시 사용)
+    """
+    progress = progress or (lambda fraction, message: None)
+    if charts is None:
+        progress(0.05, "차트 생성")
+        charts = render_report_charts(period, path)
+    progress(0.1, "데이터 준비")
+    df, index = _report_data(path)
+
+    progress(0.3, "기간 데이터 조회")
+    current_data, period_label, selected_month = report_inputs(df, index, view_type, period)
+    latest_date = index.last_day
+    daily_data = index.day(latest_date)
+
+    cube, _ = report_cube(path)
+    tables = report_tables(cube, period)
+
+    progress(0.5, "문서 작성")
+    doc = create_comprehensive_docx_report_with_charts(
+        df, current_data, daily_data, latest_date, view_type, selected_month, period_label, charts, tables)
+
+    progress(0.9, "파일 저장")
+    buffer = BytesIO()
+    doc.save(buffer)
+    return buffer.getvalue()
+
+
+def build_report(view_type, period, report_format="docx", path=TRAIN_CSV, progress=None, charts=None):
+    """형식별 보고서 바이트 (docx / pdf)"""
+    if report_format == "pdf":
+        # report_pdf가 이 모듈의 표/기간 함수를 쓰므로 사용할 때 import
+        from utills.report_pdf import build_report_pdf_bytes
+        return build_report_pdf_bytes(view_type, period, path, progress, charts)
+    return build_report_bytes(view_type, period, path, progress, charts)
+
+
+# ========== 3. 백그라운드 작업 큐 ==========
+# 작업 프로세스 → 메인 프로세스 진행률 전달용 큐 (풀 initializer로 전달)
+_progress_queue = None
+
+
+def _init_worker(queue):
+    global _progress_queue
+    _progress_queue = queue
+
+
+def _run_chart(chart_type, period, path):
+    return render_chart(chart_type, period, path)
+
+
+def _run_job(job_id, view_type, period, report_format, path, charts):
+    def progress(fraction, message):
+        share = CHART_PROGRESS_SHARE
+        _progress_queue.put((job_id, share + (1 - share) * fraction, message))
+
+    return build_report(view_type, period, report_format, path, progress, charts)
+
+
+@dataclass
+class ReportJob:
+    """보고서 작업 한 건의 상태 (메인 프로세스에서만 갱신)"""
+    job_id: int
+    key: tuple
+    status: str = QUEUED
+    progress: float = 0.0
+    message: str = "대기 중"
+    cached: bool = False
+    result: bytes = None
+    error: str = None
+    submitted_at: float = field(default_factory=time.time)
+    finished_at: float = None
+
+    @property
+    def done(self):
+        return self.status in (DONE, FAILED)
+
+    @property
+    def elapsed(self):
+        return (self.finished_at or time.time()) - self.submitted_at
+
+    @property
+    def report_format(self):
+        return self.key[2]
+
+    @property
+    def mime(self):
+        return REPORT_FORMATS[self.report_format]
+
+    def file_name(self):
+        finished = datetime.fromtimestamp(self.finished_at or time.time())
+        return f"전력분석보고서_{finished.strftime('%Y%m%d_%H%M%S')}.{self.report_format}"
+
+
+class ReportJobQueue:
+    """프로세스 풀 보고서 작업 큐 (서버 프로세스당 하나를 모든 세션이 공유)
+
+    - 같은 키의 작업이 진행 중이면 새로 만들지 않고 그 작업을 반환
+    - 차트마다 작업을 따로 넣어 병렬 렌더링 (PNG는 차트 종류/기간/데이터 버전별 파일 캐시),
+      차트가 모두 끝나면 문서 작성 작업을 넣음
+    - 완료된 결과는 (보기 방식, 기간, 형식, 데이터 버전) 키로 LRU 캐시 → 재요청 시 즉시 완료
+    - 작업 프로세스는 첫 요청 때 spawn으로 생성
+    """
+
+    def __init__(self, path=TRAIN_CSV, max_workers=REPORT_WORKERS, cache_size=REPORT_CACHE_SIZE):
+        self.path = path
+        self.max_workers = max_workers
+        self.cache_size = cache_size
+        self._lock = threading.RLock()
+        self._ids = itertools.count(1)
+        self._jobs = OrderedDict()      # job_id → ReportJob
+        self._inflight = {}             # key → job_id
+        self._cache = OrderedDict()     # key → 보고서 바이트
+        self._context = multiprocessing.get_context("spawn")
+        self._executor = None
+        self._progress = None
+
+    def data_version(self):
+        """원본 데이터 버전 (파일 크기 + 수정시각 시그니처)"""
+        return source_signature(self.path)
+
+    def job_key(self, view_type, period, report_format="docx"):
+        return (view_type, period, report_format, self.data_version())
+
+    def get(self, job_id):
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def submit(self, view_type, period, report_format="docx"):
+        """보고서 요청 → ReportJob (캐시 적중 시 이미 완료된 작업)"""
+        if report_format not in REPORT_FORMATS:
+            raise ValueError(f"보고서 형식은 {tuple(REPORT_FORMATS)} 중 하나여야 합니다: {report_format}")
+        key = self.job_key(view_type, period, report_format)
+        with self._lock:
+            if key in self._inflight:
+                return self._jobs[self._inflight[key]]
+
+            job = ReportJob(next(self._ids), key)
+            self._jobs[job.job_id] = job
+            self._prune()
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                job.status, job.progress, job.message = DONE, 1.0, "캐시된 보고서"
+                job.cached, job.result, job.finished_at = True, self._cache[key], time.time()
+                return job
+
+            self._inflight[key] = job.job_id
+            job.message = "차트 생성 대기"
+            charts = {}
+            try:
+                for chart_type in REPORT_CHARTS:
+                    future = self._submit(_run_chart, chart_type, period, self.path)
+                    future.add_done_callback(
+                        lambda f, chart_type=chart_type: self._chart_done(job, view_type, period, charts, chart_type, f))
+            except Exception as e:
+                # 작업을 넣지 못하면 대기 상태로 남지 않게 실패 처리 (먼저 넣은 차트 결과는 무시됨)
+                self._fail(job, str(e) or type(e).__name__)
+            return job
+
+    def _submit(self, func, *args):
+        try:
+            return self._ensure_executor().submit(func, *args)
+        except BrokenProcessPool:
+            # 작업 프로세스가 비정상 종료된 풀 → 새로 만들어 한 번 더
+            self._close_executor()
+            return self._ensure_executor().submit(func, *args)
+
+    def _chart_done(self, job, view_type, period, charts, chart_type, future):
+        """차트 하나 완료 → 모두 모이면 문서 작성 작업 등록"""
+        with self._lock:
+            if job.done:
+                return
+            try:
+                charts[chart_type] = future.result()
+            except Exception as e:
+                self._fail(job, f"{chart_type} 차트: {str(e) or type(e).__name__}")
+                return
+            job.status = RUNNING
+            job.progress = CHART_PROGRESS_SHARE * len(charts) / len(REPORT_CHARTS)
+            job.message = f"차트 생성 ({len(charts)}/{len(REPORT_CHARTS)})"
+            if len(charts) == len(REPORT_CHARTS):
+                try:
+                    future = self._submit(_run_job, job.job_id, view_type, period, job.report_format,
+                                          self.path, dict(charts))
+                except Exception as e:
+                    self._fail(job, str(e) or type(e).__name__)
+                    return
+                future.add_done_callback(lambda f: self._finish(job, f))
+
+    def _ensure_executor(self):
+        if self._executor is None:
+            self._progress = self._context.Queue()
+            self._executor = ProcessPoolExecutor(self.max_workers, mp_context=self._context,
+                                                 initializer=_init_worker, initargs=(self._progress,))
+            threading.Thread(target=self._listen, args=(self._progress,),
+                             name="report-progress", daemon=True).start()
+        return self._executor
+
+    def _close_executor(self, wait=False):
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait, cancel_futures=True)
+            self._progress.put(None)
+            self._executor = self._progress = None
+
+    def _listen(self, queue):
+        """작업 프로세스의 진행률 메시지를 작업 상태에 반영"""
+        while True:
+            item = queue.get()
+            if item is None:
+                return
+            job_id, fraction, message = item
+            with self._lock:
+                job = self._jobs.get(job_id)
+                if job is not None and not job.done:
+                    job.status, job.progress, job.message = RUNNING, fraction, message
+
+    def _fail(self, job, error):
+        self._inflight.pop(job.key, None)
+        job.finished_at = time.time()
+        job.status, job.message, job.error = FAILED, "생성 실패", error
+
+    def _finish(self, job, future):
+        with self._lock:
+            try:
+                result = future.result()
+            except Exception as e:
+                self._fail(job, str(e) or type(e).__name__)
+                return
+            self._inflight.pop(job.key, None)
+            job.finished_at = time.time()
+            job.status, job.progress, job.message, job.result = DONE, 1.0, "완료", result
+            self._cache[job.key] = result
+            self._cache.move_to_end(job.key)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+    def _prune(self):
+        """오래된 완료 작업 정보 삭제 (진행 중인 작업은 유지)"""
+        finished = [job_id for job_id, job in self._jobs.items() if job.done]
+        for job_id in finished[:max(len(finished) - MAX_FINISHED_JOBS, 0)]:
+            del self._jobs[job_id]
+
+    def shutdown(self, wait=True):
+        """작업 프로세스 종료 (결과 캐시는 유지)"""
+        with self._lock:
+            self._close_executor(wait)
+
+
+# ========== 4. 일괄 생성 CLI ==========
+def batch_requests(path=TRAIN_CSV, months=None, ranges=None):
+    """일괄 생성할 (보기 방식, 기간) 목록 — 기간 목록이 없으면 월별 (months 미지정 시 데이터가 있는 모든 달)"""
+    if ranges:
+        requests = []
+        for text in ranges:
+            start, _, end = text.partition(":")
+            start, end = date.fromisoformat(start), date.fromisoformat(end or start)
+            if start > end:
+                raise ValueError(f"시작 날짜가 종료 날짜보다 이후입니다: {text}")
+            requests.append(("일별", report_period("일별", selected_range=(start, end))))
+        return requests
+    if not months:
+        # 월별 보고서는 데이터 마지막 해 기준 (report_inputs와 동일)
+        df, index = _report_data(path)
+        periods = pd.PeriodIndex(df["년월"].unique())
+        months = sorted(p.month for p in periods if p.year == index.last_day.year)
+    return [("월별", report_period("월별", month)) for month in months]
+
+
+def report_file_name(view_type, period, year, report_format="docx"):
+    """일괄 생성 파일 이름 (월별: 전력분석보고서_2024-01.docx, 기간: 전력분석보고서_시작_끝.docx)"""
+    if view_type == "월별":
+        return f"전력분석보고서_{year}-{period:02d}.{report_format}"
+    if period is None:
+        return f"전력분석보고서_전체.{report_format}"
+    return f"전력분석보고서_{period[0]}_{period[1]}.{report_format}"
+
+
+def _write_report(view_type, period, report_format, path, out_file):
+    """작업 프로세스: 보고서 한 건 생성 후 파일로 저장 (프레임/큐브는 프로세스당 한 번만 로드)
+
+    PDF는 바이트로 모으지 않고 임시 파일에 바로 씀
+    """
+    started = time.perf_counter()
+    tmp_file = out_file.with_name(f"{out_file.name}.tmp{os.getpid()}")
+    if report_format == "pdf":
+        from utills.report_pdf import write_report_pdf
+        write_report_pdf(tmp_file, view_type, period, path)
+    else:
+        tmp_file.write_bytes(build_report_bytes(view_type, period, path))
+    size = tmp_file.stat().st_size
+    os.replace(tmp_file, out_file)
+    return {"file": str(out_file), "bytes": size, "seconds": time.perf_counter() - started}
+
+
+def generate_reports(requests, out_dir=REPORT_DIR, path=TRAIN_CSV, workers=None, log=print, report_format="docx"):
+    """(보기 방식, 기간) 목록을 프로세스 풀에서 생성 → 결과 목록 (요청 순서)"""
+    from utills.rollup import load_rollup
+
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    # Parquet 캐시(프레임/큐브)를 먼저 만들어 두면 작업 프로세스는 읽기만 함
+    _, index = _report_data(path)
+    load_rollup(path)
+    year = index.last_day.year
+
+    workers = max(1, min(workers or os.cpu_count() or 1, len(requests)))
+    results = [None] * len(requests)
+    started = time.perf_counter()
+    with ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context("spawn")) as executor:
+        futures = {
+            executor.submit(_write_report, view_type, period, report_format, path,
+                            out_dir / report_file_name(view_type, period, year, report_format)): i
+            for i, (view_type, period) in enumerate(requests)
+        }
+        for done, future in enumerate(as_completed(futures), 1):
+            i = futures[future]
+            view_type, period = requests[i]
+            try:
+                results[i] = {"view_type": view_type, "period": period, **future.result()}
+                log(f"[{done}/{len(requests)}] {Path(results[i]['file']).name} ({results[i]['seconds']:.2f}s)")
+            except Exception as e:
+                results[i] = {"view_type": view_type, "period": period, "error": str(e) or type(e).__name__}
+                log(f"[{done}/{len(requests)}] {view_type} {period} 실패: {results[i]['error']}")
+    log(f"{len(requests)}건 / 작업 프로세스 {workers}개 — {time.perf_counter() - started:.2f}s")
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="전력 분석 보고서(docx / PDF) 일괄 생성")
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument("--months", type=int, nargs="+", choices=range(1, 13), metavar="MONTH",
+                       help="생성할 월 (기본: 데이터가 있는 모든 달)")
+    group.add_argument("--ranges", nargs="+", metavar="START:END",
+                       help="기간 목록 (예: 2024-03-01:2024-03-10)")
+    parser.add_argument("--format", dest="report_format", choices=tuple(REPORT_FORMATS), default="docx",
+                        help="보고서 형식")
+    parser.add_argument("--out", type=Path, default=REPORT_DIR, help="저장 폴더")
+    parser.add_argument("--workers", type=int, default=None, help="작업 프로세스 수 (기본: CPU 수)")
+    parser.add_argument("--train", default=TRAIN_CSV, help="train.csv 경로")
+    parser.add_argument("--json", action="store_true", help="결과를 JSON으로 출력")
+    args = parser.parse_args(argv)
+
+    try:
+        requests = batch_requests(args.train, args.months, args.ranges)
+    except ValueError as e:
+        parser.error(str(e))
+    results = generate_reports(requests, args.out, args.train, args.workers,
+                               log=(lambda message: None) if args.json else print,
+                               report_format=args.report_format)
+    if args.json:
+        print(json.dumps(results, ensure_ascii=False, indent=2))
+    return 1 if any("error" in r for r in results) else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,220 @@
+"""docx 보고서용 차트 이미지 (matplotlib PNG)
+
+- REPORT_CHARTS: 보고서에 넣는 차트 종류 (월별 이중축, 시간대별 스택, 작업유형 도넛, 역률 추이)
+- render_chart(): (데이터 파일, 차트 종류, 기간, 데이터 버전) 단위로 cache/ 에 PNG를 저장해 재사용
+  → 보고서 작업 큐가 차트별로 작업 프로세스에 나눠 병렬 렌더링
+
+Streamlit / 브라우저(kaleido) 없이 Figure 객체에 직접 그리므로(pyplot / GUI 백엔드 불필요) 작업 프로세스에서 바로 실행 가능
+폰트 등 차트 설정은 draw_chart() 안에서만 적용 (전역 rcParams는 건드리지 않음)
+"""
+import warnings
+from datetime import date
+from io import BytesIO
+from pathlib import Path
+
+import matplotlib
+from matplotlib import font_manager
+from matplotlib.figure import Figure
+from matplotlib.ticker import FuncFormatter
+import numpy as np
+import pandas as pd
+
+from utills.data import TRAIN_CSV, read_cached_bytes, source_signature
+from utills.power_factor import daily_power_factor
+from utills.rollup import load_rollup
+
+# 보고서에 넣는 차트 (순서 = 문서 배치 순서)
+REPORT_CHARTS = ("dual_axis", "hourly_stack", "donut", "pf_trend")
+
+CHART_TITLES = {
+    "dual_axis": "전력사용량 / 전기요금 추이",
+    "hourly_stack": "시간대별 작업유형별 전기요금",
+    "donut": "작업유형별 전력사용량 비중",
+    "pf_trend": "연간 역률 추이",
+}
+
+WORKTYPE_NAMES = {"Light_Load": "경부하", "Medium_Load": "중간부하", "Maximum_Load": "최대부하"}
+WORKTYPE_COLORS = {"Light_Load": "#34a853", "Medium_Load": "#fbbc04", "Maximum_Load": "#ea4335"}
+
+# 보고서 이미지 해상도 (화면용 300dpi 대신 문서 폭 15cm 기준으로 충분한 값)
+CHART_DPI = 150
+CHART_SIZE = (10, 5)
+
+# 한글 폰트 후보 — 설치된 것만 지정 (없는 폰트를 매 글자 찾느라 느려지고 로그가 쌓이는 것 방지)
+KOREAN_FONTS = ("Malgun Gothic", "AppleGothic", "NanumGothic", "Noto Sans KR")
+_installed = {f.name for f in font_manager.fontManager.ttflist}
+CHART_FONTS = [f for f in KOREAN_FONTS if f in _installed] + ["DejaVu Sans"]
+CHART_RC = {"font.family": CHART_FONTS, "axes.unicode_minus": False}
+
+# 축 눈금: 1e7 같은 지수 표기 대신 천 단위 구분
+THOUSANDS = FuncFormatter(lambda value, _: f"{value:,.0f}")
+
+# 작업 프로세스 안에서 재사용하는 (경로, 데이터 버전) → (큐브, 역률 표)
+_CHART_DATA = {}
+
+
+# ========== 1. 기간 / 데이터 ==========
+def period_slug(period):
+    """기간 값 → 캐시 파일 이름 조각 (월별: m01, 일별: 시작_끝, 전체: all)"""
+    if period is None:
+        return "all"
+    if isinstance(period, int):
+        return f"m{period:02d}"
+    return "_".join(period)
+
+
+def period_bounds(cube, period):
+    """기간 값 → (시작일, 종료일) — 월은 데이터 마지막 해 기준, 전체는 (None, None)"""
+    if period is None:
+        return None, None
+    if isinstance(period, int):
+        month = pd.Period(year=cube.days[-1].year, month=period, freq="M")
+        return month.start_time.date(), month.end_time.date()
+    start, end = period
+    return date.fromisoformat(start), date.fromisoformat(end)
+
+
+def report_cube(path=TRAIN_CSV):
+    """(큐브, 일별 역률 표) — 작업 프로세스 안에서 데이터 버전이 같으면 재사용"""
+    key = (str(path), source_signature(path))
+    if key not in _CHART_DATA:
+        _CHART_DATA.clear()
+        cube = load_rollup(path)
+        _CHART_DATA[key] = (cube, daily_power_factor(cube.hourly))
+    return _CHART_DATA[key]
+
+
+# ========== 2. 차트 그리기 ==========
+def _to_png(fig):
+    buffer = BytesIO()
+    with warnings.catch_warnings():
+        # 한글 폰트가 없는 환경의 글리프 누락 경고는 무시
+        warnings.filterwarnings("ignore", message=".*[Gg]lyph.*missing.*")
+        fig.savefig(buffer, format="png", dpi=CHART_DPI, bbox_inches="tight", facecolor="white")
+    return buffer.getvalue()
+
+
+def _subplots(figsize):
+    """pyplot 없이 Figure + Axes 하나 (그림 관리자에 등록되지 않아 닫을 필요 없음)"""
+    fig = Figure(figsize=figsize)
+    return fig, fig.subplots()
+
+
+def _style(ax, title, xlabel, ylabel):
+    ax.set_title(title, fontsize=14, fontweight="bold", color="#202124")
+    ax.set_xlabel(xlabel)
+    ax.set_ylabel(ylabel)
+    ax.grid(True, alpha=0.3, linestyle="--")
+    ax.spines["top"].set_visible(False)
+    ax.yaxis.set_major_formatter(THOUSANDS)
+
+
+def _no_data(ax):
+    ax.text(0.5, 0.5, "해당 기간 데이터 없음", transform=ax.transAxes, ha="center", va="center",
+            fontsize=14, color="#5f6368")
+
+
+def draw_dual_axis(cube, period, start, end):
+    """월별(또는 일별 기간) 전력사용량 막대 + 전기요금 선 — 선택한 달은 강조"""
+    columns = ["전력사용량(kWh)", "전기요금(원)"]
+    if isinstance(period, tuple):
+        data = cube.aggregate("day", columns, start, end)
+        labels = [d.strftime("%m-%d") for d in data["날짜"]]
+        highlight = np.ones(len(data), dtype=bool)
+        xlabel = "날짜"
+    else:
+        data = cube.aggregate("month", columns)
+        labels = [f"{p.month}월" for p in data["년월"]]
+        highlight = (np.array([p.month for p in data["년월"]]) == period) if period else np.ones(len(data), dtype=bool)
+        xlabel = "월"
+
+    fig, ax = _subplots(figsize=CHART_SIZE)
+    x = np.arange(len(data))
+    ax.bar(x, data["전력사용량(kWh)"], color=np.where(highlight, "#1a73e8", "#c6dafc"), label="전력사용량(kWh)")
+    _style(ax, CHART_TITLES["dual_axis"], xlabel, "전력사용량 (kWh)")
+    ax.set_xticks(x)
+    ax.set_xticklabels(labels, rotation=45 if len(x) > 12 else 0, ha="right" if len(x) > 12 else "center")
+    ax2 = ax.twinx()
+    ax2.plot(x, data["전기요금(원)"], color="#ea4335", marker="o", linewidth=2.5, label="전기요금(원)")
+    ax2.set_ylabel("전기요금 (원)", color="#ea4335")
+    ax2.yaxis.set_major_formatter(THOUSANDS)
+    ax2.spines["top"].set_visible(False)
+    return fig
+
+
+def draw_hourly_stack(cube, period, start, end):
+    """시간(0~23) × 작업유형 전기요금 누적 막대"""
+    pivot = cube.hour_by_worktype("전기요금(원)", start, end).reindex(range(24), fill_value=0)
+    fig, ax = _subplots(figsize=CHART_SIZE)
+    bottom = np.zeros(len(pivot))
+    for work_type in WORKTYPE_NAMES:
+        if work_type in pivot.columns:
+            values = pivot[work_type].to_numpy(dtype=np.float64)
+            ax.bar(pivot.index, values, bottom=bottom, color=WORKTYPE_COLORS[work_type],
+                   edgecolor="white", linewidth=0.5, label=WORKTYPE_NAMES[work_type])
+            bottom += values
+    _style(ax, CHART_TITLES["hourly_stack"], "시간", "전기요금 (원)")
+    ax.set_xticks(range(24))
+    if bottom.any():
+        ax.legend(loc="upper left")
+    else:
+        _no_data(ax)
+    return fig
+
+
+def draw_donut(cube, period, start, end):
+    """작업유형별 전력사용량 도넛 (가운데 총 MWh)"""
+    kwh = cube.by_worktype(start, end)["전력사용량(kWh)"]
+    kwh = kwh[[w for w in WORKTYPE_NAMES if w in kwh.index]]
+    fig, ax = _subplots(figsize=(6, 6))
+    if not kwh.sum() > 0:
+        ax.set_title(CHART_TITLES["donut"], fontsize=14, fontweight="bold", color="#202124")
+        ax.axis("off")
+        _no_data(ax)
+        return fig
+    ax.pie(kwh.to_numpy(), labels=[WORKTYPE_NAMES[w] for w in kwh.index],
+           colors=[WORKTYPE_COLORS[w] for w in kwh.index], autopct="%1.1f%%", startangle=90,
+           wedgeprops=dict(width=0.45, edgecolor="white", linewidth=2), pctdistance=0.78)
+    ax.text(0, 0, f"{kwh.sum() / 1000:,.1f}\nMWh", ha="center", va="center", fontsize=16, fontweight="bold")
+    ax.set_title(CHART_TITLES["donut"], fontsize=14, fontweight="bold", color="#202124")
+    ax.axis("equal")
+    return fig
+
+
+def draw_pf_trend(pf_table, start, end):
+    """일별 주간 지상역률 / 야간 진상역률 — 보고서 기간은 음영 표시"""
+    days = pd.to_datetime(pf_table.index)
+    fig, ax = _subplots(figsize=CHART_SIZE)
+    ax.plot(days, pf_table["주간_지상역률"], color="#fbbc04", linewidth=1.5, label="주간 지상역률 (09-23시)")
+    ax.plot(days, pf_table["야간_진상역률"], color="#1a73e8", linewidth=1.5, label="야간 진상역률 (23-09시)")
+    ax.axhline(90, color="#fbbc04", linestyle=":", linewidth=1)
+    ax.axhline(95, color="#1a73e8", linestyle=":", linewidth=1)
+    if start is not None:
+        ax.axvspan(pd.Timestamp(start), pd.Timestamp(end), color="#5f6368", alpha=0.12, label="보고서 기간")
+    _style(ax, CHART_TITLES["pf_trend"], "날짜", "역률 (%)")
+    ax.set_ylim(55, 102)
+    ax.legend(loc="lower left")
+    return fig
+
+
+def draw_chart(chart_type, period, path=TRAIN_CSV):
+    """차트 한 개 → PNG 바이트 (캐시 없이)"""
+    cube, pf_table = report_cube(path)
+    start, end = period_bounds(cube, period)
+    with matplotlib.rc_context(CHART_RC):
+        if chart_type == "pf_trend":
+            return _to_png(draw_pf_trend(pf_table, start, end))
+        draw = {"dual_axis": draw_dual_axis, "hourly_stack": draw_hourly_stack, "donut": draw_donut}[chart_type]
+        return _to_png(draw(cube, period, start, end))
+
+
+def render_chart(chart_type, period, path=TRAIN_CSV):
+    """(데이터 파일, 차트 종류, 기간, 데이터 버전) 단위로 캐시된 PNG 바이트"""
+    # 캐시 이름에 원본 파일 이름을 넣어 다른 CSV의 같은 차트를 stale로 지우지 않게 함
+    return read_cached_bytes(f"{Path(path).stem}_chart_{chart_type}_{period_slug(period)}", [path],
+                             lambda: draw_chart(chart_type, period, path), suffix="png")
+
+
+def render_report_charts(period, path=TRAIN_CSV):
+    """보고서 차트 전체를 현재 프로세스에서 차례로 렌더링 (작업 큐를 쓰지 않는 경로)"""
+    return {chart_type: render_chart(chart_type, period, path) for chart_type in REPORT_CHARTS}
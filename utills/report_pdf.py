@@ -0,0 +1,222 @@
+"""종합 보고서 PDF 출력 (reportlab) — 페이지를 만들면서 내용을 차례로 흘려 넣음
+
+- report_flowables(): 보고서 내용을 flowable 생성기로 (머리 표 → 요약 → 차트 → 상세 표 → 일별 부록)
+- StreamingStory: 생성기를 reportlab build()가 쓰는 목록처럼 감싸 몇 개씩만 미리 꺼냄
+  → 1년치 부록도 flowable 전체를 메모리에 올리지 않고 처리한 것은 바로 버림
+- write_report_pdf(): 파일 경로 / 파일 객체에 바로 저장, build_report_pdf_bytes(): 작업 큐용 바이트
+
+docx를 변환하지 않고 같은 데이터(큐브, 차트 PNG 캐시, 상세 표)에서 직접 만듦
+"""
+import os
+from io import BytesIO
+
+import numpy as np
+from reportlab.lib import colors
+from reportlab.lib.enums import TA_CENTER
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.styles import ParagraphStyle
+from reportlab.lib.units import cm
+from reportlab.lib.utils import ImageReader
+from reportlab.pdfbase import pdfmetrics
+from reportlab.pdfbase.cidfonts import UnicodeCIDFont
+from reportlab.platypus import Image, KeepTogether, Paragraph, SimpleDocTemplate, Table, TableStyle
+
+from utills.data import TRAIN_CSV
+from utills.docx_table import format_column
+from utills.report import period_label, report_header_rows, report_tables
+from utills.report_charts import CHART_TITLES, REPORT_CHARTS, period_bounds, render_chart, report_cube
+from utills.rollup import NUMERIC_COLUMNS
+
+# 한글 내장 CID 폰트 (폰트 파일 없이 PDF 뷰어의 한글 글꼴 사용)
+PDF_FONT = "HYGothic-Medium"
+pdfmetrics.registerFont(UnicodeCIDFont(PDF_FONT))
+
+PAGE_MARGIN = 2 * cm
+CHART_WIDTH = 15 * cm
+
+# 상세 표를 이 행 수마다 별도 Table로 나눔 (긴 표의 분할 비용 / 셀 객체 메모리 제한)
+TABLE_CHUNK_ROWS = 40
+
+# StreamingStory가 생성기에서 미리 꺼내 두는 flowable 수 (keepWithNext 판단용)
+STORY_LOOKAHEAD = 4
+
+HEADER_GRAY = colors.HexColor("#e8eaed")
+
+STYLES = {
+    "title": ParagraphStyle("title", fontName=PDF_FONT, fontSize=18, leading=24, alignment=TA_CENTER,
+                            spaceBefore=12, spaceAfter=12),
+    "h2": ParagraphStyle("h2", fontName=PDF_FONT, fontSize=14, leading=20, spaceBefore=12, spaceAfter=6,
+                         keepWithNext=1),
+    "h3": ParagraphStyle("h3", fontName=PDF_FONT, fontSize=11, leading=16, spaceBefore=8, spaceAfter=4,
+                         keepWithNext=1),
+    "body": ParagraphStyle("body", fontName=PDF_FONT, fontSize=10, leading=16),
+    "caption": ParagraphStyle("caption", fontName=PDF_FONT, fontSize=9, leading=14, alignment=TA_CENTER,
+                              spaceAfter=8),
+}
+
+
+class StreamingStory(list):
+    """flowable 생성기를 build()에 넘기는 목록 — 길이를 물을 때 부족한 만큼만 생성기에서 채움
+
+    build()는 목록 앞에서 하나씩 꺼내 쓰고, 페이지를 넘기는 flowable은 나눈 나머지를 앞에 다시 넣음
+    """
+
+    def __init__(self, flowables, lookahead=STORY_LOOKAHEAD):
+        super().__init__()
+        self._source = iter(flowables)
+        self._lookahead = lookahead
+
+    def __len__(self):
+        while self._source is not None and list.__len__(self) < self._lookahead:
+            try:
+                self.append(next(self._source))
+            except StopIteration:
+                self._source = None
+        return list.__len__(self)
+
+
+# ========== 1. flowable ==========
+def _data_table(frame, col_widths=None):
+    """DataFrame → 머리글 행 포함 Table (숫자는 오른쪽 정렬)"""
+    columns = [str(c) for c in frame.columns]
+    cells = [format_column(frame[c], "{:,.2f}") for c in frame.columns]
+    table = Table([columns] + [list(row) for row in zip(*cells)], colWidths=col_widths, repeatRows=1)
+    table.setStyle(TableStyle([
+        ("FONTNAME", (0, 0), (-1, -1), PDF_FONT),
+        ("FONTSIZE", (0, 0), (-1, -1), 7),
+        ("LEADING", (0, 0), (-1, -1), 9),
+        ("BACKGROUND", (0, 0), (-1, 0), HEADER_GRAY),
+        ("ALIGN", (0, 0), (-1, 0), "CENTER"),
+        ("ALIGN", (1, 1), (-1, -1), "RIGHT"),
+        ("GRID", (0, 0), (-1, -1), 0.4, colors.grey),
+        ("TOPPADDING", (0, 0), (-1, -1), 2),
+        ("BOTTOMPADDING", (0, 0), (-1, -1), 2),
+    ]))
+    return table
+
+
+def _table_chunks(frame):
+    """긴 표 → TABLE_CHUNK_ROWS 행씩 나눈 Table (필요할 때 하나씩 생성)"""
+    for i in range(0, max(len(frame), 1), TABLE_CHUNK_ROWS):
+        yield _data_table(frame.iloc[i:i + TABLE_CHUNK_ROWS])
+
+
+def _header_table(label):
+    """docx와 같은 보고서 머리 표"""
+    rows = [["보 고 서", "", "", ""]]
+    spans = [("SPAN", (0, 0), (-1, 0))]
+    for i, (col1, val1, col2, val2) in enumerate(report_header_rows(label), 1):
+        rows.append([col1, val1, col2, val2])
+        if not col2:
+            spans.append(("SPAN", (1, i), (-1, i)))
+    table = Table(rows, colWidths=[2.5 * cm, 6 * cm, 2.5 * cm, 6 * cm])
+    table.setStyle(TableStyle([
+        ("FONTNAME", (0, 0), (-1, -1), PDF_FONT),
+        ("FONTSIZE", (0, 0), (-1, -1), 9),
+        ("FONTSIZE", (0, 0), (-1, 0), 20),
+        ("LEADING", (0, 0), (-1, 0), 28),
+        ("ALIGN", (0, 0), (-1, 0), "CENTER"),
+        ("GRID", (0, 0), (-1, -1), 0.6, colors.black),
+        ("VALIGN", (0, 0), (-1, -1), "MIDDLE"),
+    ] + spans))
+    return table
+
+
+def _chart_image(png):
+    """PNG 바이트 → 폭 CHART_WIDTH 이미지 (비율 유지)"""
+    width, height = ImageReader(BytesIO(png)).getSize()
+    return Image(BytesIO(png), width=CHART_WIDTH, height=CHART_WIDTH * height / width)
+
+
+def report_flowables(view_type, period, path=TRAIN_CSV, charts=None, appendix=True, progress=None):
+    """보고서 내용 flowable 생성기 (progress(비율, 메시지)로 단계 보고)
+
+    charts: 미리 렌더링한 차트 PNG — 없으면 차트마다 필요할 때 렌더링 (캐시 사용)
+    appendix: 기간의 날짜마다 시간대별 상세 표를 부록으로 추가
+    """
+    progress = progress or (lambda fraction, message: None)
+    progress(0.1, "데이터 준비")
+    cube, _ = report_cube(path)
+    start, end = period_bounds(cube, period)
+    label = period_label(view_type, period)
+
+    yield _header_table(label)
+    yield Paragraph("보고내용", STYLES["title"])
+
+    # === 1. 기간별 분석 ===
+    yield Paragraph(f"1. {label} 전력 사용 분석", STYLES["h2"])
+    totals = cube.totals(start, end)
+    if totals is not None:
+        prefix = label if view_type == "월별" else "기간"
+        total_kwh, total_cost = totals["전력사용량(kWh)"], totals["전기요금(원)"]
+        avg_price = total_cost / total_kwh if total_kwh > 0 else 0
+        for line in (f"□ {prefix} 총 전력사용량: {total_kwh:,.1f} kWh",
+                     f"□ {prefix} 총 전기요금: {total_cost:,.0f} 원",
+                     f"□ {prefix} 평균 단가: {avg_price:.1f} 원/kWh",
+                     f"□ {prefix} 평균 역률: {totals['지상역률(%)']:.1f}%",
+                     f"□ {prefix} 탄소배출량: {totals['탄소배출량(tCO2)']:.2f} tCO2"):
+            yield Paragraph(line, STYLES["body"])
+
+    # === 2. 차트 ===
+    yield Paragraph("2. 주요 차트", STYLES["h2"])
+    for i, chart_type in enumerate(REPORT_CHARTS):
+        progress(0.15 + 0.25 * i / len(REPORT_CHARTS), f"차트 ({i + 1}/{len(REPORT_CHARTS)})")
+        png = charts.get(chart_type) if charts else render_chart(chart_type, period, path)
+        if png:
+            yield KeepTogether([_chart_image(png), Paragraph(f"[그림] {CHART_TITLES[chart_type]}", STYLES["caption"])])
+
+    # === 3. 상세 데이터 ===
+    progress(0.4, "상세 표")
+    yield Paragraph("3. 상세 데이터", STYLES["h2"])
+    for i, (title, table) in enumerate(report_tables(cube, period, hourly=False), 1):
+        yield Paragraph(f"3-{i}. {title}", STYLES["h3"])
+        yield from _table_chunks(table)
+
+    # === 부록: 날짜별 시간대 상세 ===
+    if not appendix:
+        return
+    hourly = cube.aggregate("day_hour", NUMERIC_COLUMNS, start, end)
+    if hourly.empty:
+        return
+    yield Paragraph("부록. 일별 시간대 상세", STYLES["h2"])
+    days = hourly["날짜"].to_numpy()
+    bounds = [0] + (np.flatnonzero(days[1:] != days[:-1]) + 1).tolist() + [len(days)]
+    n_days = len(bounds) - 1
+    for k in range(n_days):
+        if k % 10 == 0:
+            progress(0.45 + 0.5 * k / n_days, f"부록 ({k + 1}/{n_days}일)")
+        day = hourly.iloc[bounds[k]:bounds[k + 1]]
+        table = day.drop(columns="날짜")
+        table.insert(0, "시간", [f"{h:02d}시" for h in table.pop("시간")])
+        yield KeepTogether([Paragraph(f"{days[bounds[k]]}", STYLES["h3"]), _data_table(table)])
+
+
+# ========== 2. 문서 저장 ==========
+def _decorate_page(canvas, doc):
+    """페이지 테두리 + 쪽 번호 (docx 페이지 테두리와 같은 위치)"""
+    width, height = doc.pagesize
+    canvas.saveState()
+    canvas.setLineWidth(1.5)
+    canvas.rect(PAGE_MARGIN / 2, PAGE_MARGIN / 2, width - PAGE_MARGIN, height - PAGE_MARGIN)
+    canvas.setFont(PDF_FONT, 8)
+    canvas.drawCentredString(width / 2, PAGE_MARGIN / 2 + 6, f"- {doc.page} -")
+    canvas.restoreState()
+
+
+def write_report_pdf(target, view_type, period, path=TRAIN_CSV, charts=None, appendix=True, progress=None):
+    """보고서 PDF를 target(파일 경로 / 파일 객체)에 저장"""
+    if isinstance(target, os.PathLike):
+        # reportlab은 Path를 받지 않음
+        target = os.fspath(target)
+    doc = SimpleDocTemplate(target, pagesize=A4, leftMargin=PAGE_MARGIN, rightMargin=PAGE_MARGIN,
+                            topMargin=PAGE_MARGIN, bottomMargin=PAGE_MARGIN,
+                            title=f"전력 분석 보고서 ({period_label(view_type, period)})", author="전력분석팀")
+    story = StreamingStory(report_flowables(view_type, period, path, charts, appendix, progress))
+    doc.build(story, onFirstPage=_decorate_page, onLaterPages=_decorate_page)
+
+
+def build_report_pdf_bytes(view_type, period, path=TRAIN_CSV, progress=None, charts=None):
+    """보고서 한 건 → PDF 바이트 (작업 큐 / 다운로드 버튼용)"""
+    buffer = BytesIO()
+    write_report_pdf(buffer, view_type, period, path, charts, progress=progress)
+    return buffer.getvalue()
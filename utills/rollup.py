@@ -0,0 +1,137 @@
+"""보고서 페이지용 사전 집계 큐브 (시간/일/월 × 작업유형)
+
+15분 원본 대신 (날짜, 시간, 작업유형) 단위 합계/건수를 한 번만 만들어 두고
+일/월 단위는 그 결과를 다시 합산 → 차트/표/카드는 큐브만 조회
+평균 컬럼(역률)은 합계/건수로 계산하므로 원본 평균과 동일
+"""
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from utills.aggregates import PrefixSums
+from utills.data import TRAIN_CSV, load_train, read_cached_frame
+
+NUMERIC_COLUMNS = ["전력사용량(kWh)", "지상무효전력량(kVarh)", "진상무효전력량(kVarh)",
+                   "탄소배출량(tCO2)", "지상역률(%)", "진상역률(%)", "전기요금(원)"]
+
+# 합계 대신 평균으로 보여주는 컬럼
+MEAN_COLUMNS = ["지상역률(%)", "진상역률(%)"]
+
+# 큐브에 저장하는 값 (평균 계산용 행 수 포함)
+VALUE_COLUMNS = NUMERIC_COLUMNS + ["건수"]
+
+# 집계 단위별 그룹 키
+LEVEL_KEYS = {"hour": "시간", "day": "날짜", "month": "년월", "day_hour": ["날짜", "시간"]}
+
+
+def _finalize(sums):
+    """합계 프레임(+건수) → 평균 컬럼은 합계/건수로 변환"""
+    out = sums[NUMERIC_COLUMNS].copy()
+    for col in MEAN_COLUMNS:
+        out[col] = sums[col] / sums["건수"]
+    return out
+
+
+class RollupCube:
+    """(날짜, 시간, 작업유형) 합계 큐브와 일/월 단위 파생 큐브
+
+    모든 큐브는 날짜순 정렬 → 기간 선택은 이진 탐색 후 슬라이스,
+    기간 합계는 일별 누적합 차이로 O(log 일수)
+    """
+
+    def __init__(self, hourly):
+        self.hourly = hourly.sort_values(["날짜", "시간", "작업유형"], ignore_index=True)
+        self.daily = (self.hourly.groupby(["날짜", "년월", "작업유형"], sort=True, observed=True)[VALUE_COLUMNS]
+                      .sum().reset_index())
+        self.monthly = (self.daily.groupby(["년월", "작업유형"], sort=True, observed=True)[VALUE_COLUMNS]
+                        .sum().reset_index())
+
+        self._hourly_days = self.hourly["날짜"].to_numpy()
+        self._daily_days = self.daily["날짜"].to_numpy()
+        day_sums = self.daily.groupby("날짜", sort=True)[VALUE_COLUMNS].sum()
+        self._days = day_sums.index.to_numpy()
+        self._month_sums = self.monthly.groupby("년월", sort=True)[VALUE_COLUMNS].sum()
+        self._day_sums = PrefixSums(day_sums, VALUE_COLUMNS)
+
+    @classmethod
+    def from_frame(cls, df):
+        """load_train() 프레임에서 큐브 생성"""
+        grouped = df.groupby(["날짜", "시간", "년월", "작업유형"], sort=False, observed=True)
+        hourly = grouped[NUMERIC_COLUMNS].sum()
+        hourly["건수"] = grouped.size()
+        hourly = hourly.astype(np.float64).reset_index()
+        hourly["건수"] = hourly["건수"].astype(np.int64)
+        # 큐브 키는 날짜 선택기 값과 바로 비교할 수 있게 파이썬 date로
+        if pd.api.types.is_datetime64_any_dtype(hourly["날짜"]):
+            hourly["날짜"] = hourly["날짜"].dt.date
+        return cls(hourly)
+
+    def __len__(self):
+        return len(self.hourly)
+
+    @property
+    def days(self):
+        """데이터가 있는 날짜 (오름차순)"""
+        return list(self._days)
+
+    # ─── 구간 선택 ───
+    @staticmethod
+    def _bounds(days, start=None, stop=None, month=None):
+        """정렬된 날짜 배열에서 [start, stop] (양끝 포함, month 지정 시 그 달로 제한) 위치"""
+        if month is not None:
+            first, last = month.start_time.date(), month.end_time.date()
+            start = first if start is None else max(start, first)
+            stop = last if stop is None else min(stop, last)
+        i = 0 if start is None else int(np.searchsorted(days, start, side="left"))
+        j = len(days) if stop is None else int(np.searchsorted(days, stop, side="right"))
+        return i, max(i, j)
+
+    def _rows(self, level, start=None, stop=None, month=None):
+        if level == "month" and start is None and stop is None and month is None:
+            return self.monthly
+        if level in ("hour", "day_hour"):
+            i, j = self._bounds(self._hourly_days, start, stop, month)
+            return self.hourly.iloc[i:j]
+        i, j = self._bounds(self._daily_days, start, stop, month)
+        return self.daily.iloc[i:j]
+
+    # ─── 조회 ───
+    def aggregate(self, level, columns, start=None, stop=None, month=None):
+        """level 키별 집계 (역률은 평균, 나머지는 합계) — 예전 groupby().agg()와 같은 모양"""
+        key = LEVEL_KEYS[level]
+        if level == "month" and start is None and stop is None and month is None:
+            sums = self._month_sums
+        else:
+            rows = self._rows(level, start, stop, month)
+            sums = rows.groupby(key, sort=True, observed=True)[VALUE_COLUMNS].sum()
+        return _finalize(sums)[list(dict.fromkeys(columns))].reset_index()
+
+    def totals(self, start=None, stop=None, month=None):
+        """구간 전체 합계/평균 (컬럼 → 값 Series, 데이터가 없으면 None)"""
+        i, j = self._bounds(self._days, start, stop, month)
+        if i == j:
+            return None
+        sums = self._day_sums.range_totals(i, j)
+        for col in MEAN_COLUMNS:
+            sums[col] /= sums["건수"]
+        return pd.Series([sums[col] for col in NUMERIC_COLUMNS], index=NUMERIC_COLUMNS)
+
+    def by_worktype(self, start=None, stop=None, month=None):
+        """작업유형별 합계/평균 (작업유형 인덱스)"""
+        rows = self._rows("month" if start is None and stop is None else "day", start, stop, month)
+        sums = rows.groupby("작업유형", sort=True, observed=True)[VALUE_COLUMNS].sum()
+        return _finalize(sums)
+
+    def hour_by_worktype(self, column, start=None, stop=None):
+        """시간(0~23) × 작업유형 합계 피벗"""
+        rows = self._rows("hour", start, stop)
+        return (rows.groupby(["시간", "작업유형"], sort=True, observed=True)[column]
+                .sum().unstack(fill_value=0))
+
+
+def load_rollup(path=TRAIN_CSV):
+    """train.csv가 바뀌지 않았으면 cache/ 의 시간 단위 큐브를 그대로 사용"""
+    hourly = read_cached_frame(path, lambda p: RollupCube.from_frame(load_train(p)).hourly,
+                               name=f"{Path(path).stem}_rollup")
+    return RollupCube(hourly)
@@ -0,0 +1,303 @@
+"""실시간 모니터링 재생 엔진 / 공유 틱 생성기
+
+- MonitorEngine: 재생 위치, KPI 합계, SHAP 누적을 관리하는 UI 비의존 엔진
+- TickProducer: 서버 프로세스당 하나의 백그라운드 스레드가 엔진을 진행시키고
+  불변 Snapshot을 게시 → 모든 세션은 최신 Snapshot만 읽음 (재계산 없음)
+- replay(): 브라우저 없이 최대 속도로 재생해 KPI / 틱 지연시간 / 처리량 측정
+
+사용법 (헤드리스 재생):
+    python -m utills.stream --start-id 32111 --rows 960 --batch 1 --predictor xgboost --json
+"""
+import argparse
+import json
+import threading
+import time
+from dataclasses import dataclass, field
+
+import numpy as np
+
+from utills.aggregates import ShapAggregator
+from utills.downsample import CHART_POINT_BUDGET, SeriesDownsampler
+
+# 최근 SHAP 벡터를 보관하는 링버퍼 크기 (틱 수)
+SHAP_BUFFER_SIZE = 1024
+
+# 재생 속도 선택지: 새로고침 1회당 진행 행 수 (1행 = 15분)
+REPLAY_SPEEDS = {1: "15분", 4: "1시간", 16: "4시간", 96: "1일"}
+
+# 차트/카드에 표시하는 SHAP 피처
+SHAP_DISPLAY_FEATURES = [
+    "전력사용량(kWh)",
+    "지상무효전력량(kVarh)",
+    "진상무효전력량(kVarh)",
+    "탄소배출량(tCO2)",
+    "진상역률_이진",
+    "지상역률_이진",
+]
+
+
+@dataclass(frozen=True)
+class Snapshot:
+    """한 틱 시점의 게시 상태 (읽기 전용)"""
+    tick: int
+    start_idx: int
+    idx: int
+    running: bool
+    finished: bool
+    totals: dict
+    shap_mean_abs: dict
+    shap_last: dict
+    chart_idx: np.ndarray     # 요금 차트에 그릴 행 번호 (점 예산 이내로 다운샘플)
+    published_at: float = field(default_factory=time.time)
+
+    @property
+    def rows(self):
+        return self.idx - self.start_idx
+
+
+# ========== 1. 재생 엔진 ==========
+class MonitorEngine:
+    """store의 [start_idx, ...) 구간을 재생 (한 번에 여러 행도 벡터 연산으로 진행)
+
+    shap_table이 없으면 SHAP 누적을 하지 않음 (Snapshot의 SHAP 값은 빈 dict)
+    """
+
+    def __init__(self, store, shap_table=None, shap_buffer=SHAP_BUFFER_SIZE, chart_budget=CHART_POINT_BUDGET):
+        self.store = store
+        self.cost = store.data["target"].to_numpy(dtype=np.float64)
+        self.chart = SeriesDownsampler(chart_budget)
+        self.shap_table = shap_table
+        self.shap = ShapAggregator(shap_table.feature_names, shap_buffer) if shap_table is not None else None
+        self.reset()
+
+    def reset(self, start_idx=None, stop_idx=None):
+        self.start_idx = self.store.start_idx if start_idx is None else int(start_idx)
+        self.stop_idx = len(self.store) if stop_idx is None else min(int(stop_idx), len(self.store))
+        self.idx = self.start_idx
+        self.tick = 0
+        if self.shap is not None:
+            self.shap.clear()
+        self.chart.reset()
+
+    @property
+    def finished(self):
+        return self.idx >= self.stop_idx
+
+    @property
+    def remaining(self):
+        return max(self.stop_idx - self.idx, 0)
+
+    def step(self, n=1):
+        """최대 n행 진행하고 실제 진행한 행 수 반환 (더 없으면 0)
+
+        KPI는 누적합 조회, SHAP은 update_batch 한 번이라 n에 관계없이 재실행 1회 비용
+        """
+        n = min(int(n), self.remaining)
+        if n <= 0:
+            return 0
+        if self.shap is not None:
+            self.shap.update_batch(self.shap_table.rows(self.idx, self.idx + n))
+        self.idx += n
+        self.tick += 1
+        return n
+
+    def catch_up(self):
+        """남은 행을 모두 한 번에 진행 (가장 최근 측정값까지)"""
+        return self.step(self.remaining)
+
+    def snapshot(self, running=False):
+        shap_on = self.shap is not None
+        return Snapshot(
+            tick=self.tick,
+            start_idx=self.start_idx,
+            idx=self.idx,
+            running=running,
+            finished=self.finished,
+            totals=self.store.kpi_totals(self.start_idx, self.idx),
+            shap_mean_abs=self.shap.mean_abs(SHAP_DISPLAY_FEATURES) if shap_on else {},
+            shap_last=self.shap.last(SHAP_DISPLAY_FEATURES) if shap_on else {},
+            chart_idx=self.start_idx + self.chart.indices(self.cost[self.start_idx:self.idx]),
+        )
+
+
+# ========== 2. 공유 틱 생성기 ==========
+class TickProducer(threading.Thread):
+    """interval초마다 엔진을 한 틱 진행하고 Snapshot을 게시하는 데몬 스레드"""
+
+    def __init__(self, engine, interval, rows_per_tick=1):
+        super().__init__(name="monitor-tick-producer", daemon=True)
+        self.engine = engine
+        self.interval = interval
+        self.rows_per_tick = rows_per_tick
+        self.running = False
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stopped = threading.Event()
+        self._snapshot = engine.snapshot(running=False)
+
+    def snapshot(self):
+        """최신 Snapshot (참조 교체만 하므로 잠금 없이 읽어도 안전)"""
+        return self._snapshot
+
+    def _publish(self):
+        self._snapshot = self.engine.snapshot(running=self.running)
+
+    def run(self):
+        while not self._stopped.is_set():
+            self._wake.wait(self.interval)
+            self._wake.clear()
+            with self._lock:
+                if self.running and not self.engine.step(self.rows_per_tick):
+                    self.running = False
+                self._publish()
+
+    # ─── 제어 (모든 세션이 공유) ───
+    # 상태를 바꾸면 잠금 안에서 바로 게시 — 스레드가 깨기 전까지 이전 Snapshot이 보이지 않게
+    def resume(self):
+        with self._lock:
+            self.running = not self.engine.finished
+            self._publish()
+        self._wake.set()  # 첫 틱은 바로 진행
+
+    def pause(self):
+        with self._lock:
+            self.running = False
+            self._publish()
+
+    def reset(self):
+        with self._lock:
+            self.running = False
+            self.engine.reset()
+            self._publish()
+
+    def set_speed(self, rows_per_tick):
+        """새로고침 1회당 진행 행 수 변경"""
+        self.rows_per_tick = max(int(rows_per_tick), 1)
+
+    def skip(self, n):
+        """n행을 즉시 진행 (재생 중이 아니어도 적용)"""
+        with self._lock:
+            self._advance(n)
+
+    def catch_up(self):
+        """마지막 측정값까지 즉시 진행 (남은 행 수도 잠금 안에서 읽음)"""
+        with self._lock:
+            self._advance(self.engine.remaining)
+
+    def _advance(self, n):
+        self.engine.step(n)
+        if self.engine.finished:
+            self.running = False
+        self._publish()
+
+    def stop(self):
+        self._stopped.set()
+        self._wake.set()
+
+
+# ========== 3. 헤드리스 재생 ==========
+def _latency_summary(seconds):
+    lat = np.asarray(seconds, dtype=np.float64) * 1000
+    if len(lat) == 0:
+        return {"p50_ms": 0.0, "p95_ms": 0.0, "max_ms": 0.0}
+    return {
+        "p50_ms": float(np.percentile(lat, 50)),
+        "p95_ms": float(np.percentile(lat, 95)),
+        "max_ms": float(lat.max()),
+    }
+
+
+def replay(engine, rows_per_tick=1, predictor=None):
+    """엔진의 현재 위치부터 stop_idx까지 대기 없이 재생하고 결과 요약 반환
+
+    predictor가 주어지면 매 행 predict_one으로 다시 예측해 저장된 target과 비교
+    """
+    if predictor is not None:
+        names = list(predictor.feature_names)
+        matrix = engine.store.feat_data[names].to_numpy(dtype=np.float32)
+        if hasattr(predictor, "reset_stream"):
+            predictor.reset_stream()
+    tick_seconds, errors = [], []
+    t_start = time.perf_counter()
+    snap = engine.snapshot(running=True)
+    while not engine.finished:
+        t0 = time.perf_counter()
+        begin = engine.idx
+        n = engine.step(rows_per_tick)
+        if predictor is not None:
+            preds = np.array([predictor.predict_one(dict(zip(names, row))) for row in matrix[begin:begin + n]])
+            errors.append(preds - engine.cost[begin:begin + n])
+        snap = engine.snapshot(running=True)
+        tick_seconds.append(time.perf_counter() - t0)
+    elapsed = time.perf_counter() - t_start
+
+    result = {
+        "start_id": int(engine.store.data["id"].iloc[engine.start_idx]) if snap.rows else None,
+        "rows": snap.rows,
+        "ticks": len(tick_seconds),
+        "elapsed_s": elapsed,
+        "rows_per_sec": snap.rows / elapsed if elapsed > 0 else 0.0,
+        "tick_latency": _latency_summary(tick_seconds),
+        "kpi": snap.totals,
+        "shap_mean_abs": snap.shap_mean_abs,
+    }
+    if predictor is not None:
+        err = np.concatenate(errors) if errors else np.empty(0)
+        err = err[~np.isnan(err)]
+        result["prediction_mae"] = float(np.abs(err).mean()) if len(err) else 0.0
+        result["predict_latency"] = predictor.latency_stats()
+        result["prediction_calibrated"] = predictor.calibrated
+    return result
+
+
+def main(argv=None):
+    from utills.data import MONITOR_START_ID, MONITOR_TARGET_CSV, MONITOR_FEATURE_CSV, load_monitor_store
+    from utills.model import PREDICTOR_TYPES, get_predictor
+
+    parser = argparse.ArgumentParser(description="실시간 모니터링 헤드리스 재생 / 백테스트")
+    parser.add_argument("--target", default=MONITOR_TARGET_CSV, help="예측 결과 CSV (id, 측정일시, target)")
+    parser.add_argument("--features", default=MONITOR_FEATURE_CSV, help="피처 CSV")
+    parser.add_argument("--start-id", type=int, default=MONITOR_START_ID, help="재생 시작 id")
+    parser.add_argument("--rows", type=int, default=None, help="재생할 행 수 (기본: 끝까지)")
+    parser.add_argument("--batch", type=int, default=1, help="틱당 진행 행 수")
+    parser.add_argument("--predictor", choices=sorted(PREDICTOR_TYPES), default=None,
+                        help="매 행 다시 예측해 저장된 target과 비교")
+    parser.add_argument("--allow-uncalibrated", action="store_true",
+                        help="lstm_scalers.npz 없이 추정 스케일러로 LSTM 예측 (결과는 보정되지 않은 값)")
+    parser.add_argument("--no-shap", action="store_true", help="SHAP 누적 없이 재생 (기본: 사전 계산 SHAP 표 사용)")
+    parser.add_argument("--json", action="store_true", help="결과를 JSON으로 출력")
+    args = parser.parse_args(argv)
+    if args.allow_uncalibrated and args.predictor != "lstm":
+        parser.error("--allow-uncalibrated는 --predictor lstm과 함께 사용")
+
+    store = load_monitor_store(args.target, args.features, args.start_id)
+    shap_table = None
+    if not args.no_shap:
+        from utills.explain import load_shap_table
+        shap_table = load_shap_table().align_to(store.data["id"].to_numpy())
+
+    engine = MonitorEngine(store, shap_table)
+    stop_idx = None if args.rows is None else store.start_idx + args.rows
+    engine.reset(store.start_idx, stop_idx)
+    options = {"allow_uncalibrated": True} if args.allow_uncalibrated else {}
+    predictor = get_predictor(args.predictor, **options) if args.predictor else None
+    result = replay(engine, args.batch, predictor)
+
+    if args.json:
+        print(json.dumps(result, ensure_ascii=False, indent=2))
+        return result
+    print(f"재생 {result['rows']:,}행 / {result['ticks']:,}틱 — {result['elapsed_s']:.3f}s "
+          f"({result['rows_per_sec']:,.0f} rows/s)")
+    lat = result["tick_latency"]
+    print(f"틱 지연시간 p50 {lat['p50_ms']:.3f}ms, p95 {lat['p95_ms']:.3f}ms, max {lat['max_ms']:.3f}ms")
+    for key, value in result["kpi"].items():
+        print(f"{key:>22}: {value:,.2f}")
+    if predictor is not None:
+        print(f"{'예측 MAE':>22}: {result['prediction_mae']:,.2f}"
+              + ("" if result["prediction_calibrated"] else "  (보정되지 않은 예측 — 스케일러 추정값)"))
+        print(f"{'예측 p95 (ms)':>22}: {result['predict_latency']['p95_ms']:.3f}")
+    return result
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,217 @@
+"""전기요금 계산 엔진 — 15분 측정값에서 구간별 요금을 NumPy 배열 연산으로 계산
+
+요금 = 과금 전력량(kVAh 또는 kWh) × 단가(월, 부하구분) × 역률 배수(지상역률 구간)
+
+- TariffTable: 요금표 (월 × 부하구분 단가, 과금 기준, 역률 구간 배수)
+- interval_cost(): 배열 입력 → 구간별 요금 배열 (수백만 행도 한 번에)
+- frame_cost() / validate() / compare_tariffs(): load_train() 프레임 기준 계산, 라벨 검증, 요금표 비교
+
+train.csv 의 전기요금(원)은 피상전력량(kVAh) × 월별 단가 × 역률 배수와 일치 (DATASET_TARIFF)
+
+사용법 (라벨 검증 + 요금표 비교):
+    python -m utills.tariff
+    python -m utills.tariff --json
+"""
+import argparse
+import json
+from dataclasses import dataclass, replace
+
+import numpy as np
+import pandas as pd
+
+from utills.features import power_factor
+
+# 부하구분 순서 (작업유형 → 단가 열 번호)
+LOAD_PERIODS = ("Light_Load", "Medium_Load", "Maximum_Load")
+
+# 한전 계절 구분 (월)
+SEASON_MONTHS = {
+    "summer": (6, 7, 8),
+    "spring_fall": (3, 4, 5, 9, 10),
+    "winter": (11, 12, 1, 2),
+}
+
+BILLING_BASES = ("kVAh", "kWh")
+
+
+@dataclass(frozen=True, eq=False)
+class TariffTable:
+    """요금표 (읽기 전용)
+
+    rates: (12, 3) 단가 행렬 — [월-1, 부하구분] 원/과금단위
+    pf_bands: ((지상역률 하한 %, 배수), ...) 하한 내림차순, 처음 만족하는 구간의 배수 적용
+    """
+    name: str
+    basis: str
+    rates: np.ndarray
+    pf_bands: tuple
+
+    def __post_init__(self):
+        if self.basis not in BILLING_BASES:
+            raise ValueError(f"과금 기준은 {BILLING_BASES} 중 하나여야 합니다: {self.basis}")
+        rates = np.asarray(self.rates, dtype=np.float64)
+        if rates.shape != (12, len(LOAD_PERIODS)):
+            raise ValueError(f"단가 행렬 크기는 (12, {len(LOAD_PERIODS)}) 이어야 합니다: {rates.shape}")
+        object.__setattr__(self, "rates", rates)
+
+    @classmethod
+    def monthly(cls, name, basis, month_rates, pf_bands):
+        """월별 단일 단가 ({월: 단가}) — 부하구분과 무관"""
+        rates = np.full((12, len(LOAD_PERIODS)), np.nan)
+        for month, rate in month_rates.items():
+            rates[month - 1, :] = rate
+        return cls(name, basis, rates, tuple(pf_bands))
+
+    @classmethod
+    def time_of_use(cls, name, basis, season_rates, pf_bands):
+        """계절 × 부하구분 단가 ({계절: {작업유형: 단가}})"""
+        rates = np.full((12, len(LOAD_PERIODS)), np.nan)
+        for season, load_rates in season_rates.items():
+            for month in SEASON_MONTHS[season]:
+                for j, load in enumerate(LOAD_PERIODS):
+                    rates[month - 1, j] = load_rates[load]
+        return cls(name, basis, rates, tuple(pf_bands))
+
+    def with_changes(self, **changes):
+        """일부 항목만 바꾼 새 요금표 (what-if 비교용)"""
+        return replace(self, **changes)
+
+
+# ─── 기본 요금표 ───
+# 역률 구간 배수: 95% 이상 1.5% 감액, 90~95% 기준, 85/80% 미만마다 2%씩 할증
+DATASET_PF_BANDS = ((95, 0.985), (90, 1.00), (85, 1.02), (80, 1.04), (0, 1.06))
+
+# train.csv 라벨에서 역산한 월별 kVAh 단가 (12월은 학습 데이터에 없어 같은 겨울철 11월 단가로 가정)
+DATASET_MONTH_RATES = {1: 112.3, 2: 111.3, 3: 89.8, 4: 89.6, 5: 88.5, 6: 110.5,
+                       7: 113.4, 8: 112.5, 9: 87.8, 10: 87.3, 11: 111.6, 12: 111.6}
+
+DATASET_TARIFF = TariffTable.monthly("학습 데이터 요금제 (kVAh)", "kVAh", DATASET_MONTH_RATES, DATASET_PF_BANDS)
+
+# what-if: 같은 단가를 유효전력량(kWh)에 과금
+KWH_BASIS_TARIFF = DATASET_TARIFF.with_changes(name="유효전력량 과금 (kWh)", basis="kWh")
+
+# what-if: 역률 배수 없이 kVAh 과금
+NO_PF_TARIFF = DATASET_TARIFF.with_changes(name="역률 배수 없음 (kVAh)", pf_bands=((0, 1.0),))
+
+# what-if: 계절 × 부하구분 계시별 요금 — 단가는 비교용 예시 값 (실제 한전 단가로 바꿔서 사용)
+EXAMPLE_TOU_TARIFF = TariffTable.time_of_use(
+    "계시별 요금 예시 (kWh)", "kWh",
+    {
+        "summer": {"Light_Load": 94.0, "Medium_Load": 146.9, "Maximum_Load": 229.0},
+        "spring_fall": {"Light_Load": 94.0, "Medium_Load": 116.5, "Maximum_Load": 147.2},
+        "winter": {"Light_Load": 101.0, "Medium_Load": 146.9, "Maximum_Load": 204.6},
+    },
+    DATASET_PF_BANDS,
+)
+
+ALTERNATIVE_TARIFFS = [KWH_BASIS_TARIFF, NO_PF_TARIFF, EXAMPLE_TOU_TARIFF]
+
+
+# ========== 1. 배열 연산 ==========
+def billed_energy(basis, kwh, lag_kvarh, lead_kvarh):
+    """과금 전력량 — kVAh는 유효/무효(지상+진상) 전력량의 피상값"""
+    kwh = np.asarray(kwh, dtype=np.float64)
+    if basis == "kWh":
+        return kwh
+    reactive = np.asarray(lag_kvarh, dtype=np.float64) + np.asarray(lead_kvarh, dtype=np.float64)
+    return np.hypot(kwh, reactive)
+
+
+def pf_multiplier(pf_bands, lag_pf):
+    """지상역률(%) 배열 → 역률 배수 배열"""
+    lag_pf = np.asarray(lag_pf, dtype=np.float64)
+    # 하한 오름차순으로 뒤집어 searchsorted(right) → 역률이 하한 이상인 가장 높은 구간
+    floors = np.array([floor for floor, _ in pf_bands[::-1]], dtype=np.float64)
+    factors = np.array([factor for _, factor in pf_bands[::-1]], dtype=np.float64)
+    pos = np.searchsorted(floors, lag_pf, side="right") - 1
+    return factors[np.clip(pos, 0, len(factors) - 1)]
+
+
+def load_period_codes(work_types):
+    """작업유형 값 → 단가 열 번호 (LOAD_PERIODS 순서, 알 수 없는 값은 ValueError)"""
+    codes = pd.Index(LOAD_PERIODS).get_indexer(work_types)
+    if (codes < 0).any():
+        raise ValueError(f"작업유형은 {LOAD_PERIODS} 중 하나여야 합니다")
+    return codes
+
+
+def interval_cost(table, kwh, lag_kvarh, lead_kvarh, month, load_code, lag_pf=None):
+    """구간별 전기요금 (원)
+
+    month: 1~12 배열, load_code: load_period_codes() 결과,
+    lag_pf: 지상역률(%) — 없으면 kWh/지상 kVarh로 계산 (train.csv와 같이 소수 둘째 자리 반올림)
+    """
+    if lag_pf is None:
+        lag_pf = np.round(power_factor(kwh, lag_kvarh), 2)
+    rate = table.rates[np.asarray(month, dtype=np.int64) - 1, np.asarray(load_code, dtype=np.int64)]
+    energy = billed_energy(table.basis, kwh, lag_kvarh, lead_kvarh)
+    return energy * rate * pf_multiplier(table.pf_bands, lag_pf)
+
+
+# ========== 2. 프레임 계산 / 검증 ==========
+def frame_cost(df, table=DATASET_TARIFF):
+    """load_train() 형식 프레임의 구간별 요금 배열"""
+    lag_pf = df["지상역률(%)"].to_numpy() if "지상역률(%)" in df else None
+    return interval_cost(
+        table,
+        df["전력사용량(kWh)"].to_numpy(),
+        df["지상무효전력량(kVarh)"].to_numpy(),
+        df["진상무효전력량(kVarh)"].to_numpy(),
+        df["측정일시"].dt.month.to_numpy(),
+        load_period_codes(df["작업유형"]),
+        lag_pf,
+    )
+
+
+def validate(df, table=DATASET_TARIFF):
+    """계산 요금과 전기요금(원) 라벨 비교 지표"""
+    computed = frame_cost(df, table)
+    label = df["전기요금(원)"].to_numpy(dtype=np.float64)
+    error = computed - label
+    return {
+        "tariff": table.name,
+        "rows": int(len(df)),
+        "mae": float(np.abs(error).mean()),
+        "max_abs_error": float(np.abs(error).max()),
+        "label_total": float(label.sum()),
+        "computed_total": float(computed.sum()),
+    }
+
+
+def compare_tariffs(df, tables=None):
+    """요금표별 월 합계 비교표 (년월 × 요금표, 마지막 행은 전체 합계)"""
+    tables = [DATASET_TARIFF] + ALTERNATIVE_TARIFFS if tables is None else tables
+    months = df["측정일시"].dt.to_period("M")
+    out = pd.DataFrame({table.name: frame_cost(df, table) for table in tables})
+    out = out.groupby(months.to_numpy(), sort=True).sum()
+    out.index.name = "년월"
+    out.loc["합계"] = out.sum()
+    return out
+
+
+# ========== 3. CLI ==========
+def main(argv=None):
+    from utills.data import TRAIN_CSV, load_train
+
+    parser = argparse.ArgumentParser(description="전기요금 계산 엔진 라벨 검증 / 요금표 비교")
+    parser.add_argument("--train", default=TRAIN_CSV, help="검증할 train.csv")
+    parser.add_argument("--json", action="store_true", help="결과를 JSON으로 출력")
+    args = parser.parse_args(argv)
+
+    df = load_train(args.train)
+    result = validate(df)
+    comparison = compare_tariffs(df)
+
+    if args.json:
+        result["comparison"] = {str(k): v for k, v in comparison.to_dict(orient="index").items()}
+        print(json.dumps(result, ensure_ascii=False, indent=2))
+        return result
+    print(f"{result['tariff']} — {result['rows']:,}행 라벨 검증")
+    print(f"  MAE {result['mae']:.6f}원, 최대 오차 {result['max_abs_error']:.6f}원")
+    print(f"  라벨 합계 {result['label_total']:,.0f}원 / 계산 합계 {result['computed_total']:,.0f}원\n")
+    print(comparison.round(0).to_string())
+    return result
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,160 @@
+"""기상 자료(data/기온.csv, data/강수.csv) 로드 / 15분 측정값에 as-of 결합
+
+- parse_hour_minutes(): hour 필드 0 / 100 / 1:00 형식 혼재 → 자정 이후 분 (고유값만 해석해 펼침)
+- load_weather(): 시간별 기온/강수량 (일시 정렬, float32, 파일별 Parquet 캐시)
+- asof_weather(): 측정일시 배열마다 직전 관측값 (searchsorted, 허용 간격을 넘으면 결측)
+- load_timeline_weather(): train.csv / test.csv 행 순서 그대로의 기상 컬럼 (.npy 캐시)
+
+원본 파일에는 연도가 없어 WEATHER_YEAR를 붙임 (2월 29일이 있어 2024년 자료)
+12월 자료가 없으므로 test.csv(12월)는 11월 30일 마지막 관측 이후 허용 간격만큼만 값이 들어가고 나머지는 결측
+
+사용법 (결합 현황):
+    python -m utills.weather
+"""
+import argparse
+
+import numpy as np
+import pandas as pd
+
+from utills.data import DATA_DIR, TEST_CSV, TRAIN_CSV, load_train, read_cached_array, read_cached_frame
+
+# 컬럼 이름 → 원본 파일
+WEATHER_CSVS = {
+    "기온(°C)": DATA_DIR / "기온.csv",
+    "강수량(mm)": DATA_DIR / "강수.csv",
+}
+WEATHER_COLUMNS = list(WEATHER_CSVS)
+
+WEATHER_YEAR = 2024
+
+# 결측 표시값 — 이 값 이하는 결측 (기온 -50, 강수 -1이 같은 시각에 함께 나옴)
+MISSING_AT_OR_BELOW = {"기온(°C)": -50.0, "강수량(mm)": -1.0}
+
+# as-of 결합 허용 간격 — 직전 관측이 이보다 오래되면 결측 (한두 시간 빠진 관측은 앞 값으로 채움)
+WEATHER_TOLERANCE = pd.Timedelta(hours=2)
+
+
+# ========== 1. 파싱 ==========
+def parse_hour_minutes(values):
+    """hour 필드 → 자정 이후 분 (int32 배열)
+
+    1:00 / 01:30 처럼 콜론이 있으면 시:분, 없으면 HHMM(0, 100, ..., 2300)
+    단 콜론 없는 값이 모두 0~23이면 시 단위로 봄
+    서로 다른 값은 많아야 수십 개 → 고유값만 해석해 코드로 펼침
+    """
+    codes, uniques = pd.factorize(pd.Series(values).astype(str).str.strip())
+    if (codes < 0).any():
+        raise ValueError("hour 값이 비어 있습니다")
+    text = pd.Series(uniques, dtype=str)
+    colon = text.str.contains(":", regex=False).to_numpy(dtype=bool)
+    number = pd.to_numeric(text.str.replace(":", "", regex=False), errors="coerce").to_numpy(dtype=np.float64)
+    if np.isnan(number).any():
+        raise ValueError(f"hour 값을 해석할 수 없습니다: {text[np.isnan(number)].iloc[0]!r}")
+    number = number.astype(np.int64)
+
+    plain = ~colon & (number[~colon].max(initial=0) <= 23)
+    hours = np.where(plain, number, number // 100)
+    minutes = np.where(plain, 0, number % 100)
+    if (hours > 23).any() or (minutes > 59).any():
+        raise ValueError(f"hour 값이 하루 범위를 벗어났습니다: {text[(hours > 23) | (minutes > 59)].iloc[0]!r}")
+    return (hours * 60 + minutes).astype(np.int32)[codes]
+
+
+def parse_weather_csv(path, column, year=WEATHER_YEAR):
+    """month, day, hour, value CSV → [일시, column] 프레임 (일시 정렬, 결측 표시값은 NaN)"""
+    raw = pd.read_csv(path, encoding="utf-8-sig", dtype={"month": np.int16, "day": np.int16, "hour": str})
+    days = pd.to_datetime(pd.DataFrame({"year": year, "month": raw["month"], "day": raw["day"]}))
+    times = days + pd.to_timedelta(parse_hour_minutes(raw["hour"]), unit="min")
+
+    values = pd.to_numeric(raw["value"], errors="coerce").to_numpy(dtype=np.float32)
+    values[values <= MISSING_AT_OR_BELOW[column]] = np.nan
+
+    frame = pd.DataFrame({"일시": times.to_numpy(), column: values})
+    return frame.sort_values("일시", kind="stable").drop_duplicates("일시", keep="last").reset_index(drop=True)
+
+
+# ========== 2. 로드 / 결합 ==========
+def load_weather(year=WEATHER_YEAR):
+    """시간별 기상 자료 [일시, 기온(°C), 강수량(mm)] — 원본이 그대로면 파일별 Parquet 캐시 사용"""
+    weather = None
+    for column, path in WEATHER_CSVS.items():
+        frame = read_cached_frame(path, lambda p, column=column: parse_weather_csv(p, column, year),
+                                  name=f"weather_{path.stem}_{year}")
+        weather = frame if weather is None else weather.merge(frame, on="일시", how="outer", sort=True)
+    return weather
+
+
+def asof_weather(times, weather, tolerance=WEATHER_TOLERANCE):
+    """측정일시 배열 → 각 시각 이전(같은 시각 포함) 마지막 관측값 (컬럼별로 결측 관측은 건너뜀)
+
+    times 정렬 여부와 무관, 결과는 입력 순서 그대로 (float32 배열 dict)
+    """
+    times = np.asarray(times, dtype="datetime64[ns]").view(np.int64)
+    limit = np.int64(pd.Timedelta(tolerance).value)
+    out = {}
+    for column in WEATHER_COLUMNS:
+        valid = weather[column].notna().to_numpy()
+        obs_times = weather["일시"].to_numpy(dtype="datetime64[ns]").view(np.int64)[valid]
+        obs_values = weather[column].to_numpy(dtype=np.float32)[valid]
+
+        pos = np.searchsorted(obs_times, times, side="right") - 1
+        found = pos >= 0
+        pos = np.clip(pos, 0, None)
+        if len(obs_times):
+            found &= times - obs_times[pos] <= limit
+        values = np.full(len(times), np.nan, dtype=np.float32)
+        values[found] = obs_values[pos[found]]
+        out[column] = values
+    return out
+
+
+def _timeline(path):
+    """측정일시 컬럼만 (train.csv는 load_train 캐시 사용)"""
+    if path == TRAIN_CSV:
+        return load_train(path)["측정일시"].to_numpy()
+    return pd.read_csv(path, usecols=["측정일시"], parse_dates=["측정일시"])["측정일시"].to_numpy()
+
+
+def load_timeline_weather(path=TRAIN_CSV, year=WEATHER_YEAR, tolerance=WEATHER_TOLERANCE):
+    """train.csv / test.csv 행 순서의 기상 컬럼 프레임 [기온(°C), 강수량(mm)]
+
+    (측정 CSV, 기상 CSV들) 버전별로 결합 결과를 .npy 캐시 → 모델 피처 / 보고서에서 다시 결합하지 않음
+    """
+    def build():
+        joined = asof_weather(_timeline(path), load_weather(year), tolerance)
+        return np.column_stack([joined[column] for column in WEATHER_COLUMNS])
+
+    # 허용 간격은 초 단위로 캐시 이름에 (1.5시간과 1시간이 같은 파일을 쓰지 않게)
+    seconds = int(pd.Timedelta(tolerance).total_seconds())
+    arr = read_cached_array(f"weather_{path.stem}_{year}_{seconds}s", [path, *WEATHER_CSVS.values()], build)
+    return pd.DataFrame(np.asarray(arr), columns=WEATHER_COLUMNS)
+
+
+def add_weather_columns(df, path=TRAIN_CSV):
+    """load_train() 프레임에 기상 컬럼 추가 (행 순서가 원본 CSV와 같을 때)"""
+    weather = load_timeline_weather(path)
+    if len(weather) != len(df):
+        raise ValueError(f"행 수가 원본과 다릅니다: {len(df):,} != {len(weather):,}")
+    for column in WEATHER_COLUMNS:
+        df[column] = weather[column].to_numpy()
+    return df
+
+
+# ========== 3. CLI ==========
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="기상 자료 로드 / 측정값 결합 현황")
+    parser.add_argument("--year", type=int, default=WEATHER_YEAR, help="기상 자료 연도")
+    args = parser.parse_args(argv)
+
+    weather = load_weather(args.year)
+    print(f"기상 자료 {len(weather):,}시간 ({weather['일시'].min()} ~ {weather['일시'].max()})")
+    for column in WEATHER_COLUMNS:
+        print(f"  {column}: 결측 {int(weather[column].isna().sum())}건")
+    for path in (TRAIN_CSV, TEST_CSV):
+        joined = load_timeline_weather(path, args.year)
+        coverage = ", ".join(f"{c} {joined[c].notna().mean():.1%}" for c in WEATHER_COLUMNS)
+        print(f"{path.name}: {len(joined):,}행 — 값이 있는 비율 {coverage}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,12 +1,12 @@
 import streamlit as st
-import pandas as pd
-import numpy as np
-import time
-import plotly.express as px
 import plotly.graph_objects as go
 import warnings
 import math
 
+from utills.data import load_monitor_store
+from utills.explain import load_shap_table
+from utills.stream import MonitorEngine, REPLAY_SPEEDS, SHAP_DISPLAY_FEATURES, TickProducer
+
 warnings.filterwarnings("ignore")
 
 # ─── (1) 페이지 설정 ────────────────────────────────────────
@@ -266,33 +266,46 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
-# ─── SHAP 관련 헬퍼 함수 ─────────────────────────────────────
-def generate_dummy_shap_values():
-    feature_names = st.session_state.feat_data.columns.drop(
-        ["id", "측정일시", "target"]
-    ).tolist()
-    np.random.seed(len(st.session_state.shap_history))
-    vals = np.random.randn(len(feature_names))
-    return dict(zip(feature_names, vals))
-
-def create_shap_chart():
-    if not st.session_state.shap_history:
+# ─── 공유 데이터 저장소 ─────────────────────────────────────
+@st.cache_resource
+def get_store():
+    """서버 프로세스당 한 번만 로드되는 읽기 전용 데이터"""
+    return load_monitor_store()
+
+store = get_store()
+
+@st.cache_resource(show_spinner="SHAP 기여도 사전 계산 중...")
+def get_shap_table():
+    """xgboost.pkl TreeSHAP 기여도 (전체 구간 일괄 계산, 디스크 캐시) — 만들 수 없으면 None (SHAP 패널 숨김)"""
+    try:
+        return load_shap_table().align_to(store.data["id"].to_numpy())
+    except (FileNotFoundError, ImportError, ValueError):
+        # 모델/피처 파일 없음, xgboost 미설치, 모델 로드 실패(XGBoostError는 ValueError 하위 클래스),
+        # 피처 CSV와 모델 피처 불일치
         return None
 
-    selected_features = [
-        "전력사용량(kWh)",
-        "지상무효전력량(kVarh)",
-        "진상무효전력량(kVarh)",
-        "탄소배출량(tCO2)",
-        "진상역률_이진",
-        "지상역률_이진",
-    ]
+shap_table = get_shap_table()
 
-    mean_abs = {
-        f: np.mean([abs(h[f]) for h in st.session_state.shap_history])
-        for f in selected_features
-        if f in st.session_state.shap_history[0]
-    }
+# 자동 새로고침 주기 (초)
+REFRESH_SEC = 10
+
+# ─── 공유 틱 생성기 ─────────────────────────────────────────
+@st.cache_resource
+def get_producer():
+    """서버당 하나의 백그라운드 스레드가 재생/SHAP/KPI를 계산해 Snapshot 게시"""
+    producer = TickProducer(MonitorEngine(store, shap_table), REFRESH_SEC)
+    producer.start()
+    return producer
+
+producer = get_producer()
+
+# ─── SHAP 관련 헬퍼 함수 ─────────────────────────────────────
+def create_shap_chart(snap):
+    if not snap.shap_mean_abs:
+        return None
+
+    # 누적 평균 |SHAP| — 생성기가 틱마다 갱신해 둔 값을 조회만
+    mean_abs = snap.shap_mean_abs
 
     feats_sorted = sorted(mean_abs.items(), key=lambda x: x[1], reverse=True)
     top_feats = [k for k, _ in feats_sorted]
@@ -323,22 +336,7 @@ def create_shap_chart():
 
 # ─── 세션 상태 초기화 ────────────────────────────────────────
 def init_state():
-    if "data" not in st.session_state:
-        st.session_state.data = pd.read_csv(
-            "./models/final_lstm_target.csv", parse_dates=["측정일시"]
-        )
-    if "feat_data" not in st.session_state:
-        st.session_state.feat_data = pd.read_csv(
-            "./models/target_pred_feature_lstm.csv", parse_dates=["측정일시"]
-        )
-    if "start_idx" not in st.session_state:
-        df = st.session_state.data
-        matches = df.index[df["id"] == 32111].tolist()
-        st.session_state.start_idx = matches[0] if matches else 0
-        st.session_state.idx = st.session_state.start_idx
-    for key in ["time_list", "cost_list", "shap_history"]:
-        st.session_state.setdefault(key, [])
-    st.session_state.setdefault("running", False)
+    # 재생 상태는 공유 생성기에 있음 — 세션에는 표 페이지만 저장
     st.session_state.setdefault("page", 0)
 
 init_state()
@@ -377,20 +375,16 @@ with st.sidebar:
     btn_col1, btn_col2, btn_col3 = st.columns([1, 1, 1])
     with btn_col1:
         if st.button("시작", key="start_btn"):
-            st.session_state.running = True
+            producer.resume()
     with btn_col2:
         if st.button("정지", key="stop_btn"):
-            st.session_state.running = False
+            producer.pause()
     with btn_col3:
         if st.button("리셋", key="reset_btn"):
-            st.session_state.idx = st.session_state.start_idx
-            st.session_state.time_list.clear()
-            st.session_state.cost_list.clear()
-            st.session_state.shap_history.clear()
-            st.session_state.running = False
+            producer.reset()
             st.session_state.page = 0
 
-    if st.session_state.running:
+    if producer.running:
         status_class = "status-running"
         status_text = "🟢 실행 중"
     else:
@@ -405,11 +399,37 @@ with st.sidebar:
     </div>
     """, unsafe_allow_html=True)
 
+    # ─── 재생 속도 / 따라잡기 ───
+    st.markdown("### ⏩ 재생 속도")
+    speeds = list(REPLAY_SPEEDS)
+    speed = st.select_slider(
+        f"{REFRESH_SEC}초마다 진행할 구간",
+        options=speeds,
+        value=producer.rows_per_tick if producer.rows_per_tick in speeds else speeds[0],
+        format_func=lambda n: f"{REPLAY_SPEEDS[n]} ({n}행)",
+        key="speed_slider",
+    )
+    if speed != producer.rows_per_tick:
+        producer.set_speed(speed)
+
+    skip_rows = st.number_input("건너뛸 행 수", min_value=1, value=96, step=96, key="skip_rows")
+    skip_col1, skip_col2 = st.columns([1, 1])
+    with skip_col1:
+        if st.button("건너뛰기", key="skip_btn"):
+            producer.skip(skip_rows)
+    with skip_col2:
+        if st.button("최신까지", key="catch_up_btn"):
+            producer.catch_up()
+
+    st.caption("모든 화면이 같은 재생 상태를 공유합니다.")
+    if shap_table is None:
+        st.caption("⚠️ xgboost 모델로 SHAP 기여도를 계산하지 못해 SHAP 패널을 표시하지 않습니다.")
+
 
 
 
 # ─── 메인 화면 함수 ─────────────────────────────────────────
-def show_main():
+def show_main(snap):
     # 메인 헤더
     st.markdown("""
     <div class="main-header">
@@ -419,14 +439,14 @@ def show_main():
     """, unsafe_allow_html=True)
 
     # KPI 카드들
-    start, idx = st.session_state.start_idx, st.session_state.idx
-    df_slice = st.session_state.feat_data.iloc[start:idx]
-    
-    total_cost = sum(st.session_state.cost_list)
-    total_kwh = df_slice["전력사용량(kWh)"].sum()
-    total_kvarh_jisang = df_slice["지상무효전력량(kVarh)"].sum()
-    total_kvarh_jinsang = df_slice["진상무효전력량(kVarh)"].sum()
-    total_co2 = df_slice["탄소배출량(tCO2)"].sum()
+    start, idx = snap.start_idx, snap.idx
+    totals = snap.totals
+
+    total_cost = totals["target"]
+    total_kwh = totals["전력사용량(kWh)"]
+    total_kvarh_jisang = totals["지상무효전력량(kVarh)"]
+    total_kvarh_jinsang = totals["진상무효전력량(kVarh)"]
+    total_co2 = totals["탄소배출량(tCO2)"]
 
     kpi_col1, kpi_col2, kpi_col3, kpi_col4, kpi_col5 = st.columns(5)
     
@@ -480,24 +500,22 @@ def show_main():
     
     with chart_col1:
         
-        df_plot = pd.DataFrame({
-            "측정일시": st.session_state.time_list,
-            "전기요금(원)": st.session_state.cost_list,
-        })
-        
-        if not df_plot.empty:
-            fig = px.line(
-                df_plot,
-                x="측정일시",
-                y="전기요금(원)",
-                markers=True,
-                line_shape="linear"
-            )
-            fig.update_traces(
-                line_color="#1a73e8",
-                marker_color="#1a73e8",
-                marker_size=6,
-                line_width=3
+        # 점 예산을 넘으면 LTTB로 줄인 점만 전송 (앞부분은 재사용, 새 점만 추가)
+        # st.plotly_chart는 extendTraces 같은 증분 갱신이 없어 매 틱 Figure 전체를 다시 보냄
+        # → 전송량은 새 점 수가 아니라 점 예산(CHART_POINT_BUDGET)으로 제한되는 것
+        rows = snap.chart_idx
+        downsampled = len(rows) < snap.rows
+
+        if len(rows):
+            fig = go.Figure(
+                go.Scattergl(
+                    x=store.data["측정일시"].to_numpy()[rows],
+                    y=store.data["target"].to_numpy()[rows],
+                    mode="lines" if downsampled else "lines+markers",
+                    line=dict(color="#1a73e8", width=3),
+                    marker=dict(color="#1a73e8", size=6),
+                    hovertemplate="%{x}<br>%{y:,.0f}원<extra></extra>",
+                )
             )
             fig.update_layout(
                  title=dict(
@@ -517,14 +535,17 @@ def show_main():
                 plot_bgcolor="white",
                 paper_bgcolor="white",
                 xaxis=dict(gridcolor="#f1f3f4"),
-                yaxis=dict(gridcolor="#f1f3f4")
+                yaxis=dict(gridcolor="#f1f3f4"),
+                uirevision="main_chart",  # 새로고침 사이에도 확대/이동 상태 유지
             )
-            st.plotly_chart(fig, use_container_width=True, key="main_chart")
+            if downsampled:
+                st.caption(f"전체 {snap.rows:,}개 중 {len(rows):,}개 지점 표시 (피크 유지 다운샘플)")
+            st.plotly_chart(fig, width="stretch", key="main_chart")
         else:
             st.info("데이터가 수집되는 중입니다...")
 
     with chart_col2:
-        shap_fig = create_shap_chart()
+        shap_fig = create_shap_chart(snap)
         if shap_fig:
             shap_fig.update_layout(
                 title=dict(
@@ -538,13 +559,13 @@ def show_main():
                 template="plotly_white",
                 margin=dict(l=40, r=40, t=60, b=40),  # 좌우 마진을 동일하게
             )
-            st.plotly_chart(shap_fig, use_container_width=True, key="shap_chart")
+            st.plotly_chart(shap_fig, width="stretch", key="shap_chart")
             # 누적 SHAP 설명 토글 추가
             with st.expander("누적 SHAP 중요도 설명"):
                 st.write("실시간으로 수집되는 전기요금 데이터에 대해, 각 변수의 SHAP 값 절대값을 평균내어 해당 변수가 전기요금에 미치는 전체적인 영향력을 확인할 수 있습니다.\n"
                         "값이 클수록 전기요금에 더 큰 영향을 주는 변수임을 의미합니다.")
 
-        else:
+        elif shap_table is not None:
             st.info("SHAP 분석 준비 중...")
     # 하단 섹션
     bottom_col1, bottom_col2 = st.columns([3, 2])
@@ -559,14 +580,11 @@ def show_main():
             </div>
             """, unsafe_allow_html=True)
 
-        # 원본 데이터 슬라이스
-        df_slice = st.session_state.feat_data.iloc[
-            st.session_state.start_idx : st.session_state.idx
-        ].reset_index(drop=True)
+        # 표시 구간 행 수 (전체 슬라이스를 복사하지 않고 현재 페이지만 잘라냄)
+        total_rows = snap.rows
 
-        if not df_slice.empty:
+        if total_rows > 0:
             # 페이징 파라미터
-            total_rows = len(df_slice)
             page_size = 8
             total_pages = max(math.ceil(total_rows / page_size), 1)
 
@@ -577,18 +595,19 @@ def show_main():
                 st.session_state.page = min(total_pages - 1, st.session_state.page + 1)
 
             # 현재 페이지 데이터
-            start_idx = st.session_state.page * page_size
-            end_idx = start_idx + page_size
+            start_idx = start + st.session_state.page * page_size
+            end_idx = min(start_idx + page_size, idx)
             show_cols = [
                 "측정일시", "전력사용량(kWh)", "지상무효전력량(kVarh)",
                 "진상무효전력량(kVarh)", "탄소배출량(tCO2)", "진상역률_이진", "지상역률_이진"
             ]
-            display_df = df_slice[show_cols].iloc[start_idx:end_idx]
+            # 공유 store를 건드리지 않도록 현재 페이지 행만 복사
+            display_df = store.feat_data.iloc[start_idx:end_idx][show_cols].copy()
             display_df["측정일시"] = display_df["측정일시"].dt.strftime("%Y-%m-%d %H:%M")
             
 
             # 표 출력
-            st.dataframe(display_df, use_container_width=True, hide_index=True)
+            st.dataframe(display_df, width="stretch", hide_index=True)
 
             # ─── 표 아래에 네비게이션 ─────────────────────────────────
             nav_col1, nav_col2, nav_col3 = st.columns([1, 2, 1])
@@ -638,13 +657,9 @@ def show_main():
 
     with bottom_col2:
     
-        if st.session_state.shap_history:
-            last_shap = st.session_state.shap_history[-1]
-            show_feats = [
-                "전력사용량(kWh)", "지상무효전력량(kVarh)", "진상무효전력량(kVarh)",
-                "탄소배출량(tCO2)", "진상역률_이진", "지상역률_이진"
-            ]
-            feats = [f for f in show_feats if f in last_shap]
+        if snap.shap_last:
+            last_shap = snap.shap_last
+            feats = [f for f in SHAP_DISPLAY_FEATURES if f in last_shap]
             vals = [last_shap[f] for f in feats]
             colors = ["#ea4335" if v > 0 else "#1a73e8" for v in vals]
 
@@ -674,36 +689,32 @@ def show_main():
                 plot_bgcolor="white",
                 paper_bgcolor="white"
             )
-            st.plotly_chart(fig, use_container_width=True, key="recent_shap")
+            st.plotly_chart(fig, width="stretch", key="recent_shap")
             # 누적 SHAP 설명 토글 추가
             with st.expander("실시간 SHAP 기여도 설명"):
                 st.write("실시간으로 유입되는 각 변수들이 전기요금에 긍정적(상승) 또는 부정적(하락)으로 얼마나 기여했는지 그 영향을 확인할 수 있습니다."
                          "변수별로 전기요금 예측값을 높였는지, 낮췄는지 직관적으로 파악할 수 있습니다.")
-        else:
+        elif shap_table is not None:
             st.info("SHAP 분석 데이터가 없습니다.")
 
 # ─── 메인 실행 루프 ─────────────────────────────────────────
-if st.session_state.running:
-    df = st.session_state.data
-    if st.session_state.idx < len(df):
-        row = df.iloc[st.session_state.idx]
-        st.session_state.time_list.append(row["측정일시"])
-        st.session_state.cost_list.append(row["target"])
-        st.session_state.idx += 1
-
-        new_shap = generate_dummy_shap_values()
-        st.session_state.shap_history.append(new_shap)
-
-        show_main()
-        time.sleep(10)
+# 틱 계산은 공유 생성기가 담당 — 세션은 REFRESH_SEC마다 이 영역만 다시 그려 최신 Snapshot 표시
+# 타이머는 정지 중에도 유지 (다른 세션이 시작/정지해도 모든 화면이 따라감)
+@st.fragment(run_every=REFRESH_SEC)
+def live_panel():
+    snap = producer.snapshot()
+    if snap.running != st.session_state.get("live_running"):
+        # 다른 세션의 시작/정지, 재생 종료: 사이드바 상태 표시를 위해 전체 재실행
+        st.session_state.live_running = snap.running
         st.rerun()
-    else:
+    if snap.running:
+        show_main(snap)
+        return
+
+    if snap.finished:
         st.warning("⚠️ 더 이상 불러올 데이터가 없습니다.")
-        st.session_state.running = False
-        show_main()
-else:
-    if st.session_state.time_list:
-        show_main()
+    if snap.rows:
+        show_main(snap)
     else:
         st.markdown("""
         <div class="main-header">
@@ -721,4 +732,8 @@ else:
                 실시간 전기요금 모니터링을 시작하세요.
             </p>
         </div>
-        """, unsafe_allow_html=True)
\ No newline at end of file
+        """, unsafe_allow_html=True)
+
+# live_panel이 비교하는 값과 같은 출처 (게시된 Snapshot)
+st.session_state.live_running = producer.snapshot().running
+live_panel()